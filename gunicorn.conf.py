@@ -0,0 +1,75 @@
+"""
+Production server settings, picked up by `gunicorn` started from the
+project root. The master process imports Django and the URLconf once,
+then forks the workers, which share that memory copy-on-write.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = "train_station_core.wsgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+preload_app = True
+
+# Two workers per CPU keep every core busy while others wait on the
+# database. Each worker serves a few requests at once on its own threads,
+# on top of which LOAD_SHEDDING_CLASSES caps every endpoint class.
+workers = int(
+    os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+)
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Workers are replaced after a number of requests, with a jitter so they
+# do not all restart at once, to cap the memory a long-lived worker grows.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# On SIGTERM workers stop accepting connections and get this long to
+# finish the requests in flight.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server) -> None:
+    from django.core.management import call_command
+    from django.db import connections
+    from django.urls import get_resolver
+
+    from train_station_core.db import close_pools
+
+    # Refuse to serve with settings that only hold in a single process,
+    # like a cache the workers do not share
+    call_command("check", deploy=True, fail_level="ERROR")
+    # Resolving loads every URL module and the views they import, so that
+    # the first request of each worker does not pay for it
+    get_resolver().url_patterns
+    # A connection opened while loading must not be shared with the
+    # workers, each of them opens its own
+    connections.close_all()
+    close_pools()
+    server.log.info("Django and URLconf preloaded")
+
+
+def post_worker_init(worker) -> None:
+    from django.conf import settings
+
+    from train_station import invalidation, warming
+
+    # Every worker keeps the reference tables in memory and has to drop
+    # them as soon as another one commits a change. The listener holds
+    # connections, so it starts in the worker and never in the master.
+    invalidation.start_listener()
+    if settings.CACHE_WARMING_INTERVAL:
+        warming.start()
+
+
+def worker_exit(server, worker) -> None:
+    from train_station_core.db import close_pools
+
+    # Let the database end the sessions of a recycled worker right away
+    close_pools()
@@ -1,4 +1,7 @@
-from django.contrib import admin
+import datetime
+
+from django.contrib import admin, messages
+from django.utils import timezone
 
 from train_station.models import (
     Station,
@@ -8,8 +11,12 @@ from train_station.models import (
     TrainType,
     Crew,
     Journey,
+    JourneyStop,
     Ticket,
+    TimetablePattern,
+    JourneySearch,
 )
+from train_station.timetable import expand_patterns
 
 
 @admin.register(Station)
@@ -51,8 +58,48 @@ class CrewAdmin(admin.ModelAdmin):
     search_fields = ("first_name", "last_name")
 
 
+@admin.register(TimetablePattern)
+class TimetablePatternAdmin(admin.ModelAdmin):
+    list_display = (
+        "route",
+        "train",
+        "departure_time",
+        "days_of_week",
+        "valid_from",
+        "valid_until",
+    )
+    list_filter = ("route", "train")
+    actions = ("expand_next_90_days",)
+
+    @admin.action(description="Create journeys for the next 90 days")
+    def expand_next_90_days(self, request, queryset) -> None:
+        start = timezone.localdate()
+        expansions = expand_patterns(
+            start, start + datetime.timedelta(days=89), patterns=queryset
+        ).values()
+        self.message_user(
+            request,
+            f"Created {sum(e.created for e in expansions)} journeys.",
+        )
+        skipped = sum(len(e.skipped) for e in expansions)
+        if skipped:
+            self.message_user(
+                request,
+                f"Skipped {skipped} journeys double booking their train or "
+                f"crew, see the conflicts of the patterns.",
+                level=messages.WARNING,
+            )
+
+
+class JourneyStopInline(admin.TabularInline):
+    model = JourneyStop
+    extra = 0
+    ordering = ("sequence",)
+
+
 @admin.register(Journey)
 class JourneyAdmin(admin.ModelAdmin):
+    inlines = (JourneyStopInline,)
     list_display = ("route", "train", "departure_time", "arrival_time")
     list_filter = ("route", "train", "departure_time")
     search_fields = (
@@ -64,10 +111,17 @@ class JourneyAdmin(admin.ModelAdmin):
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ("journey", "cargo", "seat", "order")
+    list_display = ("journey", "cargo", "seat", "order", "checked_in_at")
     list_filter = ("journey", "cargo", "seat")
     search_fields = (
         "order__user__username",
         "journey__route__source__name",
         "journey__route__destination__name",
     )
+
+
+@admin.register(JourneySearch)
+class JourneySearchAdmin(admin.ModelAdmin):
+    list_display = ("signature", "hits", "last_seen")
+    ordering = ("-hits",)
+    readonly_fields = ("signature", "params", "hits", "last_seen")
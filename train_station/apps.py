@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class TrainStationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "train_station"
+
+    def ready(self) -> None:
+        from train_station import checks, signals, views  # noqa: F401
+
+        signals.connect_response_cache()
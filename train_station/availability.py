@@ -0,0 +1,136 @@
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+from train_station import inventory, reference, response_cache
+from train_station.models import Journey
+
+# Models whose writes change the seats left, outdating cached months
+CALENDAR_DEPENDENCIES = (
+    "train_station.journey",
+    "train_station.journeystop",
+    "train_station.ticket",
+    "train_station.train",
+)
+response_cache.DEPENDENCIES.update(CALENDAR_DEPENDENCIES)
+
+
+def month_start(date: datetime.date) -> datetime.date:
+    return date.replace(day=1)
+
+
+def next_month(date: datetime.date) -> datetime.date:
+    return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def months_between(
+        start: datetime.date, end: datetime.date
+) -> list[datetime.date]:
+    months, month = [], month_start(start)
+    while month <= end:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def calendar_key(route_id: int, month: datetime.date, versions: list) -> str:
+    version = "-".join(map(str, versions))
+    return f"route-calendar:{route_id}:{month:%Y-%m}:{version}"
+
+
+def daily_availability(
+        route_id: int, start: datetime.date, end: datetime.date
+) -> dict[datetime.date, dict]:
+    """
+    Journeys, earliest departure and seats left per local departure date.
+    Seats left are counted as for a single journey, over the segments
+    between its stops when it has any, so journeys are read with their
+    stops and summed per day here.
+    """
+    journeys = (
+        Journey.objects.filter(
+            route_id=route_id,
+            departure_time__date__gte=start,
+            departure_time__date__lte=end,
+        )
+        .prefetch_related("stops")
+        .annotate(
+            date=TruncDate("departure_time"),
+            tickets_available=(
+                F("train__cargo_num") * F("train__places_in_cargo")
+                - Count("tickets")
+            ),
+        )
+        .order_by("departure_time")
+    )
+    days = {}
+    for journey in journeys:
+        seats = inventory.journey_free_seats(journey, reference.trains)
+        day = days.setdefault(
+            journey.date,
+            {
+                "date": journey.date,
+                "journeys": 0,
+                "earliest_departure": journey.departure_time,
+                "seats_available": 0,
+                "min_seats_available": seats,
+            },
+        )
+        day["journeys"] += 1
+        day["seats_available"] += seats
+        day["min_seats_available"] = min(day["min_seats_available"], seats)
+    return days
+
+
+def route_calendar(
+        route_id: int, start: datetime.date, end: datetime.date
+) -> list[dict]:
+    """
+    Availability for every day between start and end. Whole months are
+    cached per route and versions of CALENDAR_DEPENDENCIES, the months
+    missing from the cache are computed together.
+    """
+    months = months_between(start, end)
+    versions = response_cache.get_versions(CALENDAR_DEPENDENCIES)
+    keys = {
+        month: calendar_key(route_id, month, versions) for month in months
+    }
+    cached = cache.get_many(keys.values())
+
+    missing = [month for month in months if keys[month] not in cached]
+    if missing:
+        days = daily_availability(
+            route_id,
+            missing[0],
+            next_month(missing[-1]) - datetime.timedelta(days=1),
+        )
+        computed = {
+            keys[month]: {
+                date: row
+                for date, row in days.items()
+                if month_start(date) == month
+            }
+            for month in missing
+        }
+        cache.set_many(computed, settings.ROUTE_CALENDAR_CACHE_TTL)
+        cached.update(computed)
+
+    calendar, date = [], start
+    while date <= end:
+        calendar.append(
+            cached[keys[month_start(date)]].get(
+                date,
+                {
+                    "date": date,
+                    "journeys": 0,
+                    "earliest_departure": None,
+                    "seats_available": 0,
+                    "min_seats_available": None,
+                },
+            )
+        )
+        date += datetime.timedelta(days=1)
+    return calendar
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.request import Request
+
+BATCH_URLCONF = "train_station.urls"
+
+
+class ParentRequestAuthentication(BaseAuthentication):
+    """Reuses the user already authenticated by the batch request"""
+
+    def authenticate(self, request: Request) -> tuple | None:
+        return getattr(request._request, "batch_auth", None)
+
+
+def build_request(parent: Request, prefix: str, path: str) -> HttpRequest:
+    url = urlsplit(path.lstrip("/"))
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = f"{prefix}{url.path}"
+    request.META = {
+        key: value
+        for key, value in parent.META.items()
+        if key not in ("CONTENT_LENGTH", "CONTENT_TYPE")
+    }
+    request.META.update(
+        REQUEST_METHOD="GET",
+        PATH_INFO=request.path,
+        QUERY_STRING=url.query,
+    )
+    request.GET = QueryDict(url.query)
+    request.batch_auth = (parent.user, parent.auth)
+    return request
+
+
+def run_operation(parent: Request, prefix: str, operation: dict) -> dict:
+    result = {"id": operation.get("id"), "path": operation["path"]}
+    try:
+        match = resolve(
+            "/" + urlsplit(operation["path"].lstrip("/")).path,
+            urlconf=BATCH_URLCONF,
+        )
+    except Resolver404:
+        match = None
+    if match is None or not hasattr(match.func, "actions"):
+        return {
+            **result,
+            "status": status.HTTP_404_NOT_FOUND,
+            "body": {"detail": "Not found."},
+        }
+
+    view = match.func.cls.as_view(
+        match.func.actions,
+        **match.func.initkwargs,
+        authentication_classes=[ParentRequestAuthentication],
+        throttle_classes=[],
+    )
+    response = view(
+        build_request(parent, prefix, operation["path"]),
+        *match.args,
+        **match.kwargs,
+    )
+    return {
+        **result,
+        "status": response.status_code,
+        "body": getattr(response, "data", None),
+    }
+
+
+def _run_in_thread(parent: Request, prefix: str, operation: dict) -> dict:
+    try:
+        return run_operation(parent, prefix, operation)
+    finally:
+        connections.close_all()
+
+
+def run_batch(parent: Request, prefix: str, operations: list) -> list[dict]:
+    """
+    Runs GET sub-requests against the train_station router as the batch
+    caller. Sub-requests use their own database connection in a thread
+    pool, unless the batch runs inside a transaction whose data other
+    connections could not see. They read from the same database as the
+    batch request.
+    """
+    workers = min(settings.BATCH_MAX_WORKERS, len(operations))
+    if workers <= 1 or connection.in_atomic_block:
+        return [
+            run_operation(parent, prefix, operation)
+            for operation in operations
+        ]
+
+    context = copy_context()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda operation: context.copy().run(
+                    _run_in_thread, parent, prefix, operation
+                ),
+                operations,
+            )
+        )
@@ -0,0 +1,56 @@
+from typing import Iterable
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from train_station.models import Journey, Ticket
+
+BOARDED = "boarded"
+ALREADY_BOARDED = "already_boarded"
+DUPLICATE = "duplicate"
+WRONG_JOURNEY = "wrong_journey"
+NOT_FOUND = "not_found"
+
+
+def check_in_tickets(journey: int, ticket_ids: Iterable[int]) -> dict:
+    """
+    Board a batch of scanned tickets with a fixed number of queries:
+    one SELECT of the scanned tickets, one UPDATE and one count.
+    Re-sending the same batch is safe, boarded tickets stay boarded.
+    """
+    ticket_ids = list(ticket_ids)
+    tickets = {
+        pk: (journey_id, checked_in_at)
+        for pk, journey_id, checked_in_at in Ticket.objects.filter(
+            pk__in=set(ticket_ids)
+        ).values_list("pk", "journey_id", "checked_in_at")
+    }
+
+    results, to_board, seen = [], [], set()
+    for ticket_id in ticket_ids:
+        if ticket_id in seen:
+            state = DUPLICATE
+        elif ticket_id not in tickets:
+            state = NOT_FOUND
+        elif tickets[ticket_id][0] != journey:
+            state = WRONG_JOURNEY
+        elif tickets[ticket_id][1] is not None:
+            state = ALREADY_BOARDED
+        else:
+            state = BOARDED
+            to_board.append(ticket_id)
+        seen.add(ticket_id)
+        results.append({"ticket": ticket_id, "status": state})
+
+    if to_board:
+        Ticket.objects.filter(
+            pk__in=to_board, checked_in_at__isnull=True
+        ).update(checked_in_at=timezone.now())
+
+    counts = Journey.objects.filter(pk=journey).aggregate(
+        total=Count("tickets"),
+        boarded=Count(
+            "tickets", filter=Q(tickets__checked_in_at__isnull=False)
+        ),
+    )
+    return {"results": results, **counts}
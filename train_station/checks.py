@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+def is_shared_cache(alias: str) -> bool:
+    """Whether every worker process sees the same entries in the cache"""
+    return settings.CACHES[alias]["BACKEND"] not in LOCAL_CACHE_BACKENDS
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs, **kwargs) -> list[Error]:
+    errors = []
+    if not is_shared_cache("default"):
+        errors.append(
+            Error(
+                "The default cache is local to each process.",
+                hint=(
+                    "Set REDIS_URL. Throttle budgets, cached responses and "
+                    "reference cache versions are shared through it."
+                ),
+                id="train_station.E001",
+            )
+        )
+    if not is_shared_cache(settings.TICKET_TOKEN_REPLAY_CACHE):
+        errors.append(
+            Error(
+                "TICKET_TOKEN_REPLAY_CACHE is local to each process, so a "
+                "ticket token can be replayed against another worker.",
+                hint="Point it to a cache shared by every worker.",
+                id="train_station.E002",
+            )
+        )
+    return errors
+
+
+@register(Tags.security, deploy=True)
+def check_ticket_token_secret(app_configs, **kwargs) -> list[Error]:
+    if settings.TICKET_TOKEN_SECRET:
+        return []
+    return [
+        Error(
+            "TICKET_TOKEN_SECRET is not set, ticket tokens cannot be issued.",
+            id="train_station.E003",
+        )
+    ]
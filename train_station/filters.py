@@ -55,11 +55,11 @@ class JourneyFilter(django_filters.FilterSet):
     departure_time = django_filters.CharFilter(method="filter_departure_time")
     arrival_time = django_filters.CharFilter(method="filter_arrival_time")
     source = django_filters.CharFilter(
-        field_name="route__source__name",
+        field_name="source_station__name",
         lookup_expr="icontains",
     )
     destination = django_filters.CharFilter(
-        field_name="route__destination__name",
+        field_name="destination_station__name",
         lookup_expr="icontains"
     )
 
@@ -0,0 +1,373 @@
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Type
+
+from django.apps import apps
+from django.db import connections, models, transaction
+from django.db.models import Q
+
+from train_station.ordering import OrderingHelper
+
+
+LOGGED_QUERY_RE = re.compile(
+    r"^\(\d+(?:\.\d+)?\)\s+(?P<sql>.*?);\s*args=.*$", re.DOTALL
+)
+COLUMN_RE = re.compile(
+    r'(?:"(?P<table>\w+)"|\b(?P<alias>T\d+))\."(?P<column>\w+)"'
+)
+TABLE_RE = re.compile(
+    r'\b(?:FROM|JOIN)\s+"(?P<table>\w+)"(?:\s+(?P<alias>T\d+))?',
+    re.IGNORECASE,
+)
+CLAUSE_END_RE = (
+    r"(?=\bGROUP BY\b|\bHAVING\b|\bORDER BY\b|\bLIMIT\b|\bOFFSET\b|$)"
+)
+WHERE_RE = re.compile(r"\bWHERE\b(?P<clause>.*?)" + CLAUSE_END_RE, re.DOTALL)
+ORDER_BY_RE = re.compile(
+    r"\bORDER BY\b(?P<clause>.*?)(?=\bLIMIT\b|\bOFFSET\b|$)", re.DOTALL
+)
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+EQUALITY_RE = re.compile(r"^\s*(?:=|IN\b)", re.IGNORECASE)
+RANGE_RE = re.compile(
+    r"^\s*(?:<=|>=|<|>|BETWEEN\b)|^\s*AT TIME ZONE", re.IGNORECASE
+)
+IS_NULL_RE = re.compile(r"^\s*IS\s+(?P<negated>NOT\s+)?NULL", re.IGNORECASE)
+MAX_INDEX_COLUMNS = 3
+
+
+@dataclass
+class QueryShape:
+    sql: str
+    count: int = 1
+    equality: dict = field(default_factory=dict)
+    ranges: dict = field(default_factory=dict)
+    ordering: dict = field(default_factory=dict)
+    nulls: dict = field(default_factory=dict)
+
+
+@dataclass
+class IndexProposal:
+    model: Type[models.Model]
+    fields: tuple
+    condition: Optional[Q] = None
+    hits: int = 0
+    sources: set = field(default_factory=set)
+    queries: list = field(default_factory=list)
+    benefit: Optional[float] = None
+
+    @property
+    def key(self) -> tuple:
+        return self.model, self.fields, str(self.condition)
+
+    def as_index(self) -> models.Index:
+        index = models.Index(
+            fields=list(self.fields), condition=self.condition, name="tmp"
+        )
+        index.set_name_with_model(self.model)
+        return index
+
+
+def read_workload(lines: Iterable[str]) -> list[str]:
+    """Extract SQL statements from plain SQL or django.db.backends logs"""
+    statements, buffer = [], []
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        match = LOGGED_QUERY_RE.match(line.strip())
+        if match:
+            statements.append(match.group("sql"))
+            continue
+        buffer.append(line)
+        if line.rstrip().endswith(";"):
+            statements.append(" ".join(buffer).strip().rstrip(";"))
+            buffer = []
+    if buffer:
+        statements.append(" ".join(buffer).strip().rstrip(";"))
+    return [
+        sql for sql in statements if sql.lstrip().upper().startswith("SELECT")
+    ]
+
+
+def normalize(sql: str) -> str:
+    return re.sub(r"\s+", " ", LITERAL_RE.sub("?", sql)).strip()
+
+
+def _table_aliases(sql: str) -> dict:
+    return {
+        match.group("alias") or match.group("table"): match.group("table")
+        for match in TABLE_RE.finditer(sql)
+    }
+
+
+def _columns(clause: str, aliases: dict) -> Iterable[tuple]:
+    for match in COLUMN_RE.finditer(clause):
+        table = aliases.get(
+            match.group("alias") or match.group("table"),
+            match.group("table"),
+        )
+        yield table, match.group("column"), clause[match.end():]
+
+
+def parse_query(sql: str) -> QueryShape:
+    shape = QueryShape(sql=sql)
+    aliases = _table_aliases(sql)
+
+    where = WHERE_RE.search(sql)
+    if where:
+        for table, column, tail in _columns(where.group("clause"), aliases):
+            null = IS_NULL_RE.match(tail)
+            if null:
+                shape.nulls.setdefault(table, {})[column] = not null.group(
+                    "negated"
+                )
+            elif EQUALITY_RE.match(tail):
+                shape.equality.setdefault(table, []).append(column)
+            elif RANGE_RE.match(tail):
+                shape.ranges.setdefault(table, []).append(column)
+
+    order_by = ORDER_BY_RE.search(sql)
+    if order_by:
+        for table, column, _ in _columns(order_by.group("clause"), aliases):
+            shape.ordering.setdefault(table, []).append(column)
+
+    return shape
+
+
+def collect_workload(statements: Iterable[str]) -> list[QueryShape]:
+    counts = Counter()
+    samples = {}
+    for sql in statements:
+        key = normalize(sql)
+        counts[key] += 1
+        samples.setdefault(key, sql)
+    shapes = []
+    for key, count in counts.most_common():
+        shape = parse_query(samples[key])
+        shape.count = count
+        shapes.append(shape)
+    return shapes
+
+
+class IndexAdvisor:
+    def __init__(self, app_label: str = "train_station") -> None:
+        self.app_config = apps.get_app_config(app_label)
+        self.models_by_table = {
+            model._meta.db_table: model
+            for model in self.app_config.get_models()
+        }
+        self.proposals = {}
+        self.shapes = []
+
+    @staticmethod
+    def _field_name(model: Type[models.Model], column: str) -> Optional[str]:
+        for model_field in model._meta.concrete_fields:
+            if model_field.column == column:
+                return model_field.name
+        return None
+
+    def _field_names(
+            self, model: Type[models.Model], columns: Iterable[str]
+    ) -> list[str]:
+        names = (self._field_name(model, column) for column in columns)
+        return [name for name in names if name]
+
+    @staticmethod
+    def existing_prefixes(model: Type[models.Model]) -> set:
+        opts = model._meta
+        prefixes = {
+            (model_field.name,)
+            for model_field in opts.concrete_fields
+            if model_field.db_index or model_field.unique
+        }
+        for fields in opts.unique_together:
+            prefixes.add(tuple(fields))
+        for index in opts.indexes:
+            prefixes.add(tuple(index.fields))
+        for constraint in opts.constraints:
+            if getattr(constraint, "fields", None):
+                prefixes.add(tuple(constraint.fields))
+        return prefixes
+
+    def is_covered(self, model: Type[models.Model], fields: tuple) -> bool:
+        return any(
+            existing[:len(fields)] == fields
+            for existing in self.existing_prefixes(model)
+        )
+
+    def propose(
+            self,
+            model: Type[models.Model],
+            fields: Iterable[str],
+            source: str,
+            condition: Optional[Q] = None,
+    ) -> Optional[IndexProposal]:
+        fields = tuple(dict.fromkeys(fields))[:MAX_INDEX_COLUMNS]
+        if not fields or fields == ("id",):
+            return None
+        if condition is None and self.is_covered(model, fields):
+            return None
+
+        proposal = IndexProposal(
+            model=model, fields=fields, condition=condition
+        )
+        proposal = self.proposals.setdefault(proposal.key, proposal)
+        proposal.sources.add(source)
+        return proposal
+
+    def _resolve_path(
+            self, model: Type[models.Model], path: str
+    ) -> tuple[Type[models.Model], str]:
+        parts = path.split("__")
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model, parts[-1]
+
+    def add_static_candidates(self, registry: Iterable[tuple]) -> None:
+        """Propose indexes for filter and ordering fields of the viewsets"""
+        for _, viewset, _ in registry:
+            queryset = getattr(viewset, "queryset", None)
+            if queryset is None:
+                continue
+            model = queryset.model
+            source = viewset.__name__
+
+            filterset_class = getattr(viewset, "filterset_class", None)
+            if filterset_class is not None:
+                for name, filter_ in filterset_class.base_filters.items():
+                    if "contains" in (filter_.lookup_expr or ""):
+                        continue
+                    try:
+                        target, field_name = self._resolve_path(
+                            model, filter_.field_name
+                        )
+                        target._meta.get_field(field_name)
+                    except (AttributeError, LookupError):
+                        continue
+                    if target is model:
+                        self.propose(
+                            model,
+                            [field_name],
+                            f"{filterset_class.__name__}.{name}",
+                        )
+
+            for name in getattr(viewset, "ordering_fields", []):
+                path = OrderingHelper.field_mapping.get(name, name)
+                target, field_name = self._resolve_path(model, path)
+                self.propose(target, [field_name], f"{source}.ordering={name}")
+
+    def add_workload(self, shapes: Iterable[QueryShape]) -> None:
+        for shape in shapes:
+            tables = (
+                set(shape.equality)
+                | set(shape.ranges)
+                | set(shape.ordering)
+                | set(shape.nulls)
+            )
+            for table in tables:
+                model = self.models_by_table.get(table)
+                if model is None:
+                    continue
+                equality = self._field_names(
+                    model, shape.equality.get(table, [])
+                )
+                ranges = self._field_names(model, shape.ranges.get(table, []))
+                ordering = self._field_names(
+                    model, shape.ordering.get(table, [])
+                )
+
+                if equality and ordering:
+                    fields = equality + ordering
+                elif equality and ranges:
+                    fields = equality + ranges[:1]
+                else:
+                    fields = equality or ranges[:1] or ordering
+
+                condition = None
+                nulls = shape.nulls.get(table, {})
+                for column, is_null in nulls.items():
+                    name = self._field_name(model, column)
+                    if name:
+                        condition = (condition or Q()) & Q(
+                            **{f"{name}__isnull": is_null}
+                        )
+
+                self.propose(model, fields, "workload", condition=condition)
+            self.shapes.append(shape)
+
+        for proposal in self.proposals.values():
+            proposal.queries = [
+                shape for shape in self.shapes if self._uses(shape, proposal)
+            ]
+            proposal.hits = sum(shape.count for shape in proposal.queries)
+
+    @staticmethod
+    def _uses(shape: QueryShape, proposal: IndexProposal) -> bool:
+        """Whether the query filters or orders by the leading index column"""
+        opts = proposal.model._meta
+        column = opts.get_field(proposal.fields[0]).column
+        return any(
+            column in columns.get(opts.db_table, ())
+            for columns in (shape.equality, shape.ranges, shape.ordering)
+        )
+
+    def estimate(self, using: str = "default") -> bool:
+        """
+        Fill in the EXPLAIN cost reduction of every proposal that has
+        workload queries. Each index is created inside a transaction that
+        is rolled back, so nothing is left behind in the database.
+        """
+        connection = connections[using]
+        if connection.vendor != "postgresql":
+            return False
+
+        baseline = {}
+        with connection.cursor() as cursor:
+            for proposal in self.proposals.values():
+                for shape in proposal.queries:
+                    if shape.sql not in baseline:
+                        baseline[shape.sql] = explain_cost(cursor, shape.sql)
+
+        for proposal in self.proposals.values():
+            if not proposal.queries:
+                continue
+            try:
+                with transaction.atomic(using=using):
+                    with connection.schema_editor(atomic=False) as editor:
+                        editor.add_index(proposal.model, proposal.as_index())
+                    with connection.cursor() as cursor:
+                        proposal.benefit = sum(
+                            (
+                                baseline[shape.sql]
+                                - explain_cost(cursor, shape.sql)
+                            ) * shape.count
+                            for shape in proposal.queries
+                        )
+                    raise _Rollback
+            except _Rollback:
+                pass
+        return True
+
+    def ranked(self) -> list[IndexProposal]:
+        return sorted(
+            self.proposals.values(),
+            key=lambda proposal: (
+                -(proposal.benefit or 0),
+                -proposal.hits,
+                proposal.model.__name__,
+            ),
+        )
+
+
+class _Rollback(Exception):
+    pass
+
+
+def explain_cost(cursor, sql: str) -> float:
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Total Cost"]
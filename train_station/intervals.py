@@ -0,0 +1,88 @@
+import heapq
+from typing import Any, Hashable, Iterable, NamedTuple
+
+
+class Interval(NamedTuple):
+    start: Any
+    end: Any
+    key: Hashable
+
+    def overlaps(self, start: Any, end: Any) -> bool:
+        return self.start < end and start < self.end
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over non-empty half-open intervals.
+    Built in O(n log n), answers overlap queries in O(log n + k).
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: Iterable[Interval]) -> None:
+        intervals = list(intervals)
+        self.center = None
+        self.by_start = self.by_end = ()
+        self.left = self.right = None
+        if not intervals:
+            return
+
+        starts = sorted(interval.start for interval in intervals)
+        self.center = starts[len(starts) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval.end <= self.center:
+                left.append(interval)
+            elif interval.start > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        self.by_start = sorted(here, key=lambda interval: interval.start)
+        self.by_end = sorted(
+            here, key=lambda interval: interval.end, reverse=True
+        )
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, start: Any, end: Any) -> list[Interval]:
+        found, stack = [], [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node.center is None:
+                continue
+            if end <= node.center:
+                for interval in node.by_start:
+                    if interval.start >= end:
+                        break
+                    found.append(interval)
+                stack.append(node.left)
+            elif start > node.center:
+                for interval in node.by_end:
+                    if interval.end <= start:
+                        break
+                    found.append(interval)
+                stack.append(node.right)
+            else:
+                found.extend(
+                    interval for interval in node.by_start
+                    if interval.overlaps(start, end)
+                )
+                stack.extend((node.left, node.right))
+        return found
+
+
+def overlapping_pairs(
+        intervals: Iterable[Interval],
+) -> list[tuple[Interval, Interval]]:
+    """
+    All pairs of overlapping half-open intervals by a sweep over the
+    starts with a heap of active ends, O(n log n + k) for k pairs.
+    """
+    pairs, active = [], []
+    for interval in sorted(intervals):
+        while active and active[0][0] <= interval.start:
+            heapq.heappop(active)
+        pairs.extend((other, interval) for _, _, other in active)
+        heapq.heappush(active, (interval.end, id(interval), interval))
+    return pairs
@@ -0,0 +1,131 @@
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F
+
+from train_station.models import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 5.0
+
+handlers = defaultdict(list)
+
+
+def subscribe(name: str, handler: Callable[[], None]) -> None:
+    handlers[name].append(handler)
+
+
+def dispatch(name: str) -> None:
+    for handler in handlers.get(name, ()):
+        handler()
+
+
+def publish(name: str, using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Tell every worker that its local copies of `name` are stale. The
+    version row and the NOTIFY are part of the current transaction, so
+    listeners only hear about committed changes.
+    """
+    versions = CacheVersion.objects.using(using)
+    if not versions.filter(name=name).update(version=F("version") + 1):
+        versions.get_or_create(name=name, defaults={"version": 1})
+
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                [settings.INVALIDATION_CHANNEL, name],
+            )
+
+
+class InvalidationListener(threading.Thread):
+    """
+    Applies invalidations published by other processes. Listens for
+    NOTIFY on PostgreSQL and polls the version table elsewhere. After
+    every (re)connect the versions are compared, so events missed while
+    disconnected are not lost.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        super().__init__(name="invalidation-listener", daemon=True)
+        self.using = using
+        self.versions = None
+        self.stopped = threading.Event()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                if connections[self.using].vendor == "postgresql":
+                    self.listen()
+                else:
+                    self.poll()
+            except Exception:
+                logger.exception("Invalidation listener failed")
+                self.stopped.wait(RECONNECT_DELAY)
+            finally:
+                connections.close_all()
+
+    def catch_up(self) -> None:
+        versions = dict(
+            CacheVersion.objects.using(self.using).values_list(
+                "name", "version"
+            )
+        )
+        if self.versions is not None:
+            for name, version in versions.items():
+                if self.versions.get(name) != version:
+                    dispatch(name)
+        self.versions = versions
+
+    def poll(self) -> None:
+        while not self.stopped.is_set():
+            self.catch_up()
+            self.stopped.wait(settings.INVALIDATION_POLL_INTERVAL)
+
+    def listen(self) -> None:
+        # A dedicated connection, a pooled one would go back to the pool
+        # still listening
+        connection = connections[self.using]
+        raw = connection.Database.connect(**connection.get_connection_params())
+        try:
+            raw.autocommit = True
+            raw.add_notify_handler(lambda notify: dispatch(notify.payload))
+            raw.execute(f"LISTEN {settings.INVALIDATION_CHANNEL}")
+            self.catch_up()
+            while not self.stopped.is_set():
+                readable, _, _ = select.select(
+                    [raw.fileno()], [], [], settings.INVALIDATION_POLL_INTERVAL
+                )
+                if readable:
+                    # notifications are delivered while a query runs
+                    raw.execute("SELECT 1")
+        finally:
+            raw.close()
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def start_listener() -> InvalidationListener:
+    """
+    Run a listener in this process, once. Called by every server worker
+    after it is forked, as the listener holds database connections that
+    must not be shared with forked processes.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = InvalidationListener()
+            _listener.start()
+        return _listener
@@ -0,0 +1,117 @@
+from functools import reduce
+from operator import or_
+from typing import Iterable
+
+from django.core.exceptions import ValidationError
+
+
+def to_bitset(data: bytes) -> int:
+    return int.from_bytes(data or b"", "little")
+
+
+def to_bytes(bitset: int) -> bytes:
+    return bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+
+
+def seat_index(train, cargo: int, seat: int) -> int:
+    return (cargo - 1) * train.places_in_cargo + (seat - 1)
+
+
+def occupied(segments: Iterable) -> int:
+    """Seats taken on any of the segments (stops up to the next stop)"""
+    return reduce(
+        or_, (to_bitset(stop.occupied_seats) for stop in segments), 0
+    )
+
+
+def free_seats(train, segments: Iterable) -> int:
+    capacity = train.cargo_num * train.places_in_cargo
+    return capacity - occupied(segments).bit_count()
+
+
+def journey_free_seats(journey, trains) -> int | None:
+    """
+    Seats free over the whole journey: on all of its segments, or for a
+    journey without stops those not sold, from its `tickets_available`
+    annotation. Trains are looked up in the given reference cache.
+    """
+    stops = list(journey.stops.all())
+    if len(stops) > 1:
+        return free_seats(trains.get(journey.train_id), stops[:-1])
+    return getattr(journey, "tickets_available", None)
+
+
+def segments_between(stops: list, departure: int, arrival: int) -> list:
+    return [
+        stop for stop in stops if departure <= stop.sequence < arrival
+    ]
+
+
+def _locked_segments(ticket) -> list:
+    return list(
+        ticket.journey.stops.select_for_update().filter(
+            sequence__gte=ticket.departure_stop.sequence,
+            sequence__lt=ticket.arrival_stop.sequence,
+        )
+    )
+
+
+def reserve(ticket) -> None:
+    """Mark the ticket seat as taken on every segment it travels"""
+    if ticket.departure_stop_id is None:
+        return
+
+    segments = _locked_segments(ticket)
+    bit = 1 << seat_index(ticket.journey.train, ticket.cargo, ticket.seat)
+    if occupied(segments) & bit:
+        raise ValidationError(
+            {"seat": "Seat is already taken on this part of the journey"}
+        )
+    for stop in segments:
+        stop.occupied_seats = to_bytes(to_bitset(stop.occupied_seats) | bit)
+    ticket.journey.stops.bulk_update(segments, ["occupied_seats"])
+
+
+def release(ticket) -> None:
+    if ticket.departure_stop_id is None:
+        return
+
+    segments = _locked_segments(ticket)
+    bit = 1 << seat_index(ticket.journey.train, ticket.cargo, ticket.seat)
+    for stop in segments:
+        stop.occupied_seats = to_bytes(to_bitset(stop.occupied_seats) & ~bit)
+    ticket.journey.stops.bulk_update(segments, ["occupied_seats"])
+
+
+def rebuild(journey) -> None:
+    """
+    Recompute the seats taken on every segment of the journey from its
+    tickets, once its stops changed. Tickets sold while the journey had
+    no stops take their seat on all segments.
+    """
+    stops = list(journey.stops.select_for_update())
+    taken = dict.fromkeys((stop.pk for stop in stops), 0)
+    tickets = journey.tickets.values_list(
+        "cargo", "seat", "departure_stop__sequence", "arrival_stop__sequence"
+    )
+    for cargo, seat, departure, arrival in tickets:
+        if departure is not None and departure >= arrival:
+            raise ValidationError(
+                f"Seat {seat} in cargo {cargo} is sold from a stop that "
+                f"would no longer precede its arrival stop"
+            )
+        bit = 1 << seat_index(journey.train, cargo, seat)
+        travelled = (
+            stops[:-1] if departure is None
+            else segments_between(stops, departure, arrival)
+        )
+        for stop in travelled:
+            if taken[stop.pk] & bit:
+                raise ValidationError(
+                    f"Seat {seat} in cargo {cargo} would be sold twice "
+                    f"after stop {stop.sequence}"
+                )
+            taken[stop.pk] |= bit
+    for stop in stops:
+        stop.occupied_seats = to_bytes(taken[stop.pk])
+    journey.stops.bulk_update(stops, ["occupied_seats"])
@@ -0,0 +1,139 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import migrations
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from train_station.index_advisor import (
+    IndexAdvisor,
+    collect_workload,
+    read_workload,
+)
+from train_station.urls import router
+
+
+class Command(BaseCommand):
+    help = (
+        "Propose indexes for the train_station models from a captured SQL "
+        "workload and the filter/ordering fields of the API viewsets"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "workload",
+            nargs="*",
+            help="Files with captured SQL: plain statements terminated by "
+                 "';' or django.db.backends debug log lines",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database to run EXPLAIN against",
+        )
+        parser.add_argument(
+            "--min-benefit",
+            type=float,
+            default=0.0,
+            help="Skip proposals whose estimated cost reduction is lower",
+        )
+        parser.add_argument(
+            "--write",
+            action="store_true",
+            help="Write the proposals as a train_station migration",
+        )
+        parser.add_argument(
+            "--name",
+            default="advised_indexes",
+            help="Name suffix of the written migration",
+        )
+
+    def handle(self, *args, **options):
+        statements = []
+        for path in options["workload"]:
+            try:
+                with open(path) as workload:
+                    statements.extend(read_workload(workload))
+            except OSError as error:
+                raise CommandError(f"Cannot read workload {path}: {error}")
+
+        advisor = IndexAdvisor()
+        advisor.add_static_candidates(router.registry)
+        advisor.add_workload(collect_workload(statements))
+        estimated = advisor.estimate(using=options["database"])
+
+        self.stdout.write(
+            f"Analyzed {len(statements)} queries "
+            f"({len(advisor.shapes)} distinct shapes)"
+        )
+        if not estimated:
+            self.stdout.write(
+                self.style.WARNING(
+                    "EXPLAIN costs are only available on PostgreSQL, "
+                    "proposals are ranked by workload hits"
+                )
+            )
+
+        proposals = [
+            proposal
+            for proposal in advisor.ranked()
+            if (proposal.hits or not statements)
+            and (
+                proposal.benefit is None
+                or proposal.benefit > options["min_benefit"]
+            )
+        ]
+        if not proposals:
+            self.stdout.write(self.style.SUCCESS("No indexes to propose."))
+            return
+
+        for proposal in proposals:
+            index = proposal.as_index()
+            benefit = (
+                "n/a" if proposal.benefit is None
+                else f"{proposal.benefit:.1f}"
+            )
+            condition = (
+                f" WHERE {proposal.condition}" if proposal.condition else ""
+            )
+            self.stdout.write(
+                f"{proposal.model.__name__}({', '.join(proposal.fields)})"
+                f"{condition} name={index.name} hits={proposal.hits} "
+                f"benefit={benefit} "
+                f"from: {', '.join(sorted(proposal.sources))}"
+            )
+
+        if options["write"]:
+            path = self.write_migration(proposals, options["name"])
+            self.stdout.write(self.style.SUCCESS(f"Migration written: {path}"))
+            self.stdout.write(
+                "Add the indexes to the Meta.indexes of the models so that "
+                "makemigrations stays in sync:"
+            )
+            for proposal in proposals:
+                self.stdout.write(
+                    f"  {proposal.model.__name__}: "
+                    f"{MigrationWriter.serialize(proposal.as_index())[0]}"
+                )
+
+    def write_migration(self, proposals: list, name: str) -> str:
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        app_label = "train_station"
+        leaf = loader.graph.leaf_nodes(app_label)[0]
+        number = int(leaf[1].split("_")[0]) + 1
+
+        migration = migrations.Migration(f"{number:04d}_{name}", app_label)
+        migration.dependencies = [leaf]
+        migration.operations = [
+            migrations.AddIndex(
+                model_name=proposal.model._meta.model_name,
+                index=proposal.as_index(),
+            )
+            for proposal in proposals
+        ]
+
+        writer = MigrationWriter(migration)
+        os.makedirs(os.path.dirname(writer.path), exist_ok=True)
+        with open(writer.path, "w") as migration_file:
+            migration_file.write(writer.as_string())
+        return writer.path
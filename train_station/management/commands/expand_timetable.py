@@ -0,0 +1,44 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from train_station.timetable import expand_patterns
+
+
+class Command(BaseCommand):
+    help = "Materialize journeys of the timetable patterns for a horizon"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="First date to expand (YYYY-MM-DD), defaults to today",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Number of days to expand",
+        )
+
+    def handle(self, *args, **options):
+        start = options["start"] or timezone.localdate()
+        end = start + datetime.timedelta(days=options["days"] - 1)
+
+        expansions = expand_patterns(start, end)
+
+        for pattern_id, expansion in expansions.items():
+            for conflict in expansion.skipped:
+                self.stderr.write(
+                    f"Pattern {pattern_id}: skipped "
+                    f"{conflict['departure_time']}, "
+                    f"{conflict['resource']} {conflict['id']} is busy"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {sum(e.created for e in expansions.values())} "
+                f"journeys from {len(expansions)} patterns ({start} - {end})"
+            )
+        )
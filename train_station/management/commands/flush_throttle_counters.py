@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from train_station.models import ThrottleCounter
+
+
+class Command(BaseCommand):
+    help = "Delete throttle counters whose window is over"
+
+    def handle(self, *args, **options):
+        deleted, _ = ThrottleCounter.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired throttle counters")
+        )
@@ -7,13 +7,22 @@ from django.db import connections
 class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         self.stdout.write("Waiting for the database...")
-        db_conn = None
-        while not db_conn:
+        db_conn = connections["default"]
+        pool = getattr(db_conn, "pool", None)
+        while True:
             try:
-                db_conn = connections["default"]
                 db_conn.cursor()
+                if pool is not None:
+                    # The pool must also be able to open its minimum of
+                    # connections, not only the one handed out
+                    with db_conn.wrap_database_errors:
+                        pool.wait(pool.timeout)
+                break
             except OperationalError:
                 self.stdout.write("Database unavailable, waiting 1 second...")
                 time.sleep(1)
 
+        if pool is not None:
+            db_conn.close()
+            db_conn.close_pool()
         self.stdout.write(self.style.SUCCESS("Database available!"))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from train_station.checks import is_shared_cache
+from train_station.warming import warm_journey_searches
+
+
+class Command(BaseCommand):
+    help = "Precompute cached journey lists for the most frequent searches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=settings.CACHE_WARMING_TOP,
+            help="Number of searches to warm",
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache("default"):
+            raise CommandError(
+                "The default cache is local to this process, so the serving "
+                "workers would not see the warmed responses. Set REDIS_URL, "
+                "or CACHE_WARMING_INTERVAL to warm them from every worker."
+            )
+        warmed = warm_journey_searches(options["top"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Warmed {warmed} journey searches")
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0006_alter_route_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="checked_in_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
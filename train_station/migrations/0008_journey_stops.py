@@ -0,0 +1,91 @@
+# Generated by Django 5.1.2 on 2026-10-19 09:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0007_ticket_checked_in_at"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="ticket",
+            unique_together=set(),
+        ),
+        migrations.CreateModel(
+            name="JourneyStop",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sequence", models.PositiveSmallIntegerField()),
+                ("arrival_time", models.DateTimeField(blank=True, null=True)),
+                ("departure_time", models.DateTimeField(blank=True, null=True)),
+                ("occupied_seats", models.BinaryField(default=bytes)),
+                (
+                    "journey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stops",
+                        to="train_station.journey",
+                    ),
+                ),
+                (
+                    "station",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stops",
+                        to="train_station.station",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["journey", "sequence"],
+            },
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="arrival_stop",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="arriving_tickets",
+                to="train_station.journeystop",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="departure_stop",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="departing_tickets",
+                to="train_station.journeystop",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("departure_stop__isnull", True)),
+                fields=("journey", "cargo", "seat"),
+                name="unique_journey_cargo_seat",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="journeystop",
+            constraint=models.UniqueConstraint(
+                fields=("journey", "sequence"), name="unique_journey_stop_sequence"
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.2 on 2026-10-19 09:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0008_journey_stops"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimetablePattern",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("departure_time", models.TimeField()),
+                ("arrival_time", models.TimeField()),
+                ("arrival_day_offset", models.PositiveSmallIntegerField(default=0)),
+                ("days_of_week", models.PositiveSmallIntegerField(default=127)),
+                ("valid_from", models.DateField()),
+                ("valid_until", models.DateField()),
+                (
+                    "crew",
+                    models.ManyToManyField(
+                        blank=True,
+                        related_name="timetable_patterns",
+                        to="train_station.crew",
+                    ),
+                ),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timetable_patterns",
+                        to="train_station.route",
+                    ),
+                ),
+                (
+                    "train",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timetable_patterns",
+                        to="train_station.train",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="pattern",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="journeys",
+                to="train_station.timetablepattern",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="journey",
+            constraint=models.UniqueConstraint(
+                fields=("pattern", "departure_time"),
+                name="unique_pattern_departure_time",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.contrib.postgres.fields import RangeOperators
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+import train_station.constraints
+
+
+def check_no_overlaps(apps, schema_editor):
+    """Name the journeys to fix instead of failing on the constraint"""
+    Journey = apps.get_model("train_station", "Journey")
+    later = Journey.objects.filter(
+        train=OuterRef("train"),
+        departure_time__gte=OuterRef("departure_time"),
+        departure_time__lt=OuterRef("arrival_time"),
+    ).exclude(pk=OuterRef("pk"))
+    overlapping = list(
+        Journey.objects.filter(Exists(later))
+        .values_list("pk", "train_id")
+        .order_by("pk")
+    )
+    if overlapping:
+        details = ", ".join(
+            f"journey {pk} (train {train})" for pk, train in overlapping
+        )
+        raise RuntimeError(
+            "Journeys overlapping a later journey of the same train must be "
+            f"rescheduled before migrating: {details}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0009_timetable_patterns"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(check_no_overlaps, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="journey",
+            constraint=train_station.constraints.PostgresExclusionConstraint(
+                name="journey_train_no_overlap",
+                expressions=[
+                    ("train", RangeOperators.EQUAL),
+                    (
+                        train_station.constraints.TsTzRange(
+                            "departure_time", "arrival_time"
+                        ),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                violation_error_message=(
+                    "Train is already assigned to an overlapping journey"
+                ),
+            ),
+        ),
+    ]
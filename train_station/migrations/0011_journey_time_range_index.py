@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-19 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0010_journey_no_train_overlap"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["departure_time", "arrival_time"], name="journey_time_range_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_route_stations(apps, schema_editor):
+    Journey = apps.get_model("train_station", "Journey")
+    Route = apps.get_model("train_station", "Route")
+    route = Route.objects.filter(pk=models.OuterRef("route_id"))
+    Journey.objects.update(
+        source_station_id=models.Subquery(route.values("source_id")),
+        destination_station_id=models.Subquery(route.values("destination_id")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0011_journey_time_range_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="source_station",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="departures",
+                to="train_station.station",
+            ),
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="destination_station",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="arrivals",
+                to="train_station.station",
+            ),
+        ),
+        migrations.RunPython(copy_route_stations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="journey",
+            name="source_station",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="departures",
+                to="train_station.station",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="journey",
+            name="destination_station",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="arrivals",
+                to="train_station.station",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["source_station", "departure_time"],
+                name="journey_departures_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["destination_station", "arrival_time"],
+                name="journey_arrivals_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-19 10:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0013_cache_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JourneySearch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("signature", models.CharField(max_length=512, unique=True)),
+                ("params", models.JSONField()),
+                ("hits", models.PositiveBigIntegerField(default=0)),
+                ("last_seen", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "journey searches",
+            },
+        ),
+    ]
@@ -1,11 +1,16 @@
+import datetime
 import os
 import uuid
-from typing import Type, Union
+from typing import Iterable, Type, Union
 
-from django.db import models
+from django.contrib.postgres.fields import RangeOperators
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 
+from train_station import inventory
+from train_station.constraints import PostgresExclusionConstraint, TsTzRange
+from train_station.ticket_tokens import issue_token
 from train_station_core import settings
 
 
@@ -121,6 +126,66 @@ class Crew(models.Model):
         return f"{self.full_name}"
 
 
+class TimetablePattern(models.Model):
+    MONDAY, TUESDAY, WEDNESDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY = (
+        1 << day for day in range(7)
+    )
+    EVERY_DAY = (1 << 7) - 1
+
+    route = models.ForeignKey(
+        Route,
+        on_delete=models.CASCADE,
+        related_name="timetable_patterns"
+    )
+    train = models.ForeignKey(
+        Train,
+        on_delete=models.CASCADE,
+        related_name="timetable_patterns"
+    )
+    crew = models.ManyToManyField(
+        Crew, related_name="timetable_patterns", blank=True
+    )
+    departure_time = models.TimeField()
+    arrival_time = models.TimeField()
+    arrival_day_offset = models.PositiveSmallIntegerField(default=0)
+    days_of_week = models.PositiveSmallIntegerField(default=EVERY_DAY)
+    valid_from = models.DateField()
+    valid_until = models.DateField()
+
+    def clean(self) -> None:
+        if self.valid_from > self.valid_until:
+            raise ValidationError(
+                "Valid from date cannot be later than valid until date"
+            )
+        if not 0 < self.days_of_week <= self.EVERY_DAY:
+            raise ValidationError(
+                "Days of week must be a mask of Monday=1 ... Sunday=64"
+            )
+        if (
+            not self.arrival_day_offset
+            and self.departure_time >= self.arrival_time
+        ):
+            raise ValidationError(
+                "Departure time cannot be later than or equal to arrival time"
+            )
+
+    def save(self, *args, **kwargs) -> None:
+        self.clean()
+        super().save(*args, **kwargs)
+
+    def runs_on(self, date: datetime.date) -> bool:
+        return (
+            self.valid_from <= date <= self.valid_until
+            and bool(self.days_of_week & (1 << date.weekday()))
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.route} at {self.departure_time:%H:%M} "
+            f"Train: {self.train.name}"
+        )
+
+
 class Journey(models.Model):
     route = models.ForeignKey(
         Route,
@@ -135,12 +200,109 @@ class Journey(models.Model):
     crew = models.ManyToManyField(Crew, related_name="journeys")
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    source_station = models.ForeignKey(
+        Station,
+        on_delete=models.CASCADE,
+        related_name="departures",
+        editable=False,
+    )
+    destination_station = models.ForeignKey(
+        Station,
+        on_delete=models.CASCADE,
+        related_name="arrivals",
+        editable=False,
+    )
+    pattern = models.ForeignKey(
+        TimetablePattern,
+        on_delete=models.SET_NULL,
+        related_name="journeys",
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["pattern", "departure_time"],
+                name="unique_pattern_departure_time"
+            ),
+            PostgresExclusionConstraint(
+                name="journey_train_no_overlap",
+                expressions=[
+                    ("train", RangeOperators.EQUAL),
+                    (
+                        TsTzRange("departure_time", "arrival_time"),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                violation_error_message=(
+                    "Train is already assigned to an overlapping journey"
+                ),
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["departure_time", "arrival_time"],
+                name="journey_time_range_idx"
+            ),
+            models.Index(
+                fields=["source_station", "departure_time"],
+                name="journey_departures_idx"
+            ),
+            models.Index(
+                fields=["destination_station", "arrival_time"],
+                name="journey_arrivals_idx"
+            ),
+        ]
+
+    @staticmethod
+    def validate_schedule(
+            train: Train,
+            crew: Iterable[Crew],
+            departure_time: datetime.datetime,
+            arrival_time: datetime.datetime,
+            error_to_raise: Type[ValidationError],
+            exclude: int | None = None,
+    ) -> None:
+        overlapping = Journey.objects.filter(
+            departure_time__lt=arrival_time, arrival_time__gt=departure_time
+        ).exclude(pk=exclude)
+
+        if overlapping.filter(train=train).exists():
+            raise error_to_raise(
+                {
+                    "train": "Train is already assigned "
+                             "to an overlapping journey"
+                }
+            )
+
+        busy = list(
+            overlapping.filter(crew__in=crew)
+            .values_list("crew__first_name", "crew__last_name")
+            .distinct()
+        )
+        if busy:
+            names = ", ".join(f"{first} {last}" for first, last in busy)
+            raise error_to_raise(
+                {
+                    "crew": f"Crew already assigned "
+                            f"to an overlapping journey: {names}"
+                }
+            )
 
     def clean(self) -> None:
         if self.departure_time >= self.arrival_time:
             raise ValidationError(
                 "Departure time cannot be later than or equal to arrival time"
             )
+        Journey.validate_schedule(
+            self.train,
+            self.crew.all() if self.pk else [],
+            self.departure_time,
+            self.arrival_time,
+            ValidationError,
+            exclude=self.pk,
+        )
 
     def save(self, *args, **kwargs) -> None:
         self.clean()
@@ -153,6 +315,51 @@ class Journey(models.Model):
         )
 
 
+class JourneyStop(models.Model):
+    journey = models.ForeignKey(
+        Journey, on_delete=models.CASCADE, related_name="stops"
+    )
+    station = models.ForeignKey(
+        Station, on_delete=models.CASCADE, related_name="stops"
+    )
+    sequence = models.PositiveSmallIntegerField()
+    arrival_time = models.DateTimeField(null=True, blank=True)
+    departure_time = models.DateTimeField(null=True, blank=True)
+    occupied_seats = models.BinaryField(default=bytes, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["journey", "sequence"],
+                name="unique_journey_stop_sequence"
+            )
+        ]
+        ordering = ["journey", "sequence"]
+
+    def clean(self) -> None:
+        if (
+            self.arrival_time and self.departure_time
+            and self.arrival_time > self.departure_time
+        ):
+            raise ValidationError(
+                "Arrival time at a stop cannot be later than departure time"
+            )
+
+    def save(self, *args, **kwargs) -> None:
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            inventory.rebuild(self.journey)
+
+    def delete(self, *args, **kwargs) -> tuple:
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            inventory.rebuild(self.journey)
+            return deleted
+
+    def __str__(self) -> str:
+        return f"{self.sequence}. {self.station.name}"
+
+
 class Ticket(models.Model):
     cargo = models.IntegerField()
     seat = models.IntegerField()
@@ -164,9 +371,30 @@ class Ticket(models.Model):
         on_delete=models.CASCADE,
         related_name="tickets"
     )
+    departure_stop = models.ForeignKey(
+        JourneyStop,
+        on_delete=models.RESTRICT,
+        related_name="departing_tickets",
+        null=True,
+        blank=True,
+    )
+    arrival_stop = models.ForeignKey(
+        JourneyStop,
+        on_delete=models.RESTRICT,
+        related_name="arriving_tickets",
+        null=True,
+        blank=True,
+    )
+    checked_in_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        unique_together = ("journey", "cargo", "seat")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["journey", "cargo", "seat"],
+                condition=models.Q(departure_stop__isnull=True),
+                name="unique_journey_cargo_seat"
+            )
+        ]
         ordering = ["journey", "cargo", "seat"]
 
     @staticmethod
@@ -191,6 +419,27 @@ class Ticket(models.Model):
                 }
             )
 
+    @staticmethod
+    def validate_stops(
+            journey: Journey,
+            departure_stop: JourneyStop | None,
+            arrival_stop: JourneyStop | None,
+            error_to_raise: Type[ValidationError]
+    ) -> None:
+        if (departure_stop is None) != (arrival_stop is None):
+            raise error_to_raise(
+                "Both departure and arrival stops must be set"
+            )
+        if departure_stop is None:
+            return
+        if (
+            departure_stop.journey_id != journey.id
+            or arrival_stop.journey_id != journey.id
+        ):
+            raise error_to_raise("Stops must belong to the ticket journey")
+        if departure_stop.sequence >= arrival_stop.sequence:
+            raise error_to_raise("Departure stop must precede arrival stop")
+
     def clean(self) -> None:
         Ticket.validate_ticket(
             self.cargo,
@@ -198,13 +447,71 @@ class Ticket(models.Model):
             self.journey.train,
             ValidationError,
         )
+        if self.departure_stop_id is None and self.arrival_stop_id is None:
+            stops = list(self.journey.stops.all())
+            if len(stops) > 1:
+                self.departure_stop, self.arrival_stop = stops[0], stops[-1]
+        Ticket.validate_stops(
+            self.journey,
+            self.departure_stop,
+            self.arrival_stop,
+            ValidationError,
+        )
+
+    @property
+    def token(self) -> str:
+        return issue_token(self)
 
     def save(self, *args, **kwargs) -> "Ticket":
         self.full_clean()
-        return super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self.pk:
+                previous = Ticket.objects.filter(pk=self.pk).first()
+                if previous:
+                    inventory.release(previous)
+            inventory.reserve(self)
+            return super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return (
             f"Route: {str(self.journey.route)} "
             f"Cargo: {self.cargo}, Seat: {self.seat}"
         )
+
+
+class CacheVersion(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name} v{self.version}"
+
+
+class ThrottleCounter(models.Model):
+    key = models.CharField(max_length=255)
+    window = models.BigIntegerField()
+    hits = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key", "window"], name="unique_throttle_window"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.key} @ {self.window}: {self.hits}"
+
+
+class JourneySearch(models.Model):
+    signature = models.CharField(max_length=512, unique=True)
+    params = models.JSONField()
+    hits = models.PositiveBigIntegerField(default=0)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "journey searches"
+
+    def __str__(self) -> str:
+        return f"{self.signature} ({self.hits})"
@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models
+
+from train_station import invalidation
+from train_station.models import Route, Station, Train, TrainType
+
+
+class Record:
+    """Compact read-only copy of a row, slots double as the loaded columns"""
+
+    __slots__ = ()
+
+    def __init__(self, *values) -> None:
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id})"
+
+
+class StationRecord(Record):
+    __slots__ = ("id", "name", "latitude", "longitude")
+
+
+class TrainTypeRecord(Record):
+    __slots__ = ("id", "name")
+
+
+class TrainRecord(Record):
+    __slots__ = (
+        "id", "name", "cargo_num", "places_in_cargo", "train_type_id", "image"
+    )
+
+    def __init__(self, *values) -> None:
+        super().__init__(*values)
+        field = Train._meta.get_field("image")
+        self.image = field.attr_class(None, field, self.image)
+
+    @property
+    def train_type(self) -> TrainTypeRecord | None:
+        return train_types.get(self.train_type_id)
+
+
+class RouteRecord(Record):
+    __slots__ = ("id", "source_id", "destination_id", "distance")
+
+    @property
+    def source(self) -> StationRecord | None:
+        return stations.get(self.source_id)
+
+    @property
+    def destination(self) -> StationRecord | None:
+        return stations.get(self.destination_id)
+
+    def __str__(self) -> str:
+        return f"{self.source.name} -> {self.destination.name}"
+
+
+class ReferenceCache:
+    """
+    Per-process id -> record dict of a small table, loaded whole on first
+    use. A version number in the shared cache is compared at most every
+    REFERENCE_CACHE_CHECK_INTERVAL seconds and any change made elsewhere
+    drops the local copy.
+    """
+
+    def __init__(
+            self, model: type[models.Model], record_class: type[Record]
+    ) -> None:
+        self.model = model
+        self.record_class = record_class
+        self.version_key = f"reference:{model._meta.label_lower}:version"
+        self.records = None
+        self.version = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def __deepcopy__(self, memo: dict) -> "ReferenceCache":
+        return self
+
+    def get(self, pk: int) -> Record | None:
+        records = self.load()
+        if pk not in records:
+            records = self.load(force=True)
+        return records.get(pk)
+
+    def __iter__(self) -> Iterator[Record]:
+        return iter(self.load().values())
+
+    def load(self, force: bool = False) -> dict[int, Record]:
+        now = time.monotonic()
+        records = self.records
+        if (
+            records is not None
+            and not force
+            and now - self.checked_at < settings.REFERENCE_CACHE_CHECK_INTERVAL
+        ):
+            return records
+
+        with self.lock:
+            version = cache.get(self.version_key)
+            if force or self.records is None or version != self.version:
+                # Reloads follow a change, which a replica may not have yet
+                rows = self.model.objects.using(DEFAULT_DB_ALIAS).values_list(
+                    *self.record_class.__slots__
+                )
+                self.records = {
+                    row[0]: self.record_class(*row) for row in rows
+                }
+                self.version = version
+            self.checked_at = now
+            return self.records
+
+    def clear(self) -> None:
+        with self.lock:
+            self.records = None
+
+    def invalidate(self) -> None:
+        cache.add(self.version_key, 0, timeout=None)
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, timeout=None)
+        self.clear()
+
+
+stations = ReferenceCache(Station, StationRecord)
+train_types = ReferenceCache(TrainType, TrainTypeRecord)
+trains = ReferenceCache(Train, TrainRecord)
+routes = ReferenceCache(Route, RouteRecord)
+
+REFERENCE_CACHES = {
+    Station: stations,
+    TrainType: train_types,
+    Train: trains,
+    Route: routes,
+}
+
+for model, reference in REFERENCE_CACHES.items():
+    invalidation.subscribe(model._meta.label_lower, reference.clear)
@@ -0,0 +1,171 @@
+import hashlib
+import time
+import uuid
+from functools import partial
+from typing import NamedTuple
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+WAIT_STEP = 0.05
+
+# Labels of the models any cached response depends on
+DEPENDENCIES = set()
+
+
+class CachePolicy(NamedTuple):
+    fresh: float
+    stale: float = 0
+    lock_timeout: float = 10
+
+
+class CachedResponse(NamedTuple):
+    fresh_until: float
+    data: object
+    # of the cache dependencies when computed
+    versions: list
+
+
+class CacheLock:
+    """
+    Mutex over the shared cache, released by its owner or on timeout.
+    Excludes other processes only with a cache they share.
+    """
+
+    def __init__(self, key: str, timeout: float) -> None:
+        self.key = f"lock:{key}"
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+
+    def acquire(self) -> bool:
+        return cache.add(self.key, self.token, self.timeout)
+
+    def release(self) -> None:
+        if cache.get(self.key) == self.token:
+            cache.delete(self.key)
+
+
+def version_key(label: str) -> str:
+    return f"response-version:{label}"
+
+
+def bump(label: str) -> None:
+    """Make every cached response depending on the model outdated"""
+    key = version_key(label)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_versions(labels) -> list:
+    """Current versions of the models, bumped on every write to them"""
+    keys = [version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+class ResponseCacheMixin:
+    """
+    Caches GET responses of the actions listed in `cache_policies`, for
+    responses that do not depend on the user. A response is served as is
+    while fresh. It gets stale once its time is up or any model in
+    `cache_dependencies` is written. A single request then recomputes it
+    under a cache lock while the others keep getting the stale copy. On a
+    miss, concurrent requests wait for the one holding the lock instead of
+    running the same query. Workers share the entries and locks through
+    the default cache, which has to be shared for it (see the deploy
+    checks).
+    """
+
+    cache_policies = {}
+    cache_dependencies = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        DEPENDENCIES.update(cls.cache_dependencies)
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        policy = self.cache_policies.get(self.action)
+        if policy is not None and request.method == "GET":
+            self.get = partial(self.cached_handler, self.get, policy)
+
+    def get_cache_params(self, request: Request) -> list:
+        return sorted(request.query_params.lists())
+
+    def get_cache_key(self, request: Request) -> str:
+        # Independent of the versions, so that an outdated response is
+        # still found to be served while another request recomputes it.
+        # Pages link to each other with absolute URLs, so they are kept
+        # apart per scheme and host.
+        variant = hashlib.md5(
+            repr(
+                (
+                    request.scheme,
+                    request.get_host(),
+                    sorted(self.kwargs.items()),
+                    self.get_cache_params(request),
+                )
+            ).encode()
+        ).hexdigest()
+        return f"response:{type(self).__name__}:{self.action}:{variant}"
+
+    def get_cache_versions(self) -> list:
+        return get_versions(self.cache_dependencies)
+
+    def cached_handler(
+            self, handler, policy: CachePolicy, request: Request,
+            *args, **kwargs
+    ) -> Response:
+        key = self.get_cache_key(request)
+        versions = self.get_cache_versions()
+        entry = cache.get(key)
+        refresh = getattr(request._request, "cache_refresh", False)
+        if (
+            entry is not None
+            and entry.fresh_until > time.time()
+            and entry.versions == versions
+            and not refresh
+        ):
+            return self.cached_response(entry, "HIT")
+
+        lock = CacheLock(key, policy.lock_timeout)
+        if not lock.acquire():
+            if entry is not None:
+                return self.cached_response(entry, "STALE")
+            entry = self.wait_for(key, policy.lock_timeout)
+            if entry is not None:
+                return self.cached_response(entry, "HIT")
+
+        try:
+            response = handler(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    key,
+                    CachedResponse(
+                        time.time() + policy.fresh, response.data, versions
+                    ),
+                    policy.fresh + policy.stale,
+                )
+        finally:
+            lock.release()
+        response["X-Cache"] = "MISS"
+        return response
+
+    @staticmethod
+    def wait_for(key: str, timeout: float) -> CachedResponse | None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_STEP)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    @staticmethod
+    def cached_response(entry: CachedResponse, state: str) -> Response:
+        return Response(entry.data, headers={"X-Cache": state})
@@ -0,0 +1,104 @@
+import datetime
+from collections import defaultdict
+from typing import Iterable
+
+from django.db.models import QuerySet
+
+from train_station.intervals import Interval, IntervalTree, overlapping_pairs
+from train_station.models import Journey, TimetablePattern
+
+
+def _conflict(resource: str, pk: int, first: Interval, second: Interval):
+    return {
+        "resource": resource,
+        "id": pk,
+        "journeys": [first.key, second.key],
+    }
+
+
+def journey_conflicts(queryset: QuerySet) -> list[dict]:
+    """
+    All train and crew double bookings among the journeys, found with a
+    sweep line per train and per crew member in O(n log n + k).
+    """
+    by_train, by_crew, intervals = defaultdict(list), defaultdict(list), {}
+    for pk, train_id, departure, arrival in queryset.values_list(
+        "id", "train_id", "departure_time", "arrival_time"
+    ):
+        intervals[pk] = Interval(departure, arrival, pk)
+        by_train[train_id].append(intervals[pk])
+
+    Through = Journey.crew.through
+    for journey_id, crew_id in Through.objects.filter(
+        journey__in=queryset.values("id")
+    ).values_list("journey_id", "crew_id"):
+        by_crew[crew_id].append(intervals[journey_id])
+
+    conflicts = []
+    for resource, groups in (("train", by_train), ("crew", by_crew)):
+        for pk, group in groups.items():
+            conflicts.extend(
+                _conflict(resource, pk, first, second)
+                for first, second in overlapping_pairs(group)
+            )
+    return conflicts
+
+
+def pattern_conflicts(
+        pattern: TimetablePattern,
+        planned: Iterable[tuple[datetime.datetime, datetime.datetime]],
+) -> list[dict]:
+    """
+    Planned journeys of a pattern that would double book its train or
+    crew. Existing assignments are loaded once per resource into an
+    interval tree, then every planned journey is a tree lookup.
+    """
+    planned = list(planned)
+    if not planned:
+        return []
+    window = {
+        "departure_time__lt": max(arrival for _, arrival in planned),
+        "arrival_time__gt": min(departure for departure, _ in planned),
+    }
+    existing = Journey.objects.filter(**window).exclude(pattern=pattern)
+
+    trees = {
+        ("train", pattern.train_id): IntervalTree(
+            Interval(*row)
+            for row in existing.filter(train=pattern.train_id).values_list(
+                "departure_time", "arrival_time", "id"
+            )
+        )
+    }
+    by_crew = defaultdict(list)
+    for crew_id, *row in existing.filter(
+        crew__in=pattern.crew.all()
+    ).values_list("crew__id", "departure_time", "arrival_time", "id"):
+        by_crew[crew_id].append(Interval(*row))
+    for crew_id, intervals in by_crew.items():
+        trees[("crew", crew_id)] = IntervalTree(intervals)
+
+    conflicts = [
+        {
+            "resource": "train",
+            "id": pattern.train_id,
+            "departure_time": second.start,
+            "journey": None,
+        }
+        for _, second in overlapping_pairs(
+            Interval(departure, arrival, departure)
+            for departure, arrival in planned
+        )
+    ]
+    for departure, arrival in planned:
+        for (resource, pk), tree in trees.items():
+            conflicts.extend(
+                {
+                    "resource": resource,
+                    "id": pk,
+                    "departure_time": departure,
+                    "journey": interval.key,
+                }
+                for interval in tree.overlapping(departure, arrival)
+            )
+    return conflicts
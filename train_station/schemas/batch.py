@@ -0,0 +1,18 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_view, extend_schema
+
+from train_station.serializers import BatchSerializer
+
+
+batch_schema = extend_schema_view(
+    post=extend_schema(
+        description="Run several GET requests against the train station "
+                    "API at once, with a single authentication and "
+                    "throttle charge. Paths are relative to the API root "
+                    "(ex. `journeys/1/` or `tickets/?ids=1,2`), "
+                    "up to 20 per batch. Each response has the `id` and "
+                    "`path` of its request, `status` and `body`",
+        request=BatchSerializer,
+        responses=OpenApiTypes.OBJECT,
+    ),
+)
@@ -24,4 +24,36 @@ crew_schema = extend_schema_view(
             ),
         ],
     ),
+    roster=extend_schema(
+        description="Journeys the crew member is assigned to that overlap "
+                    "the `from` - `to` time range",
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.DATETIME,
+                description="Range start (ex. ?from=2024-10-10)",
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.DATETIME,
+                description="Range end (ex. ?to=2024-10-17)",
+            ),
+        ],
+    ),
+    available=extend_schema(
+        description="Crew members with no journey overlapping the "
+                    "`from` - `to` time range",
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.DATETIME,
+                description="Range start (ex. ?from=2024-10-10T08:00)",
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.DATETIME,
+                description="Range end (ex. ?to=2024-10-10T20:00)",
+            ),
+        ],
+    ),
 )
@@ -12,6 +12,15 @@ journey_schema = extend_schema_view(
                     "Allows filtering by `departure_time`, `arrival_time`, "
                     "`source`, and `destination`",
         parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Retrieve journeys by comma separated ids in the given "
+                    "order, up to 100 at once, with the detail "
+                    "representation (ex. ?ids=3,1,2)"
+                ),
+            ),
             OpenApiParameter(
                 name="departure_time",
                 type=OpenApiTypes.STR,
@@ -50,4 +59,43 @@ journey_schema = extend_schema_view(
             ),
         ],
     ),
+    check_in=extend_schema(
+        description="Board a batch of up to 1000 scanned tickets. "
+                    "Reports `boarded`, `already_boarded`, `duplicate`, "
+                    "`wrong_journey` or `not_found` per ticket and the "
+                    "`boarded`/`total` counts of the journey. "
+                    "Re-sending a batch is safe",
+    ),
+    availability=extend_schema(
+        description="Number of seats available between two stops of the "
+                    "journey. Defaults to the first and the last stop",
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.INT,
+                description="Departure station id (ex. ?from=1)",
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.INT,
+                description="Arrival station id (ex. ?to=3)",
+            ),
+        ],
+    ),
+    conflicts=extend_schema(
+        description="Report trains and crew members assigned to "
+                    "overlapping journeys between `start` and `end` dates",
+        parameters=[
+            OpenApiParameter(
+                name="start",
+                type=OpenApiTypes.DATE,
+                description="First date (ex. ?start=2024-10-01)",
+            ),
+            OpenApiParameter(
+                name="end",
+                type=OpenApiTypes.DATE,
+                description="Last date (ex. ?end=2024-10-31)",
+            ),
+        ],
+    ),
 )
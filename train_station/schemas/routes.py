@@ -5,6 +5,8 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 
+from train_station.serializers import CalendarDaySerializer
+
 
 route_schema = extend_schema_view(
     list=extend_schema(
@@ -36,4 +38,22 @@ route_schema = extend_schema_view(
             )
         ],
     ),
+    calendar=extend_schema(
+        description="Availability of the route for every day between "
+                    "`from` and `to`: number of journeys, earliest "
+                    "departure, total and minimum seats available",
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.DATE,
+                description="First day (ex. ?from=2024-10-01)",
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.DATE,
+                description="Last day (ex. ?to=2024-10-31)",
+            ),
+        ],
+        responses=CalendarDaySerializer(many=True),
+    ),
 )
@@ -10,6 +10,15 @@ station_schema = extend_schema_view(
         description="Retrieve a list of stations. "
                     "Allows ordering by `name`",
         parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Retrieve stations by comma separated ids in the given "
+                    "order, up to 100 at once, with the detail "
+                    "representation (ex. ?ids=3,1,2)"
+                ),
+            ),
             OpenApiParameter(
                 name="ordering",
                 type=OpenApiTypes.STR,
@@ -22,4 +31,28 @@ station_schema = extend_schema_view(
             ),
         ],
     ),
+    departures=extend_schema(
+        description="Next departures from the station ordered by "
+                    "departure time. Cached for a few seconds",
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                description="Number of journeys, 20 by default "
+                            "(ex. ?limit=10)",
+            ),
+        ],
+    ),
+    arrivals=extend_schema(
+        description="Next arrivals to the station ordered by "
+                    "arrival time. Cached for a few seconds",
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                description="Number of journeys, 20 by default "
+                            "(ex. ?limit=10)",
+            ),
+        ],
+    ),
 )
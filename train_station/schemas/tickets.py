@@ -12,6 +12,15 @@ ticket_schema = extend_schema_view(
                     "Allows filtering by various fields, "
                     "and ordering by `cargo`, `seat`, or `journey`",
         parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Retrieve tickets by comma separated ids in the given "
+                    "order, up to 100 at once, with the detail "
+                    "representation (ex. ?ids=3,1,2)"
+                ),
+            ),
             OpenApiParameter(
                 name="ordering",
                 type=OpenApiTypes.STR,
@@ -25,4 +34,14 @@ ticket_schema = extend_schema_view(
             ),
         ],
     ),
+    token=extend_schema(
+        description="Retrieve the signed boarding token of a ticket. "
+                    "Available to the ticket owner and admins",
+    ),
+    verify=extend_schema(
+        description="Validate up to 500 boarding tokens at once without "
+                    "database access. Pass `journey` to reject tickets of "
+                    "other journeys and `consume` to reject tokens that "
+                    "were already used",
+    ),
 )
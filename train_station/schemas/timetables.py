@@ -0,0 +1,31 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+)
+
+
+timetable_schema = extend_schema_view(
+    list=extend_schema(
+        description="Retrieve a list of recurring timetable patterns. "
+                    "`days_of_week` is a mask of Monday=1, Tuesday=2, "
+                    "... Sunday=64",
+    ),
+    expand=extend_schema(
+        description="Create the journeys of the pattern between `start` "
+                    "and `end` dates. Already created journeys are "
+                    "skipped, so the request can be repeated safely. "
+                    "Journeys that would double book the train or crew "
+                    "are not created and listed in `skipped`, as in "
+                    "`conflicts`",
+    ),
+    conflicts=extend_schema(
+        description="Journeys the pattern would create between `start` "
+                    "and `end` dates that double book its train or crew",
+        parameters=[
+            OpenApiParameter(name="start", type=OpenApiTypes.DATE),
+            OpenApiParameter(name="end", type=OpenApiTypes.DATE),
+        ],
+    ),
+)
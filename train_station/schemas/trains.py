@@ -11,6 +11,15 @@ train_schema = extend_schema_view(
         description="Retrieve a list of trains. "
                     "Allows filtering trains by `train_name` and `train_type`",
         parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Retrieve trains by comma separated ids in the given "
+                    "order, up to 100 at once, with the detail "
+                    "representation (ex. ?ids=3,1,2)"
+                ),
+            ),
             OpenApiParameter(
                 name="train_name",
                 type=OpenApiTypes.STR,
@@ -0,0 +1,103 @@
+import datetime
+import json
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+from django.http import QueryDict
+from django.utils import timezone
+
+from train_station.models import JourneySearch
+
+logger = logging.getLogger(__name__)
+
+NAME_PARAMS = ("source", "destination")
+DATE_PARAMS = ("departure_time", "arrival_time")
+SEARCH_PARAMS = NAME_PARAMS + DATE_PARAMS + ("ordering",)
+
+
+def normalize(query_params: QueryDict) -> dict:
+    """
+    JourneyFilter params in a canonical form returning the same journeys:
+    names are matched case-insensitively and invalid or empty values are
+    ignored by the filter.
+    """
+    params = {}
+    for name in NAME_PARAMS:
+        value = query_params.get(name, "").strip().lower()
+        if value:
+            params[name] = value
+    for name in DATE_PARAMS:
+        value = query_params.get(name, "").strip()
+        try:
+            datetime.datetime.strptime(value, "%Y-%m-%d")
+            params[name] = value
+        except ValueError:
+            pass
+    ordering = query_params.get("ordering", "").replace(" ", "")
+    if ordering:
+        params["ordering"] = ordering
+    return params
+
+
+def signature(params: dict) -> str:
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class SearchRecorder:
+    """
+    Counts first-page journey searches in memory and adds the counts to
+    JourneySearch every SEARCH_STATS_FLUSH_SIZE searches.
+    """
+
+    def __init__(self) -> None:
+        self.counts = Counter()
+        self.params = {}
+        self.lock = threading.Lock()
+
+    def record(self, query_params: QueryDict) -> None:
+        if not set(query_params) <= set(SEARCH_PARAMS):
+            return
+        params = normalize(query_params)
+        key = signature(params)
+        with self.lock:
+            self.counts[key] += 1
+            self.params[key] = params
+            pending = sum(self.counts.values())
+        if pending >= settings.SEARCH_STATS_FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            counts, params = self.counts, self.params
+            self.counts, self.params = Counter(), {}
+
+        try:
+            for key, hits in counts.items():
+                updated = JourneySearch.objects.filter(signature=key).update(
+                    hits=F("hits") + hits, last_seen=timezone.now()
+                )
+                if not updated:
+                    JourneySearch.objects.get_or_create(
+                        signature=key,
+                        defaults={"params": params[key], "hits": hits},
+                    )
+        except DatabaseError:
+            logger.exception("Could not save journey search counts")
+
+
+recorder = SearchRecorder()
+
+
+def top_searches(limit: int) -> list[dict]:
+    since = timezone.now() - datetime.timedelta(
+        days=settings.CACHE_WARMING_WINDOW_DAYS
+    )
+    return list(
+        JourneySearch.objects.filter(last_seen__gte=since)
+        .order_by("-hits")
+        .values_list("params", flat=True)[:limit]
+    )
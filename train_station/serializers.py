@@ -1,7 +1,15 @@
-from django.db import transaction
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.fields import get_error_detail
 
+from train_station import inventory, reference
+from train_station.constraints import violated_constraint
 from train_station.models import (
     Station,
     Route,
@@ -10,10 +18,61 @@ from train_station.models import (
     TrainType,
     Crew,
     Journey,
+    JourneyStop,
     Ticket,
+    TimetablePattern,
 )
 
 
+@contextmanager
+def model_validation() -> Iterator[None]:
+    """Report validation errors raised by Model.save() as 400 responses"""
+    try:
+        yield
+    except DjangoValidationError as error:
+        raise ValidationError(get_error_detail(error))
+
+
+@contextmanager
+def constraint_validation(model) -> Iterator[None]:
+    """
+    Report violations of the model's constraints caught by the database,
+    e.g. after a concurrent write passed validation, as 400 responses
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        name = violated_constraint(error)
+        for constraint in model._meta.constraints:
+            if constraint.name == name:
+                raise ValidationError(
+                    constraint.get_violation_error_message()
+                )
+        raise
+
+
+class CachedNameField(serializers.CharField):
+    """Name of a related reference row looked up in the process cache"""
+
+    def __init__(self, cache: reference.ReferenceCache, **kwargs) -> None:
+        self.cache = cache
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance) -> str:
+        return self.cache.get(super().get_attribute(instance)).name
+
+
+class CachedRelatedMixin:
+    """Nested serializer reading its instance from the process cache"""
+
+    cache = None
+
+    def get_attribute(self, instance) -> reference.Record:
+        return self.cache.get(getattr(instance, f"{self.source}_id"))
+
+
 class StationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Station
@@ -92,6 +151,14 @@ class TrainDetailSerializer(TrainSerializer):
         fields = TrainSerializer.Meta.fields + ["image"]
 
 
+class CachedRouteListSerializer(CachedRelatedMixin, RouteListSerializer):
+    cache = reference.routes
+
+
+class CachedTrainListSerializer(CachedRelatedMixin, TrainListSerializer):
+    cache = reference.trains
+
+
 class CrewImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Crew
@@ -109,7 +176,7 @@ class CrewSerializer(serializers.ModelSerializer):
 class JourneySerializer(serializers.ModelSerializer):
     departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S",)
     arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S",)
-    tickets_available = serializers.IntegerField(read_only=True)
+    tickets_available = serializers.SerializerMethodField()
 
     class Meta:
         model = Journey
@@ -129,39 +196,268 @@ class JourneySerializer(serializers.ModelSerializer):
                 "Departure time cannot be later than or equal to arrival time"
             )
 
+        instance = self.instance
+        Journey.validate_schedule(
+            attrs.get("train", getattr(instance, "train", None)),
+            attrs.get("crew", instance.crew.all() if instance else []),
+            attrs["departure_time"],
+            attrs["arrival_time"],
+            ValidationError,
+            exclude=getattr(instance, "pk", None),
+        )
         return super().validate(attrs)
 
+    def create(self, validated_data: dict) -> Journey:
+        with model_validation(), constraint_validation(Journey):
+            return super().create(validated_data)
 
-class JourneyListSerializer(JourneySerializer):  #
+    def update(self, instance: Journey, validated_data: dict) -> Journey:
+        with model_validation(), constraint_validation(Journey):
+            return super().update(instance, validated_data)
+
+    def get_tickets_available(self, obj: Journey) -> int:
+        return inventory.journey_free_seats(obj, reference.trains)
+
+
+class TimetablePatternSerializer(serializers.ModelSerializer):
+    departure_time = serializers.TimeField(format="%H:%M")
+    arrival_time = serializers.TimeField(format="%H:%M")
+
+    class Meta:
+        model = TimetablePattern
+        fields = [
+            "id",
+            "route",
+            "train",
+            "crew",
+            "departure_time",
+            "arrival_time",
+            "arrival_day_offset",
+            "days_of_week",
+            "valid_from",
+            "valid_until",
+        ]
+
+    def create(self, validated_data: dict) -> TimetablePattern:
+        with model_validation():
+            return super().create(validated_data)
+
+    def update(
+            self, instance: TimetablePattern, validated_data: dict
+    ) -> TimetablePattern:
+        with model_validation():
+            return super().update(instance, validated_data)
+
+
+class DateRangeSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                "Start date cannot be later than end date"
+            )
+        if (attrs["end"] - attrs["start"]).days >= 366:
+            raise serializers.ValidationError(
+                "Date range cannot be longer than a year"
+            )
+        return super().validate(attrs)
+
+
+class TimeRangeSerializer(serializers.Serializer):
+    def get_fields(self) -> dict:
+        return {
+            "from": serializers.DateTimeField(),
+            "to": serializers.DateTimeField(),
+        }
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["from"] >= attrs["to"]:
+            raise serializers.ValidationError(
+                "`from` must be earlier than `to`"
+            )
+        return super().validate(attrs)
+
+
+class BatchIdsSerializer(serializers.Serializer):
+    ids = serializers.CharField()
+
+    def validate_ids(self, value: str) -> list[int]:
+        try:
+            ids = [int(pk) for pk in value.split(",") if pk.strip()]
+        except ValueError:
+            raise serializers.ValidationError(
+                "Ids must be a comma separated list of integers"
+            )
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > settings.BATCH_RETRIEVE_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Cannot retrieve more than "
+                f"{settings.BATCH_RETRIEVE_MAX_SIZE} objects at once"
+            )
+        return ids
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=255)
+    path = serializers.CharField(max_length=2048)
+
+    def validate_path(self, value: str) -> str:
+        if "://" in value or value.startswith("//"):
+            raise serializers.ValidationError(
+                "Path must be relative to the train station API"
+            )
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=BatchOperationSerializer(),
+        allow_empty=False,
+        max_length=settings.BATCH_MAX_REQUESTS,
+    )
+
+
+class CalendarRangeSerializer(serializers.Serializer):
+    def get_fields(self) -> dict:
+        return {
+            "from": serializers.DateField(),
+            "to": serializers.DateField(),
+        }
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["from"] > attrs["to"]:
+            raise serializers.ValidationError(
+                "`from` cannot be later than `to`"
+            )
+        days = (attrs["to"] - attrs["from"]).days
+        if days >= settings.ROUTE_CALENDAR_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Date range cannot be longer than "
+                f"{settings.ROUTE_CALENDAR_MAX_DAYS} days"
+            )
+        return super().validate(attrs)
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    journeys = serializers.IntegerField()
+    earliest_departure = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M:%S"
+    )
+    seats_available = serializers.IntegerField()
+    min_seats_available = serializers.IntegerField()
+
+
+class RosterJourneySerializer(serializers.ModelSerializer):
     route = serializers.SerializerMethodField()
-    train = serializers.CharField(
-        source="train.train_type.name",
-        read_only=True
+    train = CachedNameField(reference.trains, source="train_id")
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+
+    class Meta:
+        model = Journey
+        fields = ["id", "route", "train", "departure_time", "arrival_time"]
+
+    def get_route(self, obj: Journey) -> str:
+        return str(reference.routes.get(obj.route_id))
+
+
+class StationBoardQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.STATION_BOARD_MAX_SIZE,
+        default=settings.STATION_BOARD_SIZE,
+    )
+
+
+class StationBoardSerializer(serializers.ModelSerializer):
+    source = CachedNameField(reference.stations, source="source_station_id")
+    destination = CachedNameField(
+        reference.stations, source="destination_station_id"
     )
+    train = CachedNameField(reference.trains, source="train_id")
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+
+    class Meta:
+        model = Journey
+        fields = [
+            "id",
+            "source",
+            "destination",
+            "train",
+            "departure_time",
+            "arrival_time",
+        ]
+        read_only_fields = fields
+
+
+class JourneyStopSerializer(serializers.ModelSerializer):
+    station = serializers.SlugRelatedField(read_only=True, slug_field="name")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+
+    class Meta:
+        model = JourneyStop
+        fields = [
+            "id",
+            "sequence",
+            "station",
+            "arrival_time",
+            "departure_time",
+        ]
+
+
+class JourneyListSerializer(JourneySerializer):  #
+    route = serializers.SerializerMethodField()
+    train = serializers.SerializerMethodField()
     crew = serializers.SerializerMethodField()
 
     def get_route(self, obj: Journey) -> str:
-        return f"{obj.route.source.name} -> {obj.route.destination.name}"
+        return str(reference.routes.get(obj.route_id))
+
+    def get_train(self, obj: Journey) -> str:
+        return reference.trains.get(obj.train_id).train_type.name
 
     def get_crew(self, obj: Journey) -> list[str]:
         return [
-            f"{first_name} {last_name}"
-            for first_name, last_name in obj.crew.values_list(
-                "first_name", "last_name"
-            )
+            f"{member.first_name} {member.last_name}"
+            for member in obj.crew.all()
         ]
 
 
 class JourneyDetailSerializer(JourneySerializer):  #
     crew = CrewSerializer(many=True, read_only=True)
-    route = RouteListSerializer(read_only=True)
-    train = TrainListSerializer(read_only=True)
+    route = CachedRouteListSerializer(read_only=True)
+    train = CachedTrainListSerializer(read_only=True)
+    stops = JourneyStopSerializer(many=True, read_only=True)
+
+    class Meta(JourneySerializer.Meta):
+        model = Journey
+        fields = JourneySerializer.Meta.fields + ["stops"]
+
+
+class JourneyCheckInSerializer(serializers.Serializer):
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
 
 
 class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
-        fields = ["id", "cargo", "seat", "journey"]
+        fields = [
+            "id",
+            "cargo",
+            "seat",
+            "journey",
+            "departure_stop",
+            "arrival_stop",
+        ]
 
     def validate(self, attrs: dict) -> dict:
         data = super().validate(attrs=attrs)
@@ -171,8 +467,22 @@ class TicketSerializer(serializers.ModelSerializer):
             attrs["journey"].train,
             ValidationError
         )
+        Ticket.validate_stops(
+            attrs["journey"],
+            attrs.get("departure_stop"),
+            attrs.get("arrival_stop"),
+            ValidationError
+        )
         return data
 
+    def create(self, validated_data: dict) -> Ticket:
+        with model_validation():
+            return super().create(validated_data)
+
+    def update(self, instance: Ticket, validated_data: dict) -> Ticket:
+        with model_validation():
+            return super().update(instance, validated_data)
+
 
 class TicketListSerializer(TicketSerializer):
     journey = JourneyListSerializer(read_only=True)
@@ -182,6 +492,22 @@ class TicketDetailSerializer(TicketSerializer):
     journey = JourneyDetailSerializer(read_only=True)
 
 
+class TicketTokenSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Ticket
+        fields = ["id", "token"]
+
+
+class TicketVerifySerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=500,
+    )
+    journey = serializers.IntegerField(required=False)
+    consume = serializers.BooleanField(default=False)
+
+
 class OrderSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(
         read_only=True,
@@ -194,7 +520,7 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ["id", "tickets", "created_at"]
 
     def create(self, validated_data: dict) -> Order:
-        with transaction.atomic():
+        with transaction.atomic(), model_validation():
             tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
             for ticket_data in tickets_data:
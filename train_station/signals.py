@@ -0,0 +1,94 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from train_station import inventory, invalidation, response_cache
+from train_station.models import (
+    Journey,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from train_station.reference import REFERENCE_CACHES
+
+
+@receiver(pre_delete, sender=Ticket)
+def release_ticket_seat(sender, instance: Ticket, **kwargs) -> None:
+    inventory.release(instance)
+
+
+@receiver(pre_save, sender=Journey)
+def copy_route_stations(sender, instance: Journey, **kwargs) -> None:
+    instance.source_station_id = instance.route.source_id
+    instance.destination_station_id = instance.route.destination_id
+
+
+@receiver(post_save, sender=Route)
+def update_journey_stations(
+        sender, instance: Route, created: bool, **kwargs
+) -> None:
+    if not created:
+        instance.journeys.update(
+            source_station_id=instance.source_id,
+            destination_station_id=instance.destination_id,
+        )
+
+
+@receiver(post_save, sender=Station)
+@receiver(post_save, sender=TrainType)
+@receiver(post_save, sender=Train)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Station)
+@receiver(post_delete, sender=TrainType)
+@receiver(post_delete, sender=Train)
+@receiver(post_delete, sender=Route)
+def invalidate_reference_cache(sender, **kwargs) -> None:
+    reference = REFERENCE_CACHES[sender]
+    reference.invalidate()
+    invalidation.publish(sender._meta.label_lower)
+    # again once committed, other processes may have reloaded in between
+    transaction.on_commit(reference.invalidate)
+
+
+def bump_response_version(model) -> None:
+    label = model._meta.label_lower
+    response_cache.bump(label)
+    transaction.on_commit(partial(response_cache.bump, label))
+
+
+def outdate_cached_responses(sender, **kwargs) -> None:
+    bump_response_version(sender)
+
+
+def connect_response_cache() -> None:
+    """
+    Outdate cached responses on writes to the models they depend on,
+    once the views declaring them are imported
+    """
+    for label in response_cache.DEPENDENCIES:
+        post_save.connect(outdate_cached_responses, sender=label)
+        post_delete.connect(outdate_cached_responses, sender=label)
+
+
+@receiver(m2m_changed)
+def outdate_cached_responses_m2m(
+        sender, instance, action: str, reverse: bool, model, **kwargs
+) -> None:
+    # The relation belongs to the model declaring the field, which is the
+    # other side when changed through the related manager
+    owner = model if reverse else type(instance)
+    if (
+        action.startswith("post_")
+        and owner._meta.label_lower in response_cache.DEPENDENCIES
+    ):
+        bump_response_version(owner)
@@ -0,0 +1,165 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+BATCH_URL = reverse("station:batch")
+
+
+def create_journey() -> Journey:
+    route = Route.objects.create(
+        source=Station.objects.create(name="Lviv"),
+        destination=Station.objects.create(name="Kyiv"),
+        distance=540,
+    )
+    train = Train.objects.create(
+        name="Test Train",
+        cargo_num=10,
+        places_in_cargo=20,
+        train_type=TrainType.objects.create(name="Test Type"),
+    )
+    return Journey.objects.create(
+        route=route,
+        train=train,
+        departure_time=make_aware(datetime.datetime(2024, 10, 10, 8)),
+        arrival_time=make_aware(datetime.datetime(2024, 10, 10, 14)),
+    )
+
+
+class BatchApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@test.com", password="password"
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = create_journey()
+        for user, seat in ((self.user, 1), (self.other, 2)):
+            Ticket.objects.create(
+                journey=self.journey,
+                order=Order.objects.create(user=user),
+                cargo=1,
+                seat=seat,
+            )
+
+    def test_batch_returns_sub_responses_in_order(self) -> None:
+        res = self.client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {"id": "journey", "path": f"journeys/{self.journey.id}/"},
+                    {
+                        "id": "route",
+                        "path": f"routes/{self.journey.route_id}/",
+                    },
+                    {"id": "orders", "path": "/orders/?per_page=10"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        responses = res.data["responses"]
+        self.assertEqual(
+            [response["id"] for response in responses],
+            ["journey", "route", "orders"],
+        )
+        self.assertEqual(
+            [response["status"] for response in responses], [200, 200, 200]
+        )
+        self.assertEqual(responses[0]["body"]["id"], self.journey.id)
+        self.assertEqual(responses[1]["body"]["source"]["name"], "Lviv")
+        self.assertEqual(responses[2]["body"]["count"], 1)
+
+    def test_sub_request_errors_are_reported(self) -> None:
+        res = self.client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {"path": "journeys/999/"},
+                    {"path": "unknown/"},
+                    {"path": "/"},
+                    {"path": "batch/"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            [response["status"] for response in res.data["responses"]],
+            [404, 404, 404, 404],
+        )
+
+    def test_absolute_urls_rejected(self) -> None:
+        res = self.client.post(
+            BATCH_URL,
+            {"requests": [{"path": "https://example.com/journeys/"}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_is_capped(self) -> None:
+        res = self.client.post(
+            BATCH_URL,
+            {"requests": [{"path": "stations/"}] * 21},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_authentication(self) -> None:
+        res = APIClient().post(
+            BATCH_URL,
+            {"requests": [{"path": "stations/"}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ConcurrentBatchApiTests(TransactionTestCase):
+    def test_sub_requests_run_in_threads(self) -> None:
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="password"
+            )
+        )
+        journey = create_journey()
+
+        res = client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {"path": f"journeys/{journey.id}/"},
+                    {"path": f"trains/{journey.train_id}/"},
+                    {"path": "stations/"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            [response["status"] for response in res.data["responses"]],
+            [200, 200, 200],
+        )
+        self.assertEqual(res.data["responses"][2]["body"]["count"], 2)
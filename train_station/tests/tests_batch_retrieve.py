@@ -0,0 +1,126 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station import response_cache
+from train_station.models import (
+    Crew,
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+STATION_URL = reverse("station:station-list")
+JOURNEY_URL = reverse("station:journey-list")
+TRAIN_URL = reverse("station:train-list")
+TICKET_URL = reverse("station:ticket-list")
+
+
+class BatchRetrieveApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.client.force_authenticate(self.user)
+        self.stations = [
+            Station.objects.create(name=name)
+            for name in ("Lviv", "Kyiv", "Odesa")
+        ]
+        route = Route.objects.create(
+            source=self.stations[0],
+            destination=self.stations[1],
+            distance=540,
+        )
+        train_type = TrainType.objects.create(name="Test Type")
+        self.journeys = []
+        for day in (10, 11, 12):
+            journey = Journey.objects.create(
+                route=route,
+                train=Train.objects.create(
+                    name=f"Train {day}",
+                    cargo_num=10,
+                    places_in_cargo=20,
+                    train_type=train_type,
+                ),
+                departure_time=make_aware(datetime.datetime(2024, 10, day)),
+                arrival_time=make_aware(
+                    datetime.datetime(2024, 10, day, 6)
+                ),
+            )
+            journey.crew.add(
+                Crew.objects.create(first_name="Test", last_name=str(day))
+            )
+            self.journeys.append(journey)
+
+    def test_batch_keeps_requested_order(self) -> None:
+        ids = [self.stations[2].id, self.stations[0].id]
+
+        res = self.client.get(
+            STATION_URL, {"ids": ",".join(map(str, ids))}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([station["id"] for station in res.data], ids)
+
+    def test_batch_skips_missing_and_duplicate_ids(self) -> None:
+        pk = self.stations[1].id
+
+        res = self.client.get(STATION_URL, {"ids": f"{pk},999,{pk}"})
+
+        self.assertEqual([station["id"] for station in res.data], [pk])
+
+    def test_batch_uses_detail_serializer(self) -> None:
+        res = self.client.get(
+            TRAIN_URL, {"ids": str(self.journeys[0].train.id)}
+        )
+
+        self.assertEqual(res.data[0]["train_type"]["name"], "Test Type")
+
+    def test_batch_journeys_with_fixed_queries(self) -> None:
+        ids = ",".join(str(journey.id) for journey in self.journeys)
+        self.client.get(JOURNEY_URL, {"ids": ids})
+        response_cache.bump("train_station.journey")
+
+        with self.assertNumQueries(3):
+            res = self.client.get(JOURNEY_URL, {"ids": ids})
+
+        self.assertEqual(len(res.data), 3)
+        self.assertEqual(len(res.data[0]["crew"]), 1)
+
+    def test_batch_tickets_with_fixed_queries(self) -> None:
+        order = Order.objects.create(user=self.user)
+        ids = ",".join(
+            str(
+                Ticket.objects.create(
+                    journey=journey, order=order, cargo=1, seat=1
+                ).id
+            )
+            for journey in self.journeys
+        )
+        self.client.get(TICKET_URL, {"ids": ids})
+
+        with self.assertNumQueries(3):
+            res = self.client.get(TICKET_URL, {"ids": ids})
+
+        self.assertEqual(res.data[2]["journey"]["id"], self.journeys[2].id)
+
+    @override_settings(BATCH_RETRIEVE_MAX_SIZE=2)
+    def test_batch_size_is_capped(self) -> None:
+        res = self.client.get(STATION_URL, {"ids": "1,2,3"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_ids(self) -> None:
+        res = self.client.get(STATION_URL, {"ids": "1,a"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
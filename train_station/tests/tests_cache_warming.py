@@ -0,0 +1,157 @@
+import datetime
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Journey,
+    JourneySearch,
+    Route,
+    Station,
+    Train,
+    TrainType,
+)
+from train_station.search_stats import normalize, recorder
+from train_station.warming import warm_journey_searches
+
+JOURNEY_URL = reverse("station:journey-list")
+
+
+class JourneySearchStatsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        recorder.counts.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="password"
+            )
+        )
+        Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(name="Lviv"),
+                destination=Station.objects.create(name="Kyiv"),
+                distance=540,
+            ),
+            train=Train.objects.create(
+                name="Test Train",
+                cargo_num=10,
+                places_in_cargo=20,
+                train_type=TrainType.objects.create(name="Test Type"),
+            ),
+            departure_time=make_aware(datetime.datetime(2024, 10, 10, 8)),
+            arrival_time=make_aware(datetime.datetime(2024, 10, 10, 14)),
+        )
+
+    def test_normalize_search(self) -> None:
+        params = QueryDict(
+            "source=%20Lviv&destination=&departure_time=2024-10-10"
+            "&arrival_time=tomorrow&ordering=-departure_time"
+        )
+
+        self.assertEqual(
+            normalize(params),
+            {
+                "source": "lviv",
+                "departure_time": "2024-10-10",
+                "ordering": "-departure_time",
+            },
+        )
+
+    @override_settings(SEARCH_STATS_FLUSH_SIZE=3)
+    def test_searches_are_counted(self) -> None:
+        for source in ("Lviv", "LVIV", "lviv "):
+            self.client.get(JOURNEY_URL, {"source": source})
+
+        search = JourneySearch.objects.get()
+        self.assertEqual(search.params, {"source": "lviv"})
+        self.assertEqual(search.hits, 3)
+
+    @override_settings(SEARCH_STATS_FLUSH_SIZE=1)
+    def test_other_pages_are_not_counted(self) -> None:
+        self.client.get(JOURNEY_URL, {"source": "Lviv", "page": 2})
+
+        self.assertFalse(JourneySearch.objects.exists())
+
+    def test_equivalent_searches_share_cached_response(self) -> None:
+        self.client.get(JOURNEY_URL, {"source": "Lviv"})
+
+        res = self.client.get(JOURNEY_URL, {"source": " LVIV"})
+
+        self.assertEqual(res["X-Cache"], "HIT")
+
+    def shared_cache(self) -> override_settings:
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        return override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": (
+                        "django.core.cache.backends.filebased.FileBasedCache"
+                    ),
+                    "LOCATION": location,
+                }
+            }
+        )
+
+    @override_settings(SEARCH_STATS_FLUSH_SIZE=1)
+    def test_warming_searches_are_not_counted(self) -> None:
+        JourneySearch.objects.create(
+            signature='{"source":"lviv"}', params={"source": "lviv"}, hits=5
+        )
+
+        warm_journey_searches()
+
+        self.assertEqual(JourneySearch.objects.get().hits, 5)
+        self.assertFalse(recorder.counts)
+
+    @override_settings(CACHE_WARMING_URL="https://localhost")
+    def test_warmed_pages_link_to_public_url(self) -> None:
+        journey = Journey.objects.get()
+        for _ in range(5):
+            journey.pk = None
+            journey.departure_time += datetime.timedelta(days=1)
+            journey.arrival_time += datetime.timedelta(days=1)
+            journey.save()
+        JourneySearch.objects.create(
+            signature='{"source":"lviv"}', params={"source": "lviv"}, hits=5
+        )
+
+        warm_journey_searches()
+        res = self.client.get(
+            JOURNEY_URL, {"source": "Lviv"}, HTTP_HOST="localhost", secure=True
+        )
+
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertTrue(res.data["next"].startswith("https://localhost/"))
+
+    def test_warm_local_cache_refused(self) -> None:
+        with self.assertRaisesMessage(CommandError, "local to this process"):
+            call_command("warm_journey_cache", stdout=StringIO())
+
+    @override_settings(CACHE_WARMING_URL="http://testserver")
+    def test_warm_top_searches(self) -> None:
+        JourneySearch.objects.create(
+            signature='{"source":"lviv"}', params={"source": "lviv"}, hits=5
+        )
+        out = StringIO()
+        shared_cache = self.shared_cache()
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+
+        call_command("warm_journey_cache", "--top", "10", stdout=out)
+
+        self.assertIn("Warmed 1 journey searches", out.getvalue())
+        with self.assertNumQueries(0):
+            res = self.client.get(JOURNEY_URL, {"source": "Lviv"})
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertEqual(res.data["count"], 1)
@@ -0,0 +1,112 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+
+def sample_journey(name: str = "Test Train") -> Journey:
+    return Journey.objects.create(
+        route=Route.objects.create(
+            source=Station.objects.create(name=f"{name} source"),
+            destination=Station.objects.create(name=f"{name} destination"),
+            distance=540,
+        ),
+        train=Train.objects.create(
+            name=name,
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=TrainType.objects.get_or_create(name="Test Type")[0],
+        ),
+        departure_time=make_aware(datetime.datetime(2024, 10, 10, 10, 0)),
+        arrival_time=make_aware(datetime.datetime(2024, 10, 10, 16, 0)),
+    )
+
+
+def check_in_url(journey_id: int) -> str:
+    return reverse("station:journey-check-in", args=[journey_id])
+
+
+class CheckInApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        order = Order.objects.create(user=self.admin)
+        self.journey = sample_journey()
+        self.other_journey = sample_journey(name="Other Train")
+        self.tickets = [
+            Ticket.objects.create(
+                order=order, journey=self.journey, cargo=1, seat=seat
+            )
+            for seat in range(1, 4)
+        ]
+        self.foreign = Ticket.objects.create(
+            order=order, journey=self.other_journey, cargo=1, seat=1
+        )
+
+    def test_check_in_reports_per_ticket_status(self) -> None:
+        first, second, _ = self.tickets
+        payload = {
+            "tickets": [first.id, second.id, first.id, self.foreign.id, 999]
+        }
+
+        with self.assertNumQueries(4):
+            res = self.client.post(
+                check_in_url(self.journey.id), payload, format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in res.data["results"]],
+            ["boarded", "boarded", "duplicate", "wrong_journey", "not_found"],
+        )
+        self.assertEqual((res.data["boarded"], res.data["total"]), (2, 3))
+        self.assertIsNotNone(Ticket.objects.get(pk=first.id).checked_in_at)
+        self.assertIsNone(Ticket.objects.get(pk=self.foreign.id).checked_in_at)
+
+    def test_check_in_is_idempotent(self) -> None:
+        payload = {"tickets": [ticket.id for ticket in self.tickets]}
+        url = check_in_url(self.journey.id)
+
+        self.client.post(url, payload, format="json")
+        res = self.client.post(url, payload, format="json")
+
+        self.assertEqual(
+            {item["status"] for item in res.data["results"]},
+            {"already_boarded"},
+        )
+        self.assertEqual((res.data["boarded"], res.data["total"]), (3, 3))
+
+    def test_check_in_unknown_journey(self) -> None:
+        res = self.client.post(
+            check_in_url(9999), {"tickets": [1]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_check_in_requires_admin(self) -> None:
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.client.force_authenticate(user)
+        res = self.client.post(
+            check_in_url(self.journey.id), {"tickets": [1]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,78 @@
+import os
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.utils import OperationalError
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from psycopg_pool import ConnectionPool
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station_core.db import pools
+from train_station_core.metrics import metrics
+
+METRICS_URL = reverse("metrics")
+
+
+class PoolMetricsTests(TestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+        self.pool = ConnectionPool("", open=False, min_size=1, max_size=4)
+
+    def test_databases_without_pool_skipped(self) -> None:
+        self.assertEqual(pools(), {})
+
+    def test_pool_usage_exposed(self) -> None:
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="admin@test.com", password="password", is_staff=True
+            )
+        )
+
+        with mock.patch.object(connection, "pool", self.pool, create=True):
+            res = client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["gauges"]["db_pool.default.pool_max"], 4)
+        self.assertIn("db_pool.default.requests_waiting", res.data["gauges"])
+
+
+class PoolSizeTests(TestCase):
+    def test_pool_holds_batches_of_every_thread(self) -> None:
+        path = os.path.join(
+            settings.BASE_DIR, "train_station_core", "settings.py"
+        )
+        with mock.patch.dict(
+            os.environ, GUNICORN_THREADS="4", POSTGRES_POOL_ENABLED="1"
+        ):
+            config = runpy.run_path(path)
+
+        self.assertEqual(
+            config["DATABASES"]["default"]["OPTIONS"]["pool"]["max_size"],
+            4 * (1 + config["BATCH_MAX_WORKERS"]) + 2,
+        )
+
+
+class WaitForDbTests(TransactionTestCase):
+    def test_waits_until_pool_established(self) -> None:
+        pool = mock.Mock(timeout=1)
+        pool.wait.side_effect = [OperationalError(), None]
+
+        with (
+            mock.patch.object(connection, "pool", pool, create=True),
+            mock.patch.object(
+                connection, "close_pool", create=True
+            ) as close_pool,
+            mock.patch("time.sleep") as sleep,
+        ):
+            call_command("wait_for_db", stdout=mock.Mock())
+
+        self.assertEqual(pool.wait.call_count, 2)
+        sleep.assert_called_once_with(1)
+        close_pool.assert_called_once()
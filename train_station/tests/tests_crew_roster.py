@@ -0,0 +1,118 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Crew,
+    Journey,
+    Route,
+    Station,
+    Train,
+    TrainType,
+)
+
+AVAILABLE_URL = reverse("station:crew-available")
+
+
+def roster_url(crew_id: int) -> str:
+    return reverse("station:crew-roster", args=[crew_id])
+
+
+def at(day: int, hour: int) -> datetime.datetime:
+    return make_aware(datetime.datetime(2024, 10, day, hour, 0))
+
+
+class CrewRosterApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.client.force_authenticate(self.user)
+        route = Route.objects.create(
+            source=Station.objects.create(name="Lviv"),
+            destination=Station.objects.create(name="Kyiv"),
+            distance=540,
+        )
+        train = Train.objects.create(
+            name="Test Train",
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=TrainType.objects.create(name="Test Type"),
+        )
+        self.busy = Crew.objects.create(first_name="Busy", last_name="Crew")
+        self.free = Crew.objects.create(first_name="Free", last_name="Crew")
+        self.morning, self.evening = (
+            Journey.objects.create(
+                route=route,
+                train=train,
+                departure_time=at(10, start),
+                arrival_time=at(10, start + 4),
+            )
+            for start in (6, 16)
+        )
+        self.morning.crew.add(self.busy)
+        self.evening.crew.add(self.busy)
+
+    def test_roster_lists_overlapping_journeys_in_order(self) -> None:
+        res = self.client.get(
+            roster_url(self.busy.id),
+            {"from": "2024-10-10T08:00:00", "to": "2024-10-11"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [journey["id"] for journey in res.data["results"]],
+            [self.morning.id, self.evening.id],
+        )
+        self.assertEqual(res.data["results"][0]["route"], "Lviv -> Kyiv")
+        self.assertEqual(res.data["results"][0]["train"], "Test Train")
+
+    def test_roster_excludes_journeys_outside_range(self) -> None:
+        res = self.client.get(
+            roster_url(self.busy.id),
+            {"from": "2024-10-10T10:00:00", "to": "2024-10-10T16:00:00"},
+        )
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_available_excludes_assigned_crew(self) -> None:
+        res = self.client.get(
+            AVAILABLE_URL,
+            {"from": "2024-10-10T09:00:00", "to": "2024-10-10T12:00:00"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [crew["id"] for crew in res.data["results"]], [self.free.id]
+        )
+
+    def test_available_between_journeys(self) -> None:
+        res = self.client.get(
+            AVAILABLE_URL,
+            {"from": "2024-10-10T10:00:00", "to": "2024-10-10T16:00:00"},
+        )
+
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_available_uses_single_query(self) -> None:
+        with self.assertNumQueries(2):
+            self.client.get(
+                AVAILABLE_URL,
+                {"from": "2024-10-10T09:00:00", "to": "2024-10-10T12:00:00"},
+            )
+
+    def test_invalid_range_rejected(self) -> None:
+        res = self.client.get(
+            AVAILABLE_URL,
+            {"from": "2024-10-11T00:00:00", "to": "2024-10-10T00:00:00"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(AVAILABLE_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from train_station.index_advisor import (
+    IndexAdvisor,
+    collect_workload,
+    parse_query,
+    read_workload,
+)
+from train_station.models import Journey, Order
+from train_station.urls import router
+
+ORDER_QUERY = (
+    'SELECT "train_station_order"."id" FROM "train_station_order" '
+    'WHERE "train_station_order"."user_id" = {} '
+    'ORDER BY "train_station_order"."created_at" DESC LIMIT 4'
+)
+JOURNEY_QUERY = (
+    'SELECT "train_station_ticket"."id" FROM "train_station_ticket" '
+    'INNER JOIN "train_station_journey" T2 '
+    'ON ("train_station_ticket"."journey_id" = T2."id") '
+    'WHERE T2."train_id" = 1 AND T2."departure_time" >= \'2024-10-10\' '
+    'ORDER BY "train_station_ticket"."seat"'
+)
+
+
+class IndexAdvisorTests(TestCase):
+    def test_read_workload_from_debug_log(self) -> None:
+        lines = [
+            f"(0.001) {ORDER_QUERY.format(1)}; args=(1,); alias=default\n",
+            "UPDATE train_station_ticket SET seat = 1;\n",
+            f"{ORDER_QUERY.format(2)};\n",
+        ]
+
+        self.assertEqual(
+            read_workload(lines),
+            [ORDER_QUERY.format(1), ORDER_QUERY.format(2)],
+        )
+
+    def test_parse_query_resolves_aliases(self) -> None:
+        shape = parse_query(JOURNEY_QUERY)
+
+        self.assertEqual(
+            shape.equality, {"train_station_journey": ["train_id"]}
+        )
+        self.assertEqual(
+            shape.ranges, {"train_station_journey": ["departure_time"]}
+        )
+        self.assertEqual(shape.ordering, {"train_station_ticket": ["seat"]})
+
+    def test_workload_proposes_composite_index(self) -> None:
+        advisor = IndexAdvisor()
+        advisor.add_workload(
+            collect_workload(
+                [ORDER_QUERY.format(1), ORDER_QUERY.format(2), JOURNEY_QUERY]
+            )
+        )
+        proposals = {
+            (proposal.model, proposal.fields): proposal
+            for proposal in advisor.ranked()
+        }
+
+        self.assertEqual(len(advisor.shapes), 2)
+        self.assertEqual(proposals[(Order, ("user", "created_at"))].hits, 2)
+        self.assertIn((Journey, ("train", "departure_time")), proposals)
+
+    def test_static_candidates_skip_existing_indexes(self) -> None:
+        advisor = IndexAdvisor()
+        advisor.add_static_candidates(router.registry)
+        fields = {
+            (proposal.model, proposal.fields)
+            for proposal in advisor.ranked()
+        }
+
+        self.assertIn((Journey, ("arrival_time",)), fields)
+        self.assertIn((Order, ("created_at",)), fields)
+        self.assertNotIn((Journey, ("train",)), fields)
+
+    def test_command_lists_proposals(self) -> None:
+        out = StringIO()
+        call_command("advise_indexes", stdout=out)
+
+        self.assertIn("Journey(arrival_time)", out.getvalue())
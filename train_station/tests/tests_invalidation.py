@@ -0,0 +1,52 @@
+import threading
+
+from django.test import TestCase, TransactionTestCase
+
+from train_station import invalidation, reference
+from train_station.models import CacheVersion, Station
+
+
+class InvalidationTests(TestCase):
+    def test_publish_bumps_version(self) -> None:
+        invalidation.publish("test.model")
+        invalidation.publish("test.model")
+
+        self.assertEqual(
+            CacheVersion.objects.get(name="test.model").version, 2
+        )
+
+    def test_reference_save_publishes(self) -> None:
+        Station.objects.create(name="Lviv")
+
+        self.assertTrue(
+            CacheVersion.objects.filter(name="train_station.station").exists()
+        )
+
+    def test_dispatch_clears_reference_cache(self) -> None:
+        station = Station.objects.create(name="Lviv")
+        reference.stations.get(station.id)
+
+        invalidation.dispatch("train_station.station")
+
+        self.assertIsNone(reference.stations.records)
+
+
+class InvalidationListenerTests(TransactionTestCase):
+    def setUp(self) -> None:
+        self.received = threading.Event()
+        invalidation.subscribe("test.model", self.received.set)
+        self.listener = invalidation.InvalidationListener()
+
+    def tearDown(self) -> None:
+        self.listener.stop()
+        self.listener.join(timeout=5)
+        invalidation.handlers["test.model"].remove(self.received.set)
+
+    def test_listener_applies_published_versions(self) -> None:
+        invalidation.publish("test.model")
+        self.listener.start()
+        self.assertFalse(self.received.wait(timeout=1))
+
+        invalidation.publish("test.model")
+
+        self.assertTrue(self.received.wait(timeout=2))
@@ -155,7 +155,8 @@ class AuthenticatedJourneyApiTests(TestCase):
                 datetime.datetime(
                     2024, 10, 10, 9, 0
                 )
-            )
+            ),
+            train=sample_train(name="Test Train 2")
         )
 
         res = self.client.get(JOURNEY_URL, {"ordering": "departure_time"})
@@ -0,0 +1,236 @@
+import datetime
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.intervals import Interval, IntervalTree, overlapping_pairs
+from train_station.models import (
+    Crew,
+    Journey,
+    Route,
+    Station,
+    TimetablePattern,
+    Train,
+    TrainType,
+)
+
+JOURNEY_URL = reverse("station:journey-list")
+CONFLICTS_URL = reverse("station:journey-conflicts")
+
+no_train_overlap = import_module(
+    "train_station.migrations.0010_journey_no_train_overlap"
+)
+
+
+class ExclusionViolation(Exception):
+    diag = SimpleNamespace(constraint_name="journey_train_no_overlap")
+
+
+def at(day: int, hour: int) -> datetime.datetime:
+    return make_aware(datetime.datetime(2024, 10, day, hour, 0))
+
+
+class IntervalTests(TestCase):
+    def test_tree_finds_overlapping_intervals(self) -> None:
+        tree = IntervalTree(
+            Interval(start, start + 3, start) for start in range(0, 30, 2)
+        )
+
+        found = sorted(interval.key for interval in tree.overlapping(5, 7))
+
+        self.assertEqual(found, [4, 6])
+
+    def test_overlapping_pairs_skips_touching_intervals(self) -> None:
+        pairs = overlapping_pairs(
+            [Interval(0, 2, "a"), Interval(2, 4, "b"), Interval(1, 3, "c")]
+        )
+
+        self.assertEqual(
+            sorted((first.key, second.key) for first, second in pairs),
+            [("a", "c"), ("c", "b")],
+        )
+
+
+class JourneyConflictApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.route = Route.objects.create(
+            source=Station.objects.create(name="Lviv"),
+            destination=Station.objects.create(name="Kyiv"),
+            distance=540,
+        )
+        train_type = TrainType.objects.create(name="Test Type")
+        self.train, self.other_train = (
+            Train.objects.create(
+                name=name, cargo_num=10, places_in_cargo=20,
+                train_type=train_type,
+            )
+            for name in ("Train 1", "Train 2")
+        )
+        self.crew = Crew.objects.create(first_name="Test", last_name="Crew")
+        self.journey = Journey.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=at(10, 8),
+            arrival_time=at(10, 14),
+        )
+        self.journey.crew.add(self.crew)
+
+    def payload(self, train: Train, **params) -> dict:
+        payload = {
+            "route": self.route.id,
+            "train": train.id,
+            "departure_time": "2024-10-10 12:00:00",
+            "arrival_time": "2024-10-10 18:00:00",
+        }
+        payload.update(params)
+        return payload
+
+    def test_train_double_booking_rejected(self) -> None:
+        other_crew = Crew.objects.create(first_name="Other", last_name="Crew")
+        res = self.client.post(
+            JOURNEY_URL,
+            self.payload(self.train, crew=[other_crew.id]),
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("train", res.data)
+
+    def test_crew_double_booking_rejected(self) -> None:
+        res = self.client.post(
+            JOURNEY_URL,
+            self.payload(self.other_train, crew=[self.crew.id]),
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crew", res.data)
+
+    def test_concurrent_train_double_booking_rejected(self) -> None:
+        # Another request inserted the overlapping journey after this one
+        # was validated
+        error = IntegrityError()
+        error.__cause__ = ExclusionViolation()
+        other_crew = Crew.objects.create(first_name="Other", last_name="Crew")
+        with mock.patch.object(Journey, "save", side_effect=error):
+            res = self.client.post(
+                JOURNEY_URL,
+                self.payload(self.other_train, crew=[other_crew.id]),
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data,
+            ["Train is already assigned to an overlapping journey"],
+        )
+
+    def test_migration_reports_overlapping_journeys(self) -> None:
+        overlapping = Journey.objects.bulk_create(
+            [
+                Journey(
+                    route=self.route,
+                    train=self.train,
+                    source_station_id=self.route.source_id,
+                    destination_station_id=self.route.destination_id,
+                    departure_time=at(10, 12),
+                    arrival_time=at(10, 18),
+                )
+            ]
+        )[0]
+
+        with self.assertRaisesMessage(
+            RuntimeError, f"journey {self.journey.id} (train {self.train.id})"
+        ) as context:
+            no_train_overlap.check_no_overlaps(apps, None)
+
+        self.assertNotIn(f"journey {overlapping.id} ", str(context.exception))
+
+    def test_back_to_back_journeys_allowed(self) -> None:
+        res = self.client.post(
+            JOURNEY_URL,
+            self.payload(
+                self.train,
+                crew=[self.crew.id],
+                departure_time="2024-10-10 14:00:00",
+            ),
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_update_does_not_conflict_with_itself(self) -> None:
+        res = self.client.put(
+            reverse("station:journey-detail", args=[self.journey.id]),
+            self.payload(
+                self.train,
+                crew=[self.crew.id],
+                departure_time="2024-10-10 09:00:00",
+            ),
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_conflict_report(self) -> None:
+        overlapping = Journey.objects.bulk_create(
+            [
+                Journey(
+                    route=self.route,
+                    source_station=self.route.source,
+                    destination_station=self.route.destination,
+                    train=self.other_train,
+                    departure_time=at(10, 10),
+                    arrival_time=at(10, 20),
+                )
+            ]
+        )[0]
+        overlapping.crew.add(self.crew)
+
+        res = self.client.get(
+            CONFLICTS_URL, {"start": "2024-10-01", "end": "2024-10-31"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["conflicts"],
+            [
+                {
+                    "resource": "crew",
+                    "id": self.crew.id,
+                    "journeys": [self.journey.id, overlapping.id],
+                }
+            ],
+        )
+
+    def test_pattern_conflict_report(self) -> None:
+        pattern = TimetablePattern.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=datetime.time(13, 0),
+            arrival_time=datetime.time(15, 0),
+            valid_from=datetime.date(2024, 10, 9),
+            valid_until=datetime.date(2024, 10, 11),
+        )
+
+        res = self.client.get(
+            reverse("station:timetablepattern-conflicts", args=[pattern.id]),
+            {"start": "2024-10-01", "end": "2024-10-31"},
+        )
+
+        self.assertEqual(len(res.data["conflicts"]), 1)
+        self.assertEqual(res.data["conflicts"][0]["journey"], self.journey.id)
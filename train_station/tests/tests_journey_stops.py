@@ -0,0 +1,200 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Journey,
+    JourneyStop,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+ORDER_URL = reverse("station:order-list")
+
+
+def at(hour: int) -> datetime.datetime:
+    return make_aware(datetime.datetime(2024, 10, 10, hour, 0))
+
+
+def sample_journey_with_stops(*names: str) -> Journey:
+    stations = [Station.objects.create(name=name) for name in names]
+    journey = Journey.objects.create(
+        route=Route.objects.create(
+            source=stations[0], destination=stations[-1], distance=900
+        ),
+        train=Train.objects.create(
+            name="Test Train",
+            cargo_num=2,
+            places_in_cargo=5,
+            train_type=TrainType.objects.create(name="Test Type"),
+        ),
+        departure_time=at(8),
+        arrival_time=at(8 + 2 * len(names)),
+    )
+    for sequence, station in enumerate(stations):
+        JourneyStop.objects.create(
+            journey=journey,
+            station=station,
+            sequence=sequence,
+            arrival_time=at(8 + 2 * sequence),
+            departure_time=at(8 + 2 * sequence),
+        )
+    return journey
+
+
+def availability_url(journey_id: int) -> str:
+    return reverse("station:journey-availability", args=[journey_id])
+
+
+def calendar_url(route_id: int) -> str:
+    return reverse("station:route-calendar", args=[route_id])
+
+
+class JourneyStopsApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpassword", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey_with_stops("Lviv", "Kyiv", "Kharkiv")
+        self.lviv, self.kyiv, self.kharkiv = self.journey.stops.all()
+
+    def book(self, departure: JourneyStop, arrival: JourneyStop):
+        payload = {
+            "tickets": [
+                {
+                    "cargo": 1,
+                    "seat": 1,
+                    "journey": self.journey.id,
+                    "departure_stop": departure.id,
+                    "arrival_stop": arrival.id,
+                }
+            ]
+        }
+        return self.client.post(ORDER_URL, payload, format="json")
+
+    def test_seat_resold_on_next_segment(self) -> None:
+        first = self.book(self.lviv, self.kyiv)
+        second = self.book(self.kyiv, self.kharkiv)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.filter(cargo=1, seat=1).count(), 2)
+
+    def test_calendar_counts_seats_per_segment(self) -> None:
+        self.book(self.lviv, self.kyiv)
+        self.book(self.kyiv, self.kharkiv)
+
+        res = self.client.get(
+            calendar_url(self.journey.route_id),
+            {"from": "2024-10-10", "to": "2024-10-10"},
+        )
+
+        self.assertEqual(res.data[0]["seats_available"], 9)
+        self.assertEqual(res.data[0]["min_seats_available"], 9)
+
+    def test_overlapping_segment_rejected(self) -> None:
+        self.book(self.kyiv, self.kharkiv)
+        res = self.book(self.lviv, self.kharkiv)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_whole_journey_ticket_takes_every_segment(self) -> None:
+        Ticket.objects.create(
+            order=Order.objects.create(user=self.user),
+            journey=self.journey,
+            cargo=1,
+            seat=1,
+        )
+
+        res = self.book(self.kyiv, self.kharkiv)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stops_added_after_sale_keep_seat_sold(self) -> None:
+        journey = Journey.objects.create(
+            route=self.journey.route,
+            train=self.journey.train,
+            departure_time=at(20),
+            arrival_time=at(23),
+        )
+        Ticket.objects.create(
+            order=Order.objects.create(user=self.user),
+            journey=journey,
+            cargo=1,
+            seat=1,
+        )
+        stops = [
+            JourneyStop.objects.create(
+                journey=journey,
+                station=stop.station,
+                sequence=sequence,
+                arrival_time=at(20 + sequence),
+                departure_time=at(20 + sequence),
+            )
+            for sequence, stop in enumerate(self.journey.stops.all())
+        ]
+        self.journey = journey
+
+        res = self.book(stops[1], stops[2])
+        detail = self.client.get(
+            reverse("station:journey-detail", args=[journey.id])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(detail.data["tickets_available"], 9)
+
+    def test_stop_order_change_reversing_ticket_rejected(self) -> None:
+        self.book(self.lviv, self.kyiv)
+        self.book(self.kyiv, self.kharkiv)
+        self.kyiv.sequence = 3
+
+        with self.assertRaises(ValidationError):
+            self.kyiv.save()
+
+    def test_availability_per_segment(self) -> None:
+        self.book(self.lviv, self.kyiv)
+        url = availability_url(self.journey.id)
+
+        first_leg = self.client.get(
+            url, {"from": self.lviv.station_id, "to": self.kyiv.station_id}
+        )
+        second_leg = self.client.get(
+            url, {"from": self.kyiv.station_id, "to": self.kharkiv.station_id}
+        )
+        whole = self.client.get(
+            reverse("station:journey-detail", args=[self.journey.id])
+        )
+
+        self.assertEqual(first_leg.data["tickets_available"], 9)
+        self.assertEqual(second_leg.data["tickets_available"], 10)
+        self.assertEqual(whole.data["tickets_available"], 9)
+        self.assertEqual(len(whole.data["stops"]), 3)
+
+    def test_availability_rejects_reversed_stops(self) -> None:
+        res = self.client.get(
+            availability_url(self.journey.id),
+            {"from": self.kharkiv.station_id, "to": self.lviv.station_id},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deleting_ticket_releases_seat(self) -> None:
+        self.book(self.lviv, self.kharkiv)
+        Order.objects.all().delete()
+
+        res = self.book(self.lviv, self.kharkiv)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
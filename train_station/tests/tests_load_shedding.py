@@ -0,0 +1,126 @@
+import os
+import runpy
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from train_station_core.load_shedding import (
+    ConcurrencyLimiter,
+    LoadSheddingMiddleware,
+)
+from train_station_core.metrics import metrics
+
+CLASSES = {
+    "booking": {
+        "path": r"^/api/stations/orders/",
+        "limit": 1,
+        "min_limit": 1,
+        "max_limit": 2,
+        "target_latency": 1.0,
+    },
+    "reference": {
+        "path": r"^/api/stations/",
+        "limit": 1,
+        "min_limit": 1,
+        "max_limit": 2,
+        "target_latency": 1.0,
+    },
+}
+
+
+class LoadSheddingSettingsTests(TestCase):
+    def test_caps_leave_threads_to_other_classes(self) -> None:
+        path = os.path.join(
+            settings.BASE_DIR, "train_station_core", "settings.py"
+        )
+        for threads in (2, 4, 16):
+            with mock.patch.dict(os.environ, GUNICORN_THREADS=str(threads)):
+                classes = runpy.run_path(path)["LOAD_SHEDDING_CLASSES"]
+
+            for config in classes.values():
+                self.assertLess(config["max_limit"], threads)
+                self.assertLessEqual(config["limit"], config["max_limit"])
+
+
+class ConcurrencyLimiterTests(TestCase):
+    def test_waits_for_free_slot(self) -> None:
+        limiter = ConcurrencyLimiter("test", 1, 1, 1, 1.0)
+
+        self.assertTrue(limiter.acquire(0))
+        self.assertFalse(limiter.acquire(0.01))
+
+        threading.Timer(0.05, limiter.release, args=(0.1,)).start()
+
+        self.assertTrue(limiter.acquire(1))
+
+    def test_limit_adapts_to_latency(self) -> None:
+        limiter = ConcurrencyLimiter("test", 10, 2, 20, 1.0)
+        for _ in range(20):
+            limiter.acquire(0)
+            limiter.release(5.0)
+
+        self.assertEqual(limiter.limit, 2)
+
+        for _ in range(20):
+            limiter.acquire(0)
+            limiter.release(0.1)
+
+        self.assertGreater(limiter.limit, 6)
+        self.assertLessEqual(limiter.limit, 20)
+
+
+@override_settings(
+    LOAD_SHEDDING_ENABLED=True,
+    LOAD_SHEDDING_CLASSES=CLASSES,
+    LOAD_SHEDDING_QUEUE_TIMEOUT=0.01,
+)
+class LoadSheddingMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        metrics.reset()
+
+    def get_response(self, request) -> HttpResponse:
+        if request.path.endswith("/slow/"):
+            self.entered.set()
+            self.release.wait(5)
+        return HttpResponse("ok")
+
+    def test_saturated_class_sheds_only_its_requests(self) -> None:
+        middleware = LoadSheddingMiddleware(self.get_response)
+        slow = threading.Thread(
+            target=middleware,
+            args=(self.factory.get("/api/stations/orders/slow/"),),
+        )
+        slow.start()
+        self.entered.wait(5)
+
+        try:
+            shed = middleware(self.factory.get("/api/stations/orders/"))
+            other = middleware(self.factory.get("/api/stations/stations/"))
+            unlimited = middleware(self.factory.get("/admin/"))
+        finally:
+            self.release.set()
+            slow.join()
+
+        self.assertEqual(shed.status_code, 503)
+        self.assertEqual(shed["Retry-After"], "1")
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(unlimited.status_code, 200)
+        self.assertEqual(
+            metrics.snapshot()["counters"],
+            {"load_shedding.booking.rejected": 1},
+        )
+
+    @override_settings(LOAD_SHEDDING_ENABLED=False)
+    def test_disabled(self) -> None:
+        middleware = LoadSheddingMiddleware(self.get_response)
+        middleware.get_limiter("/api/stations/").acquire(0)
+
+        res = middleware(self.factory.get("/api/stations/stations/"))
+
+        self.assertEqual(res.status_code, 200)
@@ -0,0 +1,111 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.test import APIClient
+
+from train_station_core.metrics import metrics
+from user.hashing import HashingPool, HashingUnavailable, pool
+
+TOKEN_URL = reverse("users:token_obtain_pair")
+REGISTER_URL = reverse("users:create")
+METRICS_URL = reverse("metrics")
+
+
+class HashingPoolTests(TestCase):
+    @override_settings(
+        PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE_SIZE=1
+    )
+    def test_rejects_jobs_beyond_queue(self) -> None:
+        hashing_pool = HashingPool()
+        release = threading.Event()
+        running = [
+            threading.Thread(target=hashing_pool.run, args=(release.wait,))
+            for _ in range(2)
+        ]
+        for thread in running:
+            thread.start()
+
+        try:
+            with self.assertRaises(HashingUnavailable):
+                while True:
+                    hashing_pool.run(lambda: None)
+        finally:
+            release.set()
+            for thread in running:
+                thread.join()
+
+        self.assertEqual(hashing_pool.run(lambda: "done"), "done")
+
+    def test_saturated_pool_error_is_not_an_api_error(self) -> None:
+        pool.start()
+        with (
+            mock.patch.object(pool, "slots", threading.Semaphore(0)),
+            self.assertRaises(HashingUnavailable) as raised,
+        ):
+            make_password("password")
+
+        self.assertNotIsInstance(raised.exception, APIException)
+        self.assertEqual(raised.exception.retry_after, 1)
+
+
+class PasswordHashingApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="password"
+        )
+        metrics.reset()
+
+    def test_login_hashes_on_pool(self) -> None:
+        res = self.client.post(
+            TOKEN_URL, {"email": self.user.email, "password": "password"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        timers = metrics.snapshot()["timers"]
+        self.assertEqual(timers["password_hashing.duration"]["count"], 1)
+        self.assertIn("password_hashing.wait", timers)
+
+    def test_saturated_pool_fails_fast(self) -> None:
+        pool.start()
+        with mock.patch.object(pool, "slots", threading.Semaphore(0)):
+            login = self.client.post(
+                TOKEN_URL, {"email": self.user.email, "password": "password"}
+            )
+            register = self.client.post(
+                REGISTER_URL, {"email": "new@test.com", "password": "secret"}
+            )
+
+        for res in (login, register):
+            self.assertEqual(
+                res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            self.assertEqual(res["Retry-After"], "1")
+        self.assertEqual(
+            metrics.snapshot()["counters"]["password_hashing.rejected"], 2
+        )
+
+
+class MetricsApiTests(TestCase):
+    def test_metrics_staff_only(self) -> None:
+        client = APIClient()
+        user = get_user_model().objects.create_user(
+            email="user@test.com", password="password"
+        )
+        client.force_authenticate(user)
+
+        self.assertEqual(
+            client.get(METRICS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        user.is_staff = True
+        res = client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("timers", res.data)
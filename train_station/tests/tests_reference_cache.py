@@ -0,0 +1,88 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from train_station import reference, response_cache
+from train_station.models import Journey, Route, Station, Train, TrainType
+
+JOURNEY_URL = reverse("station:journey-list")
+
+
+class ReferenceCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.lviv = Station.objects.create(name="Lviv")
+        self.kyiv = Station.objects.create(name="Kyiv")
+        self.route = Route.objects.create(
+            source=self.lviv, destination=self.kyiv, distance=540
+        )
+        self.train = Train.objects.create(
+            name="Test Train",
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=TrainType.objects.create(name="Intercity"),
+        )
+
+    def test_records_resolve_related_names(self) -> None:
+        route = reference.routes.get(self.route.id)
+        train = reference.trains.get(self.train.id)
+
+        self.assertEqual(str(route), "Lviv -> Kyiv")
+        self.assertEqual(train.train_type.name, "Intercity")
+        self.assertFalse(hasattr(route, "__dict__"))
+
+    def test_save_invalidates_cache(self) -> None:
+        reference.stations.get(self.lviv.id)
+
+        self.lviv.name = "Lemberg"
+        self.lviv.save()
+
+        self.assertEqual(reference.stations.get(self.lviv.id).name, "Lemberg")
+
+    def test_shared_version_change_reloads(self) -> None:
+        reference.stations.get(self.lviv.id)
+        Station.objects.filter(pk=self.lviv.id).update(name="Lemberg")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                reference.stations.get(self.lviv.id).name, "Lviv"
+            )
+
+        cache.incr(reference.stations.version_key)
+        reference.stations.checked_at = 0.0
+
+        self.assertEqual(reference.stations.get(self.lviv.id).name, "Lemberg")
+
+    def test_missing_record_reloads_once(self) -> None:
+        reference.stations.get(self.lviv.id)
+        Station.objects.bulk_create([Station(name="Odesa")])
+        odesa = Station.objects.get(name="Odesa")
+
+        self.assertEqual(reference.stations.get(odesa.id).name, "Odesa")
+        self.assertIsNone(reference.stations.get(0))
+
+    def test_journey_list_resolves_names_without_joins(self) -> None:
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="password"
+            )
+        )
+        Journey.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=make_aware(datetime.datetime(2024, 10, 10, 8)),
+            arrival_time=make_aware(datetime.datetime(2024, 10, 10, 14)),
+        )
+        client.get(JOURNEY_URL)
+        response_cache.bump("train_station.journey")
+
+        with self.assertNumQueries(4):
+            res = client.get(JOURNEY_URL)
+
+        self.assertEqual(res.data["results"][0]["route"], "Lviv -> Kyiv")
+        self.assertEqual(res.data["results"][0]["train"], "Intercity")
@@ -0,0 +1,207 @@
+import datetime
+import time
+import unittest
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from train_station.models import (
+    Journey,
+    Order,
+    Route,
+    Station,
+    ThrottleCounter,
+    Train,
+    TrainType,
+)
+from train_station.timeouts import statement_timeout
+from train_station.views import JourneyViewSet
+from train_station_core.replicas import (
+    PIN_COOKIE,
+    PrimaryReplicaRouter,
+    ReadYourWritesMiddleware,
+    read_database,
+)
+
+JOURNEY_URL = reverse("station:journey-list")
+ORDER_URL = reverse("station:order-list")
+STATION_URL = reverse("station:station-list")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class RouterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = PrimaryReplicaRouter()
+        token = read_database.set("replica")
+        self.addCleanup(read_database.reset, token)
+
+    def test_request_reads_go_to_replica(self) -> None:
+        self.assertEqual(self.router.db_for_read(Station), "replica")
+        self.assertEqual(self.router.db_for_write(Station), DEFAULT_DB_ALIAS)
+
+    def test_reads_outside_request_on_primary(self) -> None:
+        read_database.set(None)
+
+        self.assertEqual(self.router.db_for_read(Station), DEFAULT_DB_ALIAS)
+
+    def test_statement_timeout_keeps_reads_on_replica(self) -> None:
+        with statement_timeout(100):
+            self.assertEqual(self.router.db_for_read(Station), "replica")
+
+    def test_shared_counters_read_from_primary(self) -> None:
+        self.assertEqual(
+            self.router.db_for_read(ThrottleCounter), DEFAULT_DB_ALIAS
+        )
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_on_primary(self) -> None:
+        self.assertEqual(self.router.db_for_read(Station), DEFAULT_DB_ALIAS)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], READ_YOUR_WRITES_WINDOW=5)
+class ReadYourWritesMiddlewareTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.middleware = ReadYourWritesMiddleware(self.get_response)
+        self.read_from = None
+        self.user = AnonymousUser()
+
+    def get_response(self, request) -> HttpResponse:
+        self.read_from = PrimaryReplicaRouter().db_for_read(Station)
+        request.user = self.user
+        return HttpResponse()
+
+    @staticmethod
+    def bearer_request(method: str, user_id: int):
+        token = AccessToken()
+        token["user_id"] = str(user_id)
+        return getattr(RequestFactory(), method)(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+    def test_write_pins_client_to_primary(self) -> None:
+        response = self.middleware(self.factory.post("/"))
+
+        self.assertEqual(self.read_from, DEFAULT_DB_ALIAS)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 5)
+
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        response = self.middleware(request)
+
+        self.assertEqual(self.read_from, DEFAULT_DB_ALIAS)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_expired_pin_reads_from_replica(self) -> None:
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE] = str(time.time() - 1)
+
+        self.middleware(request)
+
+        self.assertEqual(self.read_from, "replica")
+        self.assertIsNone(read_database.get())
+
+    def test_write_pins_bearer_client_without_cookies(self) -> None:
+        self.user = get_user_model()(pk=7)
+        self.middleware(self.bearer_request("post", 7))
+
+        self.middleware(self.bearer_request("get", 7))
+        self.assertEqual(self.read_from, DEFAULT_DB_ALIAS)
+
+        self.middleware(self.bearer_request("get", 8))
+        self.assertEqual(self.read_from, "replica")
+
+    def test_forged_bearer_token_is_not_pinned(self) -> None:
+        self.user = get_user_model()(pk=7)
+        self.middleware(self.bearer_request("post", 7))
+
+        request = self.bearer_request("get", 7)
+        request.META["HTTP_AUTHORIZATION"] += "x"
+        self.middleware(request)
+
+        self.assertEqual(self.read_from, "replica")
+
+
+@unittest.skipUnless(
+    settings.DATABASE_REPLICAS, "needs a replica in DATABASE_REPLICAS"
+)
+class ReadYourWritesApiTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(name="Lviv"),
+                destination=Station.objects.create(name="Kyiv"),
+                distance=540,
+            ),
+            train=Train.objects.create(
+                name="Test Train",
+                cargo_num=10,
+                places_in_cargo=20,
+                train_type=TrainType.objects.create(name="Test Type"),
+            ),
+            departure_time=make_aware(datetime.datetime(2024, 10, 10, 10)),
+            arrival_time=make_aware(datetime.datetime(2024, 10, 10, 16)),
+        )
+
+    def replica_queries(self, method: str, *args, **kwargs) -> tuple:
+        replica = connections[settings.DATABASE_REPLICAS[0]]
+        with CaptureQueriesContext(replica) as queries:
+            response = getattr(self.client, method)(*args, **kwargs)
+        return response, len(queries)
+
+    def test_created_order_read_from_primary(self) -> None:
+        payload = {
+            "tickets": [{"cargo": 1, "seat": 1, "journey": self.journey.id}]
+        }
+        res, replica_queries = self.replica_queries(
+            "post", ORDER_URL, payload, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replica_queries, 0)
+        self.assertIn(PIN_COOKIE, self.client.cookies)
+
+        res, replica_queries = self.replica_queries("get", ORDER_URL)
+
+        self.assertEqual(
+            [order["id"] for order in res.data["results"]],
+            list(Order.objects.values_list("id", flat=True)),
+        )
+        self.assertEqual(replica_queries, 0)
+
+    def test_reads_without_pin_go_to_replica(self) -> None:
+        res, replica_queries = self.replica_queries("get", STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreater(replica_queries, 0)
+
+    def test_timed_journey_list_reads_from_replica(self) -> None:
+        self.assertIn("list", JourneyViewSet.statement_timeouts)
+
+        res, replica_queries = self.replica_queries("get", JOURNEY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+        self.assertGreater(replica_queries, 0)
@@ -0,0 +1,163 @@
+import datetime
+import time
+from contextlib import AbstractContextManager
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Crew,
+    Journey,
+    JourneySearch,
+    Route,
+    Station,
+    ThrottleCounter,
+    Train,
+    TrainType,
+)
+from train_station.response_cache import CacheLock, CachePolicy, version_key
+from train_station.views import JourneyViewSet
+
+JOURNEY_URL = reverse("station:journey-list")
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="password"
+            )
+        )
+        self.route = Route.objects.create(
+            source=Station.objects.create(name="Lviv"),
+            destination=Station.objects.create(name="Kyiv"),
+            distance=540,
+        )
+        self.train_type = TrainType.objects.create(name="Test Type")
+        self.create_journey(10)
+
+    def create_journey(self, day: int) -> Journey:
+        return Journey.objects.create(
+            route=self.route,
+            train=Train.objects.create(
+                name=f"Train {day}",
+                cargo_num=10,
+                places_in_cargo=20,
+                train_type=self.train_type,
+            ),
+            departure_time=make_aware(datetime.datetime(2024, 10, day, 8)),
+            arrival_time=make_aware(datetime.datetime(2024, 10, day, 14)),
+        )
+
+    @staticmethod
+    def later(seconds: float = 20) -> AbstractContextManager:
+        return mock.patch(
+            "train_station.response_cache.time.time",
+            return_value=time.time() + seconds,
+        )
+
+    @staticmethod
+    def locked() -> AbstractContextManager:
+        return mock.patch.object(CacheLock, "acquire", return_value=False)
+
+    def test_fresh_response_is_served_from_cache(self) -> None:
+        self.client.get(JOURNEY_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertEqual(res.data["count"], 1)
+
+    def test_query_params_are_part_of_the_key(self) -> None:
+        self.client.get(JOURNEY_URL)
+
+        res = self.client.get(JOURNEY_URL, {"source": "Kyiv"})
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["count"], 0)
+
+    def test_links_of_other_hosts_are_not_served(self) -> None:
+        for day in range(11, 16):
+            self.create_journey(day)
+        self.client.get(JOURNEY_URL)
+
+        res = self.client.get(JOURNEY_URL, HTTP_HOST="localhost", secure=True)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertTrue(res.data["next"].startswith("https://localhost/"))
+
+    def test_write_outdates_cached_response(self) -> None:
+        self.client.get(JOURNEY_URL)
+        self.create_journey(11)
+
+        res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["count"], 2)
+
+    def test_crew_added_from_crew_side_outdates_journeys(self) -> None:
+        journey = Journey.objects.get()
+        crew = Crew.objects.create(first_name="Ivan", last_name="Franko")
+
+        with mock.patch(
+            "train_station.signals.bump_response_version"
+        ) as bump:
+            crew.journeys.add(journey)
+
+        bump.assert_called_once_with(Journey)
+
+    def test_unrelated_writes_keep_versions(self) -> None:
+        ThrottleCounter.objects.create(
+            key="throttle:user:1", window=1, expires_at=timezone.now()
+        )
+        JourneySearch.objects.create(signature="", params={})
+
+        for label in ("throttlecounter", "journeysearch"):
+            self.assertIsNone(cache.get(version_key(f"train_station.{label}")))
+
+    def test_stale_response_served_while_locked(self) -> None:
+        self.client.get(JOURNEY_URL)
+
+        with self.later(), self.locked(), self.assertNumQueries(0):
+            res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res["X-Cache"], "STALE")
+
+    def test_outdated_response_served_while_locked(self) -> None:
+        self.client.get(JOURNEY_URL)
+        self.create_journey(11)
+
+        with self.locked(), self.assertNumQueries(0):
+            res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res["X-Cache"], "STALE")
+        self.assertEqual(res.data["count"], 1)
+
+    def test_stale_response_recomputed_by_lock_holder(self) -> None:
+        self.client.get(JOURNEY_URL)
+
+        with self.later():
+            res = self.client.get(JOURNEY_URL)
+            self.assertEqual(res["X-Cache"], "MISS")
+
+            res = self.client.get(JOURNEY_URL)
+            self.assertEqual(res["X-Cache"], "HIT")
+
+    def test_miss_waits_for_lock_then_computes(self) -> None:
+        policies = {"list": CachePolicy(fresh=10, lock_timeout=0.2)}
+        with mock.patch.object(JourneyViewSet, "cache_policies", policies):
+            self.create_journey(11)
+            with self.locked():
+                res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["count"], 2)
@@ -0,0 +1,147 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+
+def calendar_url(route_id: int) -> str:
+    return reverse("station:route-calendar", args=[route_id])
+
+
+def at(day: int, hour: int) -> datetime.datetime:
+    return make_aware(datetime.datetime(2024, 10, day, hour, 0))
+
+
+class RouteCalendarApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.client.force_authenticate(self.user)
+        self.route = Route.objects.create(
+            source=Station.objects.create(name="Lviv"),
+            destination=Station.objects.create(name="Kyiv"),
+            distance=540,
+        )
+        train_type = TrainType.objects.create(name="Test Type")
+        self.journeys = []
+        for name, day, hour, cargo_num in (
+                ("Train 1", 10, 8, 2),
+                ("Train 2", 10, 6, 3),
+                ("Train 3", 12, 9, 1),
+        ):
+            train = Train.objects.create(
+                name=name,
+                cargo_num=cargo_num,
+                places_in_cargo=10,
+                train_type=train_type,
+            )
+            self.journeys.append(
+                Journey.objects.create(
+                    route=self.route,
+                    train=train,
+                    departure_time=at(day, hour),
+                    arrival_time=at(day, hour + 6),
+                )
+            )
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2, 3):
+            Ticket.objects.create(
+                journey=self.journeys[0], order=order, cargo=1, seat=seat
+            )
+
+    def test_calendar_aggregates_per_day(self) -> None:
+        res = self.client.get(
+            calendar_url(self.route.id),
+            {"from": "2024-10-10", "to": "2024-10-12"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [dict(day) for day in res.data],
+            [
+                {
+                    "date": "2024-10-10",
+                    "journeys": 2,
+                    "earliest_departure": "2024-10-10 06:00:00",
+                    "seats_available": 17 + 30,
+                    "min_seats_available": 17,
+                },
+                {
+                    "date": "2024-10-11",
+                    "journeys": 0,
+                    "earliest_departure": None,
+                    "seats_available": 0,
+                    "min_seats_available": None,
+                },
+                {
+                    "date": "2024-10-12",
+                    "journeys": 1,
+                    "earliest_departure": "2024-10-12 09:00:00",
+                    "seats_available": 10,
+                    "min_seats_available": 10,
+                },
+            ],
+        )
+
+    def test_calendar_month_is_cached(self) -> None:
+        params = {"from": "2024-10-01", "to": "2024-10-31"}
+        self.client.get(calendar_url(self.route.id), params)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                calendar_url(self.route.id),
+                {"from": "2024-10-10", "to": "2024-10-12"},
+            )
+
+        self.assertEqual(res.data[0]["journeys"], 2)
+
+    def test_booking_outdates_cached_month(self) -> None:
+        params = {"from": "2024-10-12", "to": "2024-10-12"}
+        self.client.get(calendar_url(self.route.id), params)
+
+        Ticket.objects.create(
+            journey=self.journeys[2],
+            order=Order.objects.create(user=self.user),
+            cargo=1,
+            seat=1,
+        )
+        res = self.client.get(calendar_url(self.route.id), params)
+
+        self.assertEqual(res.data[0]["seats_available"], 9)
+
+    def test_calendar_spanning_months_computed_at_once(self) -> None:
+        # the route, then the journeys of all months and their stops
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                calendar_url(self.route.id),
+                {"from": "2024-09-20", "to": "2024-11-05"},
+            )
+
+        self.assertEqual(len(res.data), 47)
+
+    def test_calendar_invalid_range(self) -> None:
+        for params in (
+                {"from": "2024-10-12", "to": "2024-10-10"},
+                {"from": "2024-01-01", "to": "2024-12-31"},
+                {},
+        ):
+            res = self.client.get(calendar_url(self.route.id), params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import runpy
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import SystemCheckError
+from django.test import SimpleTestCase, override_settings
+from django.urls import clear_url_caches, get_resolver
+
+CONFIG_PATH = os.path.join(settings.BASE_DIR, "gunicorn.conf.py")
+
+
+def load_config(**env) -> dict:
+    with mock.patch.dict(os.environ, env):
+        return runpy.run_path(CONFIG_PATH)
+
+
+class ServerConfigTests(SimpleTestCase):
+    def test_workers_sized_to_cpus(self) -> None:
+        with mock.patch.object(multiprocessing, "cpu_count", return_value=4):
+            config = load_config()
+
+        self.assertEqual(config["workers"], 9)
+        self.assertTrue(config["preload_app"])
+
+    def test_environment_overrides(self) -> None:
+        config = load_config(
+            GUNICORN_WORKERS="3",
+            GUNICORN_MAX_REQUESTS="50",
+            GUNICORN_GRACEFUL_TIMEOUT="5",
+        )
+
+        self.assertEqual(config["workers"], 3)
+        self.assertEqual(config["max_requests"], 50)
+        self.assertEqual(config["graceful_timeout"], 5)
+
+    def test_urlconf_preloaded_before_fork(self) -> None:
+        clear_url_caches()
+        server = SimpleNamespace(log=mock.Mock())
+
+        with (
+            mock.patch("django.core.management.call_command"),
+            mock.patch("train_station.invalidation.start_listener") as start,
+        ):
+            load_config()["when_ready"](server)
+
+        self.assertIn("url_patterns", get_resolver().__dict__)
+        start.assert_not_called()
+        server.log.info.assert_called_once()
+
+    def test_listener_started_in_workers(self) -> None:
+        with (
+            mock.patch("train_station.invalidation.start_listener") as start,
+            mock.patch("train_station.warming.start") as warm,
+        ):
+            load_config()["post_worker_init"](mock.Mock())
+
+        start.assert_called_once()
+        warm.assert_not_called()
+
+    @override_settings(CACHE_WARMING_INTERVAL=60)
+    def test_warming_started_in_workers(self) -> None:
+        with (
+            mock.patch("train_station.invalidation.start_listener"),
+            mock.patch("train_station.warming.start") as warm,
+        ):
+            load_config()["post_worker_init"](mock.Mock())
+
+        warm.assert_called_once()
+
+    def test_refuses_to_start_with_process_local_cache(self) -> None:
+        server = SimpleNamespace(log=mock.Mock())
+
+        with self.assertRaises(SystemCheckError):
+            load_config()["when_ready"](server)
+
+        server.log.info.assert_not_called()
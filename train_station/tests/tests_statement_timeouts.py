@@ -0,0 +1,102 @@
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.timeouts import is_statement_timeout, statement_timeout
+from train_station.views import TicketViewSet
+from train_station_core.metrics import metrics
+
+TICKET_URL = reverse("station:ticket-list")
+
+
+class QueryCanceled(Exception):
+    sqlstate = "57014"
+
+
+def timeout_error() -> OperationalError:
+    error = OperationalError("canceling statement due to statement timeout")
+    error.__cause__ = QueryCanceled()
+    return error
+
+
+class StatementTimeoutTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@test.com", password="password"
+            )
+        )
+        metrics.reset()
+
+    def test_detects_query_canceled(self) -> None:
+        self.assertTrue(is_statement_timeout(timeout_error()))
+        self.assertFalse(is_statement_timeout(OperationalError("locked")))
+
+    @skipUnless(connection.vendor != "postgresql", "no-op elsewhere only")
+    def test_noop_outside_postgres(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            with statement_timeout(100):
+                pass
+
+        self.assertEqual(len(queries), 0)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+    def test_slow_statement_cancelled(self) -> None:
+        with self.assertRaises(OperationalError) as context:
+            with statement_timeout(50), transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_sleep(1)")
+
+        self.assertTrue(is_statement_timeout(context.exception))
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], "0")
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+    def test_set_per_connection_and_restored(self) -> None:
+        with statement_timeout(50):
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW statement_timeout")
+                self.assertEqual(cursor.fetchone()[0], "50ms")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], "0")
+
+    def test_batch_reported_as_list(self) -> None:
+        with mock.patch.object(
+            TicketViewSet, "get_queryset", side_effect=timeout_error()
+        ):
+            res = self.client.get(TICKET_URL, {"ids": "1,2"})
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            metrics.snapshot()["counters"],
+            {"statement_timeout.TicketViewSet.list": 1},
+        )
+
+    def test_timeout_returns_503(self) -> None:
+        with mock.patch.object(
+            TicketViewSet, "list", side_effect=timeout_error()
+        ):
+            res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            metrics.snapshot()["counters"],
+            {"statement_timeout.TicketViewSet.list": 1},
+        )
+
+    def test_other_database_errors_propagate(self) -> None:
+        with mock.patch.object(
+            TicketViewSet, "list", side_effect=OperationalError("locked")
+        ):
+            with self.assertRaises(OperationalError):
+                self.client.get(TICKET_URL)
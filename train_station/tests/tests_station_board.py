@@ -0,0 +1,113 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Route, Station, Train, TrainType
+
+
+def departures_url(station_id: int) -> str:
+    return reverse("station:station-departures", args=[station_id])
+
+
+def arrivals_url(station_id: int) -> str:
+    return reverse("station:station-arrivals", args=[station_id])
+
+
+class StationBoardApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.client.force_authenticate(self.user)
+        self.lviv = Station.objects.create(name="Lviv")
+        self.kyiv = Station.objects.create(name="Kyiv")
+        self.route = Route.objects.create(
+            source=self.lviv, destination=self.kyiv, distance=540
+        )
+        self.train_type = TrainType.objects.create(name="Test Type")
+        now = timezone.now()
+        self.journeys = [
+            self.create_journey(now + datetime.timedelta(hours=hours))
+            for hours in (-3, 5, 1, 9)
+        ]
+
+    def create_journey(self, departure: datetime.datetime) -> Journey:
+        train = Train.objects.create(
+            name=f"Train {departure:%H%M%S%f}",
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=self.train_type,
+        )
+        return Journey.objects.create(
+            route=self.route,
+            train=train,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=2),
+        )
+
+    def test_journey_copies_route_stations(self) -> None:
+        journey = self.journeys[0]
+
+        self.assertEqual(journey.source_station, self.lviv)
+        self.assertEqual(journey.destination_station, self.kyiv)
+
+    def test_route_change_updates_journey_stations(self) -> None:
+        odesa = Station.objects.create(name="Odesa")
+        self.route.destination = odesa
+        self.route.save()
+
+        self.assertEqual(
+            set(
+                Journey.objects.values_list(
+                    "destination_station", flat=True
+                )
+            ),
+            {odesa.id},
+        )
+
+    def test_departures_lists_upcoming_journeys_in_order(self) -> None:
+        res = self.client.get(departures_url(self.lviv.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [journey["id"] for journey in res.data],
+            [self.journeys[2].id, self.journeys[1].id, self.journeys[3].id],
+        )
+        self.assertEqual(res.data[0]["destination"], "Kyiv")
+
+    def test_departures_limit(self) -> None:
+        res = self.client.get(departures_url(self.lviv.id), {"limit": 1})
+
+        self.assertEqual(len(res.data), 1)
+
+        res = self.client.get(departures_url(self.lviv.id), {"limit": 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_arrivals_only_for_destination(self) -> None:
+        res = self.client.get(arrivals_url(self.kyiv.id))
+        self.assertEqual(len(res.data), 3)
+
+        res = self.client.get(arrivals_url(self.lviv.id))
+        self.assertEqual(res.data, [])
+
+    def test_board_is_cached(self) -> None:
+        self.client.get(departures_url(self.lviv.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(departures_url(self.lviv.id))
+
+        self.assertEqual(len(res.data), 3)
+
+    def test_unknown_station(self) -> None:
+        res = self.client.get(departures_url(999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
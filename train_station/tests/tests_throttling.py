@@ -0,0 +1,165 @@
+import subprocess
+import sys
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from train_station.models import ThrottleCounter
+from train_station.throttling import (
+    ActionSlidingWindowThrottle,
+    AnonSlidingWindowThrottle,
+    DatabaseThrottleStore,
+    SlidingWindowRateThrottle,
+)
+from train_station.views import OrderViewSet, StationViewSet
+
+RATES = {
+    "anon": "2/minute",
+    "user": "3/minute",
+    "reference": "5/minute",
+    "booking": "1/minute",
+}
+
+
+@mock.patch.object(SlidingWindowRateThrottle, "THROTTLE_RATES", RATES)
+@override_settings(
+    THROTTLE_STORE="train_station.throttling.DatabaseThrottleStore"
+)
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="password"
+        )
+        self.now = 6000.0
+
+    def allow(self, viewset, action: str, user=None) -> bool:
+        request = self.factory.get("/")
+        force_authenticate(request, user or self.user)
+        throttle = ActionSlidingWindowThrottle()
+        throttle.timer = lambda: self.now
+        self.throttle = throttle
+        return throttle.allow_request(
+            Request(request), viewset(action=action)
+        )
+
+    def test_previous_window_weighted_by_overlap(self) -> None:
+        results = [self.allow(OrderViewSet, "list") for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(self.throttle.wait(), 60)
+
+        self.now += 90
+        results = [self.allow(OrderViewSet, "list") for _ in range(3)]
+
+        self.assertEqual(results, [True, False, False])
+        self.assertAlmostEqual(self.throttle.wait(), 10)
+
+    def test_rejected_requests_not_counted(self) -> None:
+        for _ in range(10):
+            self.allow(OrderViewSet, "list")
+
+        self.assertEqual(ThrottleCounter.objects.get().hits, 3)
+
+    def test_budgets_per_action(self) -> None:
+        reads = [self.allow(StationViewSet, "list") for _ in range(6)]
+        bookings = [self.allow(OrderViewSet, "create") for _ in range(2)]
+
+        self.assertEqual(reads.count(True), 5)
+        self.assertEqual(bookings, [True, False])
+        self.assertTrue(self.allow(OrderViewSet, "list"))
+
+    def test_keeps_two_windows_per_key(self) -> None:
+        for _ in range(5):
+            self.allow(OrderViewSet, "list")
+            self.now += 60
+
+        self.assertEqual(
+            sorted(ThrottleCounter.objects.values_list("window", flat=True)),
+            [103, 104],
+        )
+
+    def test_anon_throttle_skips_authenticated(self) -> None:
+        request = self.factory.get("/")
+        view = StationViewSet(action="list")
+        throttle = AnonSlidingWindowThrottle()
+        anon = [
+            throttle.allow_request(Request(request), view) for _ in range(3)
+        ]
+        force_authenticate(request, self.user)
+
+        self.assertEqual(anon, [True, True, False])
+        self.assertTrue(throttle.allow_request(Request(request), view))
+
+    @override_settings(
+        THROTTLE_STORE="train_station.throttling.CacheThrottleStore"
+    )
+    def test_cache_store(self) -> None:
+        cache.clear()
+        results = [self.allow(OrderViewSet, "list") for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertFalse(ThrottleCounter.objects.exists())
+
+    def test_throttled_response(self) -> None:
+        view = StationViewSet.as_view(
+            {"get": "list"}, throttle_classes=[ActionSlidingWindowThrottle]
+        )
+        request = self.factory.get("/")
+        force_authenticate(request, self.user)
+
+        responses = [view(request) for _ in range(6)]
+
+        self.assertEqual(
+            responses[-1].status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", responses[-1])
+
+
+class DatabaseThrottleStoreTests(TestCase):
+    def test_increment_returns_both_windows(self) -> None:
+        store = DatabaseThrottleStore()
+        store.increment("key", 1, 60)
+        store.increment("key", 2, 60)
+        store.increment("key", 2, 60)
+
+        self.assertEqual(store.increment("key", 2, 60), (1, 3))
+        store.decrement("key", 2)
+        self.assertEqual(store.increment("key", 3, 60), (2, 1))
+
+    def test_flush_expired_counters(self) -> None:
+        store = DatabaseThrottleStore()
+        store.increment("gone", 1, 60)
+        window = int(time.time() // 60)
+        store.increment("seen", window, 60)
+
+        call_command("flush_throttle_counters", stdout=StringIO())
+
+        self.assertEqual(
+            list(ThrottleCounter.objects.values_list("key", flat=True)),
+            ["seen"],
+        )
+
+
+class ThrottleImportTests(SimpleTestCase):
+    def test_loaded_by_rest_framework_views(self) -> None:
+        # DRF imports DEFAULT_THROTTLE_CLASSES while defining APIView
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import django; django.setup(); import rest_framework.views",
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
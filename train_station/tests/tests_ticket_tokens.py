@@ -0,0 +1,176 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from train_station.checks import check_shared_caches, check_ticket_token_secret
+from train_station.ticket_tokens import (
+    TicketClaims,
+    TokenError,
+    sign,
+    verify_token,
+)
+
+VERIFY_URL = reverse("station:ticket-verify")
+
+
+def sample_ticket(user, **params) -> Ticket:
+    now = timezone.now()
+    journey = Journey.objects.create(
+        route=Route.objects.create(
+            source=Station.objects.create(name="Lviv"),
+            destination=Station.objects.create(name="Kyiv"),
+            distance=540,
+        ),
+        train=Train.objects.create(
+            name="Test Train",
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=TrainType.objects.create(name="Test Type"),
+        ),
+        departure_time=now + datetime.timedelta(minutes=30),
+        arrival_time=now + datetime.timedelta(hours=6),
+    )
+    defaults = {"cargo": 2, "seat": 7, "journey": journey}
+    defaults.update(params)
+    return Ticket.objects.create(
+        order=Order.objects.create(user=user), **defaults
+    )
+
+
+def token_url(ticket_id: int) -> str:
+    return reverse("station:ticket-token", args=[ticket_id])
+
+
+@override_settings(TICKET_TOKEN_SECRET="ticket-secret")
+class TicketTokenTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpassword"
+        )
+        self.ticket = sample_ticket(self.user)
+
+    def test_token_round_trip(self) -> None:
+        claims = verify_token(self.ticket.token)
+
+        self.assertEqual(claims.ticket, self.ticket.id)
+        self.assertEqual(claims.journey, self.ticket.journey_id)
+        self.assertEqual((claims.cargo, claims.seat), (2, 7))
+
+    def test_tampered_token_rejected(self) -> None:
+        payload, signature = self.ticket.token.split(".")
+        tampered = f"{payload[:-2]}AA.{signature}"
+
+        with self.assertRaisesMessage(TokenError, "Invalid signature"):
+            verify_token(tampered)
+
+    def test_expired_and_wrong_journey_rejected(self) -> None:
+        token = self.ticket.token
+        arrival = self.ticket.journey.arrival_time.timestamp()
+
+        with self.assertRaisesMessage(TokenError, "expired"):
+            verify_token(token, now=arrival + 1)
+        with self.assertRaisesMessage(TokenError, "another journey"):
+            verify_token(token, journey=self.ticket.journey_id + 1)
+
+
+@override_settings(TICKET_TOKEN_SECRET="ticket-secret")
+class TicketTokenApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpassword"
+        )
+        self.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpassword", is_staff=True
+        )
+        self.ticket = sample_ticket(self.user)
+
+    def test_owner_gets_token(self) -> None:
+        self.client.force_authenticate(self.user)
+        res = self.client.get(token_url(self.ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["token"], self.ticket.token)
+
+    def test_other_user_cannot_get_token(self) -> None:
+        other = get_user_model().objects.create_user(
+            email="other@test.com", password="testpassword"
+        )
+        self.client.force_authenticate(other)
+        res = self.client.get(token_url(self.ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_verify_requires_admin(self) -> None:
+        self.client.force_authenticate(self.user)
+        res = self.client.post(
+            VERIFY_URL, {"tokens": [self.ticket.token]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_verify_batch_without_queries(self) -> None:
+        self.client.force_authenticate(self.admin)
+        payload = {"tokens": [self.ticket.token, "broken"], "consume": True}
+
+        with self.assertNumQueries(0):
+            res = self.client.post(VERIFY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        valid, broken = res.data["results"]
+        self.assertTrue(valid["valid"])
+        self.assertEqual(valid["ticket"], self.ticket.id)
+        self.assertFalse(broken["valid"])
+
+    def test_verify_rejects_replayed_token(self) -> None:
+        self.client.force_authenticate(self.admin)
+        payload = {"tokens": [self.ticket.token], "consume": True}
+
+        self.client.post(VERIFY_URL, payload, format="json")
+        res = self.client.post(VERIFY_URL, payload, format="json")
+
+        self.assertFalse(res.data["results"][0]["valid"])
+        self.assertEqual(
+            res.data["results"][0]["error"], "Ticket has already been used"
+        )
+
+
+class TicketTokenSettingsTests(SimpleTestCase):
+    @override_settings(TICKET_TOKEN_SECRET=None)
+    def test_secret_required(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            sign(TicketClaims(1, 1, 1, 1, 0, 60))
+
+        self.assertEqual(
+            [error.id for error in check_ticket_token_secret(None)],
+            ["train_station.E003"],
+        )
+
+    def test_replay_cache_must_be_shared(self) -> None:
+        redis = {"BACKEND": "django.core.cache.backends.redis.RedisCache"}
+        local = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+        with override_settings(CACHES={"default": redis, "tickets": local}):
+            self.assertEqual(check_shared_caches(None), [])
+            with override_settings(TICKET_TOKEN_REPLAY_CACHE="tickets"):
+                self.assertEqual(
+                    [error.id for error in check_shared_caches(None)],
+                    ["train_station.E002"],
+                )
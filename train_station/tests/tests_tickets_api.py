@@ -23,7 +23,7 @@ TICKETS_URL = reverse("station:ticket-list")
 
 
 def sample_station(name: str) -> Station:
-    return Station.objects.create(name=name)
+    return Station.objects.get_or_create(name=name)[0]
 
 def sample_route(source: str = "Lviv", destination: str = "Kyiv") -> Route:
     return Route.objects.get_or_create(
@@ -0,0 +1,171 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import (
+    Crew,
+    Journey,
+    Route,
+    Station,
+    TimetablePattern,
+    Train,
+    TrainType,
+)
+from train_station.timetable import expand_pattern
+
+TIMETABLE_URL = reverse("station:timetablepattern-list")
+
+
+def sample_pattern(**params) -> TimetablePattern:
+    defaults = {
+        "route": Route.objects.create(
+            source=Station.objects.create(name="Lviv"),
+            destination=Station.objects.create(name="Kyiv"),
+            distance=540,
+        ),
+        "train": Train.objects.create(
+            name="Test Train",
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=TrainType.objects.create(name="Test Type"),
+        ),
+        "departure_time": datetime.time(22, 30),
+        "arrival_time": datetime.time(6, 15),
+        "arrival_day_offset": 1,
+        "days_of_week": TimetablePattern.MONDAY | TimetablePattern.FRIDAY,
+        "valid_from": datetime.date(2024, 10, 1),
+        "valid_until": datetime.date(2024, 10, 31),
+    }
+    defaults.update(params)
+    return TimetablePattern.objects.create(**defaults)
+
+
+def expand_url(pattern_id: int) -> str:
+    return reverse("station:timetablepattern-expand", args=[pattern_id])
+
+
+class TimetableExpansionTests(TestCase):
+    def setUp(self) -> None:
+        self.pattern = sample_pattern()
+        self.crew = Crew.objects.create(first_name="Test", last_name="Crew")
+        self.pattern.crew.add(self.crew)
+
+    def test_expand_follows_days_of_week(self) -> None:
+        start, end = datetime.date(2024, 10, 1), datetime.date(2024, 10, 14)
+        expansion = expand_pattern(self.pattern, start, end)
+        journeys = Journey.objects.filter(pattern=self.pattern)
+
+        self.assertEqual(expansion, (4, []))
+        self.assertEqual(
+            sorted(journey.departure_time.weekday() for journey in journeys),
+            [0, 0, 4, 4],
+        )
+        for journey in journeys:
+            self.assertEqual(
+                journey.arrival_time - journey.departure_time,
+                datetime.timedelta(hours=7, minutes=45),
+            )
+            self.assertEqual(list(journey.crew.all()), [self.crew])
+
+    def test_expand_is_idempotent(self) -> None:
+        start, end = datetime.date(2024, 10, 1), datetime.date(2024, 10, 31)
+        expand_pattern(self.pattern, start, datetime.date(2024, 10, 10))
+
+        expansion = expand_pattern(self.pattern, start, end)
+
+        self.assertEqual(expansion.created, 6)
+        self.assertEqual(Journey.objects.count(), 8)
+        self.assertEqual(Journey.crew.through.objects.count(), 8)
+
+    def test_expand_respects_validity_range(self) -> None:
+        expansion = expand_pattern(
+            self.pattern, datetime.date(2024, 9, 1), datetime.date(2024, 12, 1)
+        )
+
+        self.assertEqual(expansion.created, 8)
+
+    def test_expand_skips_and_reports_double_bookings(self) -> None:
+        tz = timezone.get_current_timezone()
+        train_busy = datetime.datetime(2024, 10, 4, 23, 0, tzinfo=tz)
+        crew_busy = datetime.datetime(2024, 10, 8, 1, 0, tzinfo=tz)
+        Journey.objects.create(
+            route=self.pattern.route,
+            train=self.pattern.train,
+            departure_time=train_busy,
+            arrival_time=train_busy + datetime.timedelta(hours=2),
+        )
+        other_train = Train.objects.create(
+            name="Other Train",
+            cargo_num=10,
+            places_in_cargo=20,
+            train_type=self.pattern.train.train_type,
+        )
+        Journey.objects.create(
+            route=self.pattern.route,
+            train=other_train,
+            departure_time=crew_busy,
+            arrival_time=crew_busy + datetime.timedelta(hours=2),
+        ).crew.add(self.crew)
+
+        start, end = datetime.date(2024, 10, 1), datetime.date(2024, 10, 14)
+        expansion = expand_pattern(self.pattern, start, end)
+
+        self.assertEqual(expansion.created, 2)
+        self.assertEqual(
+            sorted(
+                (conflict["resource"], conflict["departure_time"].day)
+                for conflict in expansion.skipped
+            ),
+            [("crew", 7), ("train", 4)],
+        )
+        self.assertEqual(
+            Journey.objects.filter(pattern=self.pattern).count(), 2
+        )
+
+
+class TimetableApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def test_create_pattern_validates_times(self) -> None:
+        pattern = sample_pattern()
+        payload = {
+            "route": pattern.route_id,
+            "train": pattern.train_id,
+            "departure_time": "10:00",
+            "arrival_time": "09:00",
+            "valid_from": "2024-10-01",
+            "valid_until": "2024-10-31",
+        }
+
+        res = self.client.post(TIMETABLE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expand_pattern(self) -> None:
+        pattern = sample_pattern()
+        payload = {"start": "2024-10-01", "end": "2024-10-31"}
+
+        res = self.client.post(expand_url(pattern.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"created": 8, "skipped": []})
+
+    def test_regular_user_forbidden(self) -> None:
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="password"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(TIMETABLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
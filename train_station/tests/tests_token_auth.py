@@ -0,0 +1,241 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.models import RevokedToken
+from user.revocation import BloomFilter, revoked
+
+TOKEN_URL = reverse("users:token_obtain_pair")
+REFRESH_URL = reverse("users:token_refresh")
+ME_URL = reverse("users:manage_user")
+LOGOUT_URL = reverse("users:logout")
+LOGOUT_ALL_URL = reverse("users:logout_all")
+STATION_URL = reverse("station:station-list")
+
+
+class StatelessTokenAuthTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="password"
+        )
+
+    def authenticate(self, password: str = "password") -> dict:
+        res = self.client.post(
+            TOKEN_URL, {"email": self.user.email, "password": password}
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {res.data['access']}"
+        )
+        return res.data
+
+    def user_queries(self, url: str) -> list[str]:
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        table = get_user_model()._meta.db_table
+        return [
+            query["sql"] for query in queries if table in query["sql"]
+        ]
+
+    def test_token_carries_user_claims(self) -> None:
+        token = AccessToken(self.authenticate()["access"])
+
+        self.assertEqual(token["email"], self.user.email)
+        self.assertFalse(token["is_staff"])
+        self.assertIn("ver", token)
+
+    def test_refreshed_token_keeps_claims(self) -> None:
+        refresh = self.authenticate()["refresh"]
+        res = self.client.post(REFRESH_URL, {"refresh": refresh})
+
+        self.assertEqual(
+            AccessToken(res.data["access"])["email"], self.user.email
+        )
+
+    def test_reads_make_no_user_queries(self) -> None:
+        self.authenticate()
+        self.user_queries(STATION_URL)
+
+        self.assertEqual(self.user_queries(STATION_URL), [])
+
+    def test_user_built_from_claims(self) -> None:
+        self.authenticate()
+
+        res = self.client.post(STATION_URL, {"name": "Lviv"})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_staff_claim_grants_write_access(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        self.authenticate()
+
+        res = self.client.post(
+            STATION_URL, {"name": "Lviv", "latitude": 49.8, "longitude": 24}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_me_returns_stored_user(self) -> None:
+        self.authenticate()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["email"], self.user.email)
+        self.assertFalse(res.data["is_staff"])
+
+    def test_token_rejected_after_password_change(self) -> None:
+        self.authenticate()
+        self.user.set_password("changed")
+        self.user.save()
+
+        res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rejected_after_staff_change(self) -> None:
+        self.authenticate()
+        self.client.get(STATION_URL)
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rejected_for_deleted_user(self) -> None:
+        self.authenticate()
+        self.user.delete()
+
+        res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_without_claims_loads_user(self) -> None:
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        self.assertEqual(len(self.user_queries(STATION_URL)), 1)
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives(self) -> None:
+        bloom = BloomFilter(1000, 0.01)
+        keys = [f"jti-{index}" for index in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate_near_target(self) -> None:
+        bloom = BloomFilter(1000, 0.01)
+        for index in range(1000):
+            bloom.add(f"jti-{index}")
+
+        false_positives = sum(
+            f"other-{index}" in bloom for index in range(10000)
+        )
+
+        self.assertLess(false_positives, 300)
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        revoked.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="password"
+        )
+        self.tokens = self.client.post(
+            TOKEN_URL, {"email": self.user.email, "password": "password"}
+        ).data
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}"
+        )
+
+    def refresh(self) -> int:
+        return self.client.post(
+            REFRESH_URL, {"refresh": self.tokens["refresh"]}
+        ).status_code
+
+    def test_logout_revokes_access_and_refresh_tokens(self) -> None:
+        res = self.client.post(
+            LOGOUT_URL, {"refresh": self.tokens["refresh"]}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+        self.assertEqual(
+            self.client.get(STATION_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(self.refresh(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_rejects_foreign_refresh_token(self) -> None:
+        other = get_user_model().objects.create_user(
+            email="other@test.com", password="password"
+        )
+        tokens = self.client.post(
+            TOKEN_URL, {"email": other.email, "password": "password"}
+        ).data
+
+        res = self.client.post(LOGOUT_URL, {"refresh": tokens["refresh"]})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout_all_revokes_every_session(self) -> None:
+        res = self.client.post(LOGOUT_ALL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            self.client.get(STATION_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(self.refresh(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_from_other_process_picked_up(self) -> None:
+        self.client.get(STATION_URL)
+        token = AccessToken(self.tokens["access"])
+        RevokedToken.objects.create(
+            jti=token["jti"],
+            user=self.user,
+            expires_at=datetime.datetime.fromtimestamp(
+                token["exp"], tz=datetime.timezone.utc
+            ),
+        )
+        revoked.checked_at = 0.0
+
+        res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lookup_while_cleared(self) -> None:
+        revoked.sync()
+
+        # a lookup past its sync when another thread clears the list
+        with mock.patch.object(revoked, "sync", revoked.clear):
+            self.assertNotIn("unknown", revoked)
+
+    def test_unrevoked_token_skips_exact_check(self) -> None:
+        self.client.get(STATION_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(STATION_URL)
+
+        self.assertFalse(
+            any(
+                RevokedToken._meta.db_table in query["sql"]
+                for query in queries
+            )
+        )
@@ -0,0 +1,171 @@
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.throttling import SimpleRateThrottle
+
+from train_station.models import ThrottleCounter
+
+if TYPE_CHECKING:
+    # DRF loads the throttle classes while rest_framework.views is still
+    # being imported
+    from rest_framework.views import APIView
+
+
+class CacheThrottleStore:
+    """
+    Window counters in the default cache. Increments are atomic on Redis
+    and Memcached, which makes the budget shared by every worker.
+    """
+
+    def increment(self, key: str, window: int, duration: int) -> tuple:
+        current = f"{key}:{window}"
+        cache.add(current, 0, duration * 2)
+        hits = cache.incr(current)
+        return cache.get(f"{key}:{window - 1}", 0), hits
+
+    def decrement(self, key: str, window: int) -> None:
+        try:
+            cache.decr(f"{key}:{window}")
+        except ValueError:
+            pass
+
+
+class DatabaseThrottleStore:
+    """
+    Window counters in the ThrottleCounter table, incremented with a
+    single UPDATE so concurrent workers never lose a hit. A key keeps at
+    most its current and previous window rows, rows of keys no longer
+    seen are deleted by the flush_throttle_counters command once expired.
+    Costs a few queries per request, for deployments without a shared
+    cache only.
+    """
+
+    def increment(self, key: str, window: int, duration: int) -> tuple:
+        counters = ThrottleCounter.objects.filter(key=key)
+        if not counters.filter(window=window).update(hits=F("hits") + 1):
+            # Still read as the previous window during the next one
+            expires_at = datetime.fromtimestamp(
+                (window + 2) * duration, timezone.utc
+            )
+            try:
+                with transaction.atomic():
+                    ThrottleCounter.objects.create(
+                        key=key, window=window, hits=1, expires_at=expires_at
+                    )
+            except IntegrityError:
+                counters.filter(window=window).update(hits=F("hits") + 1)
+            else:
+                counters.filter(window__lt=window - 1).delete()
+
+        hits = dict(
+            counters.filter(window__gte=window - 1).values_list(
+                "window", "hits"
+            )
+        )
+        return hits.get(window - 1, 0), hits.get(window, 0)
+
+    def decrement(self, key: str, window: int) -> None:
+        ThrottleCounter.objects.filter(
+            key=key, window=window, hits__gt=0
+        ).update(hits=F("hits") - 1)
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter: the hits of the previous fixed window, weighted
+    by how much of it still overlaps the sliding window, plus the hits of
+    the current one. Two counters per key whatever the rate, kept in the
+    shared THROTTLE_STORE. Rejected requests are not counted.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    @cached_property
+    def store(self) -> CacheThrottleStore | DatabaseThrottleStore:
+        return import_string(settings.THROTTLE_STORE)()
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        self.window = int(window)
+        self.previous, self.current = self.store.increment(
+            self.key, self.window, self.duration
+        )
+        if self.estimate(self.current) <= self.num_requests:
+            return True
+
+        self.store.decrement(self.key, self.window)
+        self.current -= 1
+        return self.throttle_failure()
+
+    def estimate(self, current: int) -> float:
+        weight = 1 - self.elapsed / self.duration
+        return self.previous * weight + current
+
+    def wait(self) -> float:
+        # Time until one more hit fits under the rate, assuming no other
+        # hits arrive in between
+        room = self.num_requests - self.current - 1
+        if room >= 0 and self.previous:
+            weight = room / self.previous
+            return max(0.0, (1 - weight) * self.duration - self.elapsed)
+        return self.duration - self.elapsed
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle):
+    scope = "anon"
+
+    def get_cache_key(self, request: Request, view: "APIView") -> str | None:
+        if request.user and request.user.is_authenticated:
+            return None
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class ActionSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """
+    Budget chosen per view action through the view's `throttle_scopes`
+    mapping, or its `throttle_scope`, falling back to the "user" rate.
+    Every scope is counted separately.
+    """
+
+    scope = "user"
+
+    def __init__(self) -> None:
+        # The rate depends on the view, it is resolved in allow_request
+        pass
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        scopes = getattr(view, "throttle_scopes", {})
+        self.scope = scopes.get(
+            getattr(view, "action", None),
+            getattr(view, "throttle_scope", self.scope),
+        )
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request: Request, view: "APIView") -> str:
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
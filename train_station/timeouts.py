@@ -0,0 +1,120 @@
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import Callable, Iterator
+
+from django.db import DatabaseError, OperationalError, connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from train_station_core.metrics import metrics
+
+QUERY_CANCELED = "57014"
+
+
+class StatementTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "The request took too long to process, narrow it down with filters "
+        "or try again later."
+    )
+    default_code = "statement_timeout"
+
+
+def is_statement_timeout(error: OperationalError) -> bool:
+    cause = error.__cause__
+    return QUERY_CANCELED in (
+        getattr(cause, "sqlstate", None),
+        getattr(cause, "pgcode", None),
+    )
+
+
+@contextmanager
+def statement_timeout(milliseconds: int) -> Iterator[None]:
+    """
+    Cancel any statement running longer than the timeout in the block, on
+    every PostgreSQL connection the block queries. The timeout is set on a
+    connection right before its first statement and the previous value is
+    restored when the block ends. No transaction is opened for it, so the
+    block's reads are still routed to the replicas.
+    """
+    previous = {}
+
+    def apply(alias: str, execute, sql, params, many, context):
+        if alias not in previous:
+            # On a driver cursor, a wrapped one would run this wrapper again
+            with context["connection"].connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT current_setting('statement_timeout'), "
+                    "set_config('statement_timeout', %s, false)",
+                    [str(milliseconds)],
+                )
+                previous[alias] = cursor.fetchone()[0]
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            if connection.vendor == "postgresql":
+                wrapper = partial(apply, connection.alias)
+                stack.enter_context(connection.execute_wrapper(wrapper))
+        try:
+            yield
+        finally:
+            stack.close()
+            for alias, value in previous.items():
+                restore_statement_timeout(connections[alias], value)
+
+
+def restore_statement_timeout(connection, value: str) -> None:
+    # A failed transaction rolls the setting back with it
+    if connection.connection is None or connection.needs_rollback:
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %s, false)", [value]
+            )
+    except DatabaseError:
+        # Never hand the timeout over to the next user of the connection
+        connection.close()
+
+
+class StatementTimeoutMixin:
+    """
+    Runs the actions listed in `statement_timeouts` (milliseconds) under
+    a statement timeout. A cancelled statement becomes a 503 response and
+    is counted per view and action in the metrics.
+    """
+
+    statement_timeouts = {}
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        timeout = self.statement_timeouts.get(self.action)
+        method = request.method.lower()
+        if timeout is not None and hasattr(self, method):
+            setattr(
+                self,
+                method,
+                partial(self.timed_handler, getattr(self, method), timeout),
+            )
+
+    def timed_handler(
+            self,
+            handler: Callable,
+            timeout: int,
+            request: Request,
+            *args,
+            **kwargs,
+    ) -> Response:
+        try:
+            with statement_timeout(timeout):
+                return handler(request, *args, **kwargs)
+        except OperationalError as error:
+            if not is_statement_timeout(error):
+                raise
+            metrics.increment(
+                f"statement_timeout.{type(self).__name__}.{self.action}"
+            )
+            raise StatementTimeout()
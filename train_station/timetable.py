@@ -0,0 +1,189 @@
+import datetime
+from typing import Iterable, NamedTuple
+
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from train_station import response_cache
+from train_station.models import Journey, TimetablePattern
+from train_station.scheduling import pattern_conflicts
+
+BATCH_SIZE = 2000
+
+
+class Expansion(NamedTuple):
+    created: int
+    # Conflicts of the occurrences left out, as in pattern_conflicts
+    skipped: list[dict]
+
+
+def bulk_insert_ignore(
+        model: type[models.Model],
+        fields: list[str],
+        rows: list[tuple],
+) -> None:
+    """
+    INSERT ... ON CONFLICT DO NOTHING through executemany. Skips model
+    instantiation and per-field preparation of bulk_create, which dominate
+    the cost of inserting hundreds of thousands of rows.
+    """
+    if not rows:
+        return
+    connection = connections[DEFAULT_DB_ALIAS]
+    opts = model._meta
+    model_fields = [opts.get_field(name) for name in fields]
+    ops = connection.ops
+    suffix = ops.on_conflict_suffix_sql(
+        model_fields, OnConflict.IGNORE, None, None
+    )
+    sql = (
+        f"{ops.insert_statement(on_conflict=OnConflict.IGNORE)} "
+        f"{ops.quote_name(opts.db_table)} "
+        f"({', '.join(ops.quote_name(f.column) for f in model_fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(model_fields))}) "
+        f"{suffix}"
+    )
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), BATCH_SIZE):
+            cursor.executemany(
+                sql,
+                [
+                    [
+                        value if model_field.is_relation
+                        else model_field.get_db_prep_save(value, connection)
+                        for model_field, value in zip(model_fields, row)
+                    ]
+                    for row in rows[offset:offset + BATCH_SIZE]
+                ],
+            )
+
+
+def departures(
+        pattern: TimetablePattern,
+        start: datetime.date,
+        end: datetime.date,
+) -> Iterable[tuple[datetime.datetime, datetime.datetime]]:
+    """Local departure and arrival datetimes of the pattern in a date range"""
+    date = max(start, pattern.valid_from)
+    end = min(end, pattern.valid_until)
+    offset = datetime.timedelta(days=pattern.arrival_day_offset)
+    tz = timezone.get_current_timezone()
+    while date <= end:
+        if pattern.runs_on(date):
+            yield (
+                datetime.datetime.combine(
+                    date, pattern.departure_time, tzinfo=tz
+                ),
+                datetime.datetime.combine(
+                    date + offset, pattern.arrival_time, tzinfo=tz
+                ),
+            )
+        date += datetime.timedelta(days=1)
+
+
+def expand_pattern(
+        pattern: TimetablePattern,
+        start: datetime.date,
+        end: datetime.date,
+) -> Expansion:
+    """
+    Materialize the journeys of a pattern between two dates with bulk
+    inserts into Journey and the crew through-table. Journeys that already
+    exist for the pattern are skipped, so re-running is safe. Occurrences
+    that would double book the train or crew are left out and reported,
+    as are those the database refused, e.g. after a concurrent booking.
+    """
+    planned = dict(departures(pattern, start, end))
+    if not planned:
+        return Expansion(0, [])
+
+    window = (min(planned), max(planned))
+    pattern_journeys = Journey.objects.filter(
+        pattern=pattern, departure_time__range=window
+    )
+    existing = set(pattern_journeys.values_list("departure_time", flat=True))
+    new = {
+        departure_time: arrival_time
+        for departure_time, arrival_time in planned.items()
+        if departure_time not in existing
+    }
+    skipped = pattern_conflicts(pattern, new.items())
+    conflicting = {conflict["departure_time"] for conflict in skipped}
+
+    route = pattern.route
+    with transaction.atomic():
+        bulk_insert_ignore(
+            Journey,
+            [
+                "route",
+                "source_station",
+                "destination_station",
+                "train",
+                "pattern",
+                "departure_time",
+                "arrival_time",
+            ],
+            [
+                (
+                    route.id,
+                    route.source_id,
+                    route.destination_id,
+                    pattern.train_id,
+                    pattern.id,
+                    departure_time,
+                    arrival_time,
+                )
+                for departure_time, arrival_time in new.items()
+                if departure_time not in conflicting
+            ],
+        )
+        created = {
+            departure_time: journey_id
+            for journey_id, departure_time in pattern_journeys.values_list(
+                "id", "departure_time"
+            )
+            if departure_time in new
+        }
+
+        crew_ids = list(pattern.crew.values_list("id", flat=True))
+        bulk_insert_ignore(
+            Journey.crew.through,
+            ["journey", "crew"],
+            [
+                (journey_id, crew_id)
+                for journey_id in created.values()
+                for crew_id in crew_ids
+            ],
+        )
+
+    # Dropped by the exclusion constraint on the train
+    skipped.extend(
+        {
+            "resource": "train",
+            "id": pattern.train_id,
+            "departure_time": departure_time,
+            "journey": None,
+        }
+        for departure_time in new
+        if departure_time not in created
+        and departure_time not in conflicting
+    )
+    if created:
+        response_cache.bump(Journey._meta.label_lower)
+    return Expansion(len(created), skipped)
+
+
+def expand_patterns(
+        start: datetime.date,
+        end: datetime.date,
+        patterns: Iterable[TimetablePattern] = None,
+) -> dict[int, Expansion]:
+    if patterns is None:
+        patterns = TimetablePattern.objects.filter(
+            valid_from__lte=end, valid_until__gte=start
+        )
+    return {
+        pattern.id: expand_pattern(pattern, start, end)
+        for pattern in patterns
+    }
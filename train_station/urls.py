@@ -10,6 +10,8 @@ from train_station.views import (
     CrewViewSet,
     JourneyViewSet,
     TicketViewSet,
+    TimetablePatternViewSet,
+    BatchView,
 )
 
 
@@ -23,9 +25,11 @@ router.register("train-types", TrainTypeViewSet)
 router.register("crews", CrewViewSet)
 router.register("journeys", JourneyViewSet)
 router.register("tickets", TicketViewSet)
+router.register("timetables", TimetablePatternViewSet)
 
 
 urlpatterns = [
+    path("batch/", BatchView.as_view(), name="batch"),
     path("", include(router.urls)),
 ]
 
@@ -1,13 +1,23 @@
 from typing import Type
 
-from django.db.models import QuerySet, F, Count
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet, F, Count, Exists, OuterRef
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.views import APIView
 
+from train_station import inventory, reference, search_stats
+from train_station.availability import route_calendar
+from train_station.batch import run_batch
+from train_station.check_in import check_in_tickets
 from train_station.filters import (
     RouteFilter,
     OrderFilter,
@@ -23,9 +33,16 @@ from train_station.models import (
     Crew,
     Journey,
     Ticket,
+    TimetablePattern,
 )
 from train_station.ordering import OrderingHelper
+from train_station.response_cache import CachePolicy, ResponseCacheMixin
+from train_station.ticket_tokens import ReplayGuard, TokenError, verify_token
+from train_station.scheduling import journey_conflicts, pattern_conflicts
+from train_station.timeouts import StatementTimeoutMixin
+from train_station.timetable import departures, expand_pattern
 from train_station.schemas import (
+    batch,
     routes,
     orders,
     trains,
@@ -34,6 +51,7 @@ from train_station.schemas import (
     crews,
     train_types,
     stations,
+    timetables,
 )
 from train_station.serializers import (
     StationSerializer,
@@ -56,9 +74,28 @@ from train_station.serializers import (
     TicketDetailSerializer,
     CrewImageSerializer,
     TrainImageSerializer,
+    TicketTokenSerializer,
+    TicketVerifySerializer,
+    JourneyCheckInSerializer,
+    TimetablePatternSerializer,
+    DateRangeSerializer,
+    TimeRangeSerializer,
+    RosterJourneySerializer,
+    StationBoardQuerySerializer,
+    StationBoardSerializer,
+    CalendarRangeSerializer,
+    CalendarDaySerializer,
+    BatchIdsSerializer,
+    BatchSerializer,
 )
 
 
+READ_THROTTLE_SCOPES = {
+    "list": "reference",
+    "retrieve": "reference",
+}
+
+
 class UploadImageMixin:
     image_serializer_class = None
 
@@ -84,9 +121,35 @@ class UploadImageMixin:
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class BatchRetrieveMixin:
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if "ids" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        serializer = BatchIdsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        # serve the batch with the queryset and serializer of retrieve,
+        # the request is still timed, cached and reported as a list
+        self.action = "retrieve"
+        try:
+            objects = self.get_queryset().in_bulk(ids)
+            data = self.get_serializer(
+                [objects[pk] for pk in ids if pk in objects], many=True
+            ).data
+        finally:
+            self.action = "list"
+        return Response(data)
+
+
 @stations.station_schema
-class StationViewSet(viewsets.ModelViewSet):
+class StationViewSet(
+        StatementTimeoutMixin, BatchRetrieveMixin, viewsets.ModelViewSet
+):
     queryset = Station.objects.all()
+    throttle_scopes = READ_THROTTLE_SCOPES
+    statement_timeouts = {"departures": 2000, "arrivals": 2000}
     serializer_class = StationSerializer
 
     def get_queryset(self) -> QuerySet:
@@ -96,10 +159,43 @@ class StationViewSet(viewsets.ModelViewSet):
         )
         return queryset.order_by(*ordering_fields)
 
+    def get_board(self, station_field: str, time_field: str) -> Response:
+        serializer = StationBoardQuerySerializer(
+            data=self.request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        limit = serializer.validated_data["limit"]
+
+        key = f"station-board:{self.action}:{self.kwargs['pk']}:{limit}"
+        data = cache.get(key)
+        if data is None:
+            station = self.get_object()
+            journeys = (
+                Journey.objects.filter(
+                    **{
+                        station_field: station,
+                        f"{time_field}__gte": timezone.now(),
+                    }
+                )
+                .order_by(time_field)[:limit]
+            )
+            data = StationBoardSerializer(journeys, many=True).data
+            cache.set(key, data, settings.STATION_BOARD_CACHE_TTL)
+        return Response(data)
+
+    @action(methods=["GET"], detail=True)
+    def departures(self, request: Request, pk: int = None) -> Response:
+        return self.get_board("source_station", "departure_time")
+
+    @action(methods=["GET"], detail=True)
+    def arrivals(self, request: Request, pk: int = None) -> Response:
+        return self.get_board("destination_station", "arrival_time")
+
 
 @train_types.train_type_schema
 class TrainTypeViewSet(viewsets.ModelViewSet):
     queryset = TrainType.objects.all()
+    throttle_scopes = READ_THROTTLE_SCOPES
     serializer_class = TrainTypeSerializer
 
     def get_queryset(self) -> QuerySet:
@@ -113,11 +209,14 @@ class TrainTypeViewSet(viewsets.ModelViewSet):
 @crews.crew_schema
 class CrewViewSet(viewsets.ModelViewSet, UploadImageMixin):
     queryset = Crew.objects.all()
+    throttle_scopes = READ_THROTTLE_SCOPES
     image_serializer_class = CrewImageSerializer
 
     def get_serializer_class(self):
         if self.action == "upload_image":
             return TrainImageSerializer
+        elif self.action == "roster":
+            return RosterJourneySerializer
 
         return CrewSerializer
 
@@ -128,10 +227,48 @@ class CrewViewSet(viewsets.ModelViewSet, UploadImageMixin):
         )
         return queryset.order_by(*ordering_fields)
 
+    @staticmethod
+    def get_time_range(request: Request) -> dict:
+        serializer = TimeRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return {
+            "departure_time__lt": serializer.validated_data["to"],
+            "arrival_time__gt": serializer.validated_data["from"],
+        }
+
+    @action(methods=["GET"], detail=True)
+    def roster(self, request: Request, pk: int = None) -> Response:
+        crew = self.get_object()
+        journeys = (
+            crew.journeys.filter(**self.get_time_range(request))
+            .order_by("departure_time")
+        )
+
+        page = self.paginate_queryset(journeys)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def available(self, request: Request) -> Response:
+        assignments = Journey.crew.through.objects.filter(
+            crew_id=OuterRef("pk"),
+            **{
+                f"journey__{lookup}": value
+                for lookup, value in self.get_time_range(request).items()
+            },
+        )
+        crew = self.get_queryset().exclude(Exists(assignments))
+
+        page = self.paginate_queryset(crew)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
 @routes.route_schema
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(StatementTimeoutMixin, viewsets.ModelViewSet):
     queryset = Route.objects.select_related("source", "destination")
+    throttle_scopes = READ_THROTTLE_SCOPES
+    statement_timeouts = {"list": 2000, "calendar": 3000}
     filterset_class = RouteFilter
     ordering_fields = ["source", "destination", "distance"]
 
@@ -150,10 +287,25 @@ class RouteViewSet(viewsets.ModelViewSet):
 
         return RouteSerializer
 
+    @action(methods=["GET"], detail=True)
+    def calendar(self, request: Request, pk: int = None) -> Response:
+        route = self.get_object()
+        serializer = CalendarRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        days = route_calendar(
+            route.id,
+            serializer.validated_data["from"],
+            serializer.validated_data["to"],
+        )
+        return Response(CalendarDaySerializer(days, many=True).data)
+
 
 @orders.order_schema
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(StatementTimeoutMixin, viewsets.ModelViewSet):
     queryset = Order.objects.select_related("user")
+    throttle_scopes = {"create": "booking"}
+    statement_timeouts = {"list": 2000, "retrieve": 1000}
     filterset_class = OrderFilter
 
     def get_serializer_class(self) -> Type[Serializer]:
@@ -176,8 +328,11 @@ class OrderViewSet(viewsets.ModelViewSet):
 
 
 @trains.train_schema
-class TrainViewSet(viewsets.ModelViewSet, UploadImageMixin):
+class TrainViewSet(
+        BatchRetrieveMixin, viewsets.ModelViewSet, UploadImageMixin
+):
     queryset = Train.objects.select_related("train_type")
+    throttle_scopes = READ_THROTTLE_SCOPES
     filterset_class = TrainFilter
     image_serializer_class = TrainImageSerializer
     ordering_fields = ["name", "cargo_num", "places_in_cargo", "train_type"]
@@ -201,10 +356,27 @@ class TrainViewSet(viewsets.ModelViewSet, UploadImageMixin):
 
 
 @journeys.journey_schema
-class JourneyViewSet(viewsets.ModelViewSet):
+class JourneyViewSet(
+        ResponseCacheMixin,
+        StatementTimeoutMixin,
+        BatchRetrieveMixin,
+        viewsets.ModelViewSet,
+):
+    cache_policies = {"list": CachePolicy(fresh=10, stale=60)}
+    throttle_scopes = {"list": "search", "retrieve": "search"}
+    statement_timeouts = {"list": 3000, "retrieve": 1000, "conflicts": 5000}
+    cache_dependencies = (
+        "train_station.journey",
+        "train_station.journeystop",
+        "train_station.ticket",
+        "train_station.route",
+        "train_station.station",
+        "train_station.train",
+        "train_station.traintype",
+        "train_station.crew",
+    )
     queryset = (
-        Journey.objects.select_related("route", "train")
-        .prefetch_related("crew")
+        Journey.objects.prefetch_related("crew", "stops")
         .annotate(
             tickets_available=(
                 F("train__cargo_num") * F("train__places_in_cargo")
@@ -222,21 +394,174 @@ class JourneyViewSet(viewsets.ModelViewSet):
         )
         return queryset.order_by(*ordering_fields)
 
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        refresh = getattr(request._request, "cache_refresh", False)
+        if self.action == "list" and not refresh:
+            search_stats.recorder.record(request.query_params)
+
+    def get_cache_params(self, request: Request) -> list:
+        params = {
+            name: value
+            for name, value in request.query_params.lists()
+            if name not in search_stats.SEARCH_PARAMS
+        }
+        params.update(search_stats.normalize(request.query_params))
+        return sorted(params.items())
+
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "list":
             return JourneyListSerializer
         elif self.action == "retrieve":
             return JourneyDetailSerializer
+        elif self.action == "check_in":
+            return JourneyCheckInSerializer
+        elif self.action == "conflicts":
+            return DateRangeSerializer
 
         return JourneySerializer
 
+    @action(
+        methods=["POST"],
+        detail=True,
+        permission_classes=[IsAdminUser],
+        url_path="check-in",
+    )
+    def check_in(self, request: Request, pk: int = None) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not Journey.objects.filter(pk=pk).exists():
+            raise Http404
+
+        result = check_in_tickets(
+            int(pk), serializer.validated_data["tickets"]
+        )
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False, permission_classes=[IsAdminUser])
+    def conflicts(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        start = serializer.validated_data["start"]
+        end = serializer.validated_data["end"]
+
+        journeys = Journey.objects.filter(
+            departure_time__date__lte=end, arrival_time__date__gte=start
+        )
+        return Response(
+            {"conflicts": journey_conflicts(journeys)},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(methods=["GET"], detail=True)
+    def availability(self, request: Request, pk: int = None) -> Response:
+        journey = self.get_object()
+        stops = list(journey.stops.all())
+        if len(stops) < 2:
+            return Response(
+                {
+                    "journey": journey.id,
+                    "tickets_available": journey.tickets_available,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        stations = {stop.station_id: stop for stop in stops}
+        try:
+            departure = stations[
+                int(request.query_params.get("from", stops[0].station_id))
+            ]
+            arrival = stations[
+                int(request.query_params.get("to", stops[-1].station_id))
+            ]
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "`from` and `to` must be stations of the journey."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if departure.sequence >= arrival.sequence:
+            return Response(
+                {"detail": "`from` must precede `to`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        segments = inventory.segments_between(
+            stops, departure.sequence, arrival.sequence
+        )
+        return Response(
+            {
+                "journey": journey.id,
+                "from": departure.station_id,
+                "to": arrival.station_id,
+                "tickets_available": inventory.free_seats(
+                    reference.trains.get(journey.train_id), segments
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+@timetables.timetable_schema
+class TimetablePatternViewSet(viewsets.ModelViewSet):
+    queryset = TimetablePattern.objects.prefetch_related("crew")
+    permission_classes = [IsAdminUser]
+    ordering_fields = ["departure_time", "valid_from", "valid_until"]
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        ordering_fields = OrderingHelper.get_ordering_fields(
+            self.request, fields=self.ordering_fields
+        )
+        return queryset.order_by(*ordering_fields)
+
+    def get_serializer_class(self) -> Type[Serializer]:
+        if self.action in ("expand", "conflicts"):
+            return DateRangeSerializer
+
+        return TimetablePatternSerializer
+
+    @action(methods=["POST"], detail=True)
+    def expand(self, request: Request, pk: int = None) -> Response:
+        pattern = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        expansion = expand_pattern(
+            pattern,
+            serializer.validated_data["start"],
+            serializer.validated_data["end"],
+        )
+        return Response(
+            {"created": expansion.created, "skipped": expansion.skipped},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(methods=["GET"], detail=True)
+    def conflicts(self, request: Request, pk: int = None) -> Response:
+        pattern = self.get_object()
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        planned = departures(
+            pattern,
+            serializer.validated_data["start"],
+            serializer.validated_data["end"],
+        )
+        return Response(
+            {"conflicts": pattern_conflicts(pattern, planned)},
+            status=status.HTTP_200_OK,
+        )
+
 
 @tickets.ticket_schema
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(
+        StatementTimeoutMixin, BatchRetrieveMixin, viewsets.ModelViewSet
+):
     queryset = (
         Ticket.objects.select_related("journey", "order")
-        .prefetch_related("journey__crew")
+        .prefetch_related("journey__crew", "journey__stops")
     )
+    statement_timeouts = {"list": 3000, "retrieve": 1000}
     ordering_fields = ["cargo", "seat", "journey"]
 
     def get_queryset(self) -> QuerySet:
@@ -251,5 +576,58 @@ class TicketViewSet(viewsets.ModelViewSet):
             return TicketListSerializer
         elif self.action == "retrieve":
             return TicketDetailSerializer
+        elif self.action == "token":
+            return TicketTokenSerializer
+        elif self.action == "verify":
+            return TicketVerifySerializer
 
         return TicketSerializer
+
+    @action(methods=["GET"], detail=True)
+    def token(self, request: Request, pk: int = None) -> Response:
+        ticket = self.get_object()
+        user = request.user
+        if ticket.order.user_id != user.id and not user.is_staff:
+            raise PermissionDenied("Only the ticket owner can get its token.")
+
+        serializer = self.get_serializer(ticket)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=["POST"], detail=False, permission_classes=[IsAdminUser])
+    def verify(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        journey = serializer.validated_data.get("journey")
+        guard = ReplayGuard() if serializer.validated_data["consume"] else None
+
+        results = []
+        for token in serializer.validated_data["tokens"]:
+            try:
+                claims = verify_token(token, journey=journey)
+                if guard and not guard.consume(claims):
+                    raise TokenError("Ticket has already been used")
+            except TokenError as error:
+                results.append(
+                    {"token": token, "valid": False, "error": str(error)}
+                )
+            else:
+                results.append(
+                    {"token": token, "valid": True, **claims._asdict()}
+                )
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+@batch.batch_schema
+class BatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        prefix = request.path.rsplit("batch/", 1)[0]
+        responses = run_batch(
+            request, prefix, serializer.validated_data["requests"]
+        )
+        return Response({"responses": responses}, status=status.HTTP_200_OK)
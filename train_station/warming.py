@@ -0,0 +1,106 @@
+import io
+import logging
+import threading
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import QueryDict
+from django.urls import reverse
+
+from train_station.checks import is_shared_cache
+from train_station.response_cache import CacheLock
+from train_station.search_stats import recorder, top_searches
+
+logger = logging.getLogger(__name__)
+
+
+def build_request(path: str, params: dict) -> WSGIRequest:
+    """
+    GET request as sent to CACHE_WARMING_URL, the address clients use,
+    whose scheme and host are part of the cached responses
+    """
+    url = urlsplit(settings.CACHE_WARMING_URL)
+    query = QueryDict(mutable=True)
+    query.update(params)
+    request = WSGIRequest(
+        {
+            "REQUEST_METHOD": "GET",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": path,
+            "QUERY_STRING": query.urlencode(),
+            "HTTP_HOST": url.netloc,
+            "wsgi.url_scheme": url.scheme,
+            "wsgi.input": io.BytesIO(),
+        }
+    )
+    request.cache_refresh = True
+    return request
+
+
+def warm_journey_searches(top: int = None) -> int:
+    """
+    Recomputes the cached journey list responses of the most frequent
+    recent searches. Returns the number of searches warmed.
+    """
+    from train_station.views import JourneyViewSet
+
+    recorder.flush()
+    view = JourneyViewSet.as_view(
+        {"get": "list"},
+        authentication_classes=[],
+        permission_classes=[],
+        throttle_classes=[],
+    )
+    path = reverse("stations:journey-list")
+    searches = top_searches(top or settings.CACHE_WARMING_TOP)
+    for params in searches:
+        view(build_request(path, params))
+    return len(searches)
+
+
+class WarmingThread(threading.Thread):
+    """
+    Warms the top searches right away and then every
+    CACHE_WARMING_INTERVAL seconds. Workers sharing the cache take turns
+    through a cache lock so only one of them warms per interval, while
+    with a cache local to each process every worker warms its own.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="cache-warming", daemon=True)
+        self.stopped = threading.Event()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def run(self) -> None:
+        interval = settings.CACHE_WARMING_INTERVAL
+        while not self.stopped.is_set():
+            try:
+                recorder.flush()
+                if not is_shared_cache("default") or CacheLock(
+                    "cache-warming", interval
+                ).acquire():
+                    warm_journey_searches()
+            except Exception:
+                logger.exception("Cache warming failed")
+            finally:
+                connections.close_all()
+            self.stopped.wait(interval)
+
+
+_thread = None
+
+
+def start() -> None:
+    """
+    Run a warming thread in this process, once. Called by every server
+    worker after it is forked, as the thread uses database connections
+    that must not be shared with forked processes.
+    """
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        _thread = WarmingThread()
+        _thread.start()
@@ -0,0 +1,36 @@
+from django.db import connections
+
+from train_station_core.metrics import metrics
+
+
+def check_connection(connection) -> None:
+    """Discard a pooled connection the server dropped before handing it out"""
+    from psycopg_pool import ConnectionPool
+
+    ConnectionPool.check_connection(connection)
+
+
+def pools() -> dict:
+    """Connection pools of the configured databases, by alias"""
+    return {
+        alias: connections[alias].pool
+        for alias in connections
+        if getattr(connections[alias], "pool", None) is not None
+    }
+
+
+def record_pool_stats() -> None:
+    """Publish the usage of every connection pool as gauges"""
+    for alias, pool in pools().items():
+        for name, value in pool.get_stats().items():
+            metrics.gauge(f"db_pool.{alias}.{name}", value)
+
+
+def close_pools() -> None:
+    """
+    Close the pools of this process, along with their connections. A
+    process must not fork with open pools, as the children would share
+    their sockets.
+    """
+    for alias in pools():
+        connections[alias].close_pool()
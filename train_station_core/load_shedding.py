@@ -0,0 +1,113 @@
+import re
+import threading
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from train_station_core.metrics import metrics
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the requests of one endpoint class running at once in this
+    process. Requests over the cap wait up to LOAD_SHEDDING_QUEUE_TIMEOUT
+    for a slot. The cap adapts to latency: it shrinks by a tenth whenever
+    a request takes longer than the target and grows back by one slot per
+    cap-worth of fast requests.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            limit: int,
+            min_limit: int,
+            max_limit: int,
+            target_latency: float,
+    ) -> None:
+        self.name = name
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            if latency > self.target_latency:
+                self.limit = max(self.min_limit, self.limit * 0.9)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.condition.notify()
+
+        metrics.gauge(f"load_shedding.{self.name}.limit", int(self.limit))
+
+
+class LoadSheddingMiddleware:
+    """
+    Sorts requests into the endpoint classes of LOAD_SHEDDING_CLASSES by
+    path, the first matching pattern wins, and runs each class under its
+    own ConcurrencyLimiter. When no slot frees up in time the request is
+    rejected with 503 and Retry-After, so a saturated class cannot take
+    every thread of the worker. Paths matching no class are not limited.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.classes = [
+            (
+                re.compile(config["path"]),
+                ConcurrencyLimiter(
+                    name,
+                    config["limit"],
+                    config["min_limit"],
+                    config["max_limit"],
+                    config["target_latency"],
+                ),
+            )
+            for name, config in settings.LOAD_SHEDDING_CLASSES.items()
+        ]
+
+    def get_limiter(self, path: str) -> ConcurrencyLimiter | None:
+        for pattern, limiter in self.classes:
+            if pattern.match(path):
+                return limiter
+        return None
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        limiter = self.get_limiter(request.path_info)
+        if limiter is None or not settings.LOAD_SHEDDING_ENABLED:
+            return self.get_response(request)
+
+        queued = time.perf_counter()
+        if not limiter.acquire(settings.LOAD_SHEDDING_QUEUE_TIMEOUT):
+            metrics.increment(f"load_shedding.{limiter.name}.rejected")
+            response = JsonResponse(
+                {"detail": "Server is busy, try again shortly."},
+                status=503,
+            )
+            response["Retry-After"] = settings.LOAD_SHEDDING_RETRY_AFTER
+            return response
+
+        started = time.perf_counter()
+        metrics.observe(f"load_shedding.{limiter.name}.wait", started - queued)
+        try:
+            return self.get_response(request)
+        finally:
+            latency = time.perf_counter() - started
+            metrics.observe(f"load_shedding.{limiter.name}.latency", latency)
+            limiter.release(latency)
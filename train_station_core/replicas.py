@@ -0,0 +1,133 @@
+import random
+import time
+from contextvars import ContextVar
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.state import token_backend
+
+PIN_COOKIE = "primary_until"
+
+read_database = ContextVar("read_database", default=None)
+
+
+def pick_replica() -> str:
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def pin_key(user_id) -> str:
+    return f"{PIN_COOKIE}:{user_id}"
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes go to the primary. Reads of a request go where
+    ReadYourWritesMiddleware decided, usually one of DATABASE_REPLICAS,
+    but to the primary inside one of its transactions, so a transaction
+    never reads rows older than the ones it writes. Statement timeouts
+    open no transaction and leave the routing alone. Counters and markers
+    shared between workers, and reads outside of requests, such as those
+    of commands and background threads, stay on the primary.
+    """
+
+    primary_models = {
+        "train_station.cacheversion",
+        "train_station.throttlecounter",
+        "user.revokedtoken",
+    }
+
+    def db_for_read(self, model, **hints) -> str:
+        if (
+            not settings.DATABASE_REPLICAS
+            or model._meta.label_lower in self.primary_models
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return read_database.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
+
+
+class ReadYourWritesMiddleware:
+    """
+    Routes the reads of a request. Unsafe requests stay on the primary,
+    and so do the reads of a client for READ_YOUR_WRITES_WINDOW seconds
+    after it sent one, so that its own changes show up even while the
+    replicas lag. The client is marked by a cookie and, once
+    authenticated, in the shared cache by user id, for bearer token
+    clients that drop cookies. Other requests read from a single
+    replica, picked per request so that their queries see the same data.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    @staticmethod
+    def bearer_user_id(request: HttpRequest) -> str | None:
+        """
+        User id of a bearer token with a valid signature. Authentication
+        runs later in the view, this only checks the token, without the
+        database.
+        """
+        parts = request.META.get("HTTP_AUTHORIZATION", "").split()
+        if len(parts) != 2 or parts[0] not in jwt_settings.AUTH_HEADER_TYPES:
+            return None
+        try:
+            payload = token_backend.decode(parts[1])
+        except TokenBackendError:
+            return None
+        return payload.get(jwt_settings.USER_ID_CLAIM)
+
+    def is_pinned(self, request: HttpRequest) -> bool:
+        try:
+            if float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        user_id = self.bearer_user_id(request)
+        return (
+            user_id is not None
+            and cache.get(pin_key(user_id), 0) > time.time()
+        )
+
+    def get_read_database(self, request: HttpRequest) -> str | None:
+        if not settings.DATABASE_REPLICAS:
+            return None
+        if request.method not in SAFE_METHODS or self.is_pinned(request):
+            return DEFAULT_DB_ALIAS
+        return pick_replica()
+
+    @staticmethod
+    def pin(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            window = settings.READ_YOUR_WRITES_WINDOW
+            until = time.time() + window
+            response.set_cookie(
+                PIN_COOKIE,
+                str(until),
+                max_age=window,
+                httponly=True,
+                samesite="Lax",
+            )
+            # Set on the request by the view's authentication
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                cache.set(pin_key(user.pk), until, window)
+        return response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = read_database.set(self.get_read_database(request))
+        try:
+            return self.pin(request, self.get_response(request))
+        finally:
+            read_database.reset(token)
@@ -13,6 +13,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from train_station_core.db import check_connection
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -24,9 +26,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", os.urandom(128))
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DJANGO_DEBUG") == "1"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = os.getenv(
+    "DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1"
+).split(",")
 
 
 # Application definition
@@ -41,7 +45,6 @@ INSTALLED_APPS = [
 
     # 3rd apps
     "rest_framework",
-    "debug_toolbar",
     "django_filters",
     "drf_spectacular",
 
@@ -52,7 +55,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "train_station_core.load_shedding.LoadSheddingMiddleware",
+    "train_station_core.replicas.ReadYourWritesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -61,6 +65,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(3, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "train_station_core.urls"
 
 TEMPLATES = [
@@ -81,6 +89,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "train_station_core.wsgi.application"
 
+TEST_RUNNER = "train_station_core.test_runner.TestRunner"
+
+
+# Threads each server worker serves requests on, see gunicorn.conf.py
+WORKER_THREADS = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Threads a batch request runs its sub-requests on
+BATCH_MAX_WORKERS = 4
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -96,6 +113,84 @@ DATABASES = {
     }
 }
 
+# Every worker keeps a pool of connections, sized to what its threads can
+# hold at once: one per request thread, one per sub-request thread of the
+# batch each of them may run, and one each for the invalidation listener
+# and the cache warming thread. Without a pool connections are kept for
+# CONN_MAX_AGE instead.
+POSTGRES_POOL_MAX_SIZE = WORKER_THREADS * (1 + BATCH_MAX_WORKERS) + 2
+if os.getenv("POSTGRES_POOL_ENABLED", "1") == "1":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 1)),
+            "max_size": int(
+                os.getenv("POSTGRES_POOL_MAX_SIZE", POSTGRES_POOL_MAX_SIZE)
+            ),
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.getenv("POSTGRES_POOL_MAX_IDLE", 600)),
+        }
+    }
+    if os.getenv("POSTGRES_POOL_CHECK", "1") == "1":
+        DATABASES["default"]["OPTIONS"]["pool"]["check"] = check_connection
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(
+        os.getenv("POSTGRES_CONN_MAX_AGE", 60)
+    )
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Streaming replicas of the primary, as comma-separated host[:port], with
+# its database and credentials. Test runs use the test database of the
+# primary through them.
+DATABASE_REPLICAS = []
+for index, address in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    host, _, port = address.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["train_station_core.replicas.PrimaryReplicaRouter"]
+
+READ_YOUR_WRITES_WINDOW = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Throttle counters, response caches and their locks, reference cache
+# versions and used ticket tokens must be seen by every worker, so servers
+# run with Redis. The local memory cache is only good for one process.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    "user.hashing.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -160,16 +255,20 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     # THROTTLING
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "train_station.throttling.AnonSlidingWindowThrottle",
+        "train_station.throttling.ActionSlidingWindowThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "10/minute",
-        "user": "30/minute"
+        "user": "30/minute",
+        "reference": "120/minute",
+        "search": "60/minute",
+        "booking": "10/minute",
+        "auth": "10/minute",
     },
     # JWT
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ),
     # PERMISSION
     "DEFAULT_PERMISSION_CLASSES": [
@@ -191,4 +290,90 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "AUTH_TOKEN_CLASSES": ("user.tokens.UserAccessToken",),
+}
+
+TICKET_TOKEN_SECRET = os.getenv("TICKET_TOKEN_SECRET")
+TICKET_TOKEN_BOARDING_MINUTES = 120
+TICKET_TOKEN_REPLAY_CACHE = "default"
+
+STATION_BOARD_SIZE = 20
+STATION_BOARD_MAX_SIZE = 100
+STATION_BOARD_CACHE_TTL = 15
+
+ROUTE_CALENDAR_MAX_DAYS = 92
+ROUTE_CALENDAR_CACHE_TTL = 60
+
+BATCH_RETRIEVE_MAX_SIZE = 100
+
+BATCH_MAX_REQUESTS = 20
+
+REFERENCE_CACHE_CHECK_INTERVAL = 1.0
+
+INVALIDATION_CHANNEL = "train_station_invalidate"
+INVALIDATION_POLL_INTERVAL = 0.5
+
+SEARCH_STATS_FLUSH_SIZE = 100
+CACHE_WARMING_TOP = 50
+CACHE_WARMING_WINDOW_DAYS = 7
+CACHE_WARMING_INTERVAL = int(os.getenv("CACHE_WARMING_INTERVAL", 0))
+CACHE_WARMING_URL = os.getenv("CACHE_WARMING_URL", "http://localhost")
+
+USER_VERSION_CACHE_TTL = 30
+
+REVOCATION_CHECK_INTERVAL = 1.0
+REVOCATION_REFRESH_OVERLAP = 5
+REVOCATION_REBUILD_INTERVAL = 3600
+REVOCATION_BLOOM_CAPACITY = 10000
+REVOCATION_BLOOM_ERROR_RATE = 0.001
+
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_QUEUE_SIZE = int(os.getenv("PASSWORD_HASHING_QUEUE_SIZE", 8))
+PASSWORD_HASHING_RETRY_AFTER = 1
+
+THROTTLE_STORE = os.getenv(
+    "THROTTLE_STORE", "train_station.throttling.CacheThrottleStore"
+)
+
+LOAD_SHEDDING_ENABLED = os.getenv("LOAD_SHEDDING_ENABLED", "1") == "1"
+LOAD_SHEDDING_QUEUE_TIMEOUT = 0.5
+LOAD_SHEDDING_RETRY_AFTER = 1
+
+
+def worker_threads_share(fraction: float) -> int:
+    """Part of the worker threads, always leaving one to other classes"""
+    return max(1, min(WORKER_THREADS - 1, round(WORKER_THREADS * fraction)))
+
+
+# Caps per worker process, derived from its threads so that no class can
+# take all of them and stall the others
+LOAD_SHEDDING_CLASSES = {
+    "auth": {
+        "path": r"^/api/users/",
+        "limit": worker_threads_share(0.25),
+        "min_limit": 1,
+        "max_limit": worker_threads_share(0.5),
+        "target_latency": 2.0,
+    },
+    "booking": {
+        "path": r"^/api/stations/(orders|tickets)/",
+        "limit": worker_threads_share(0.5),
+        "min_limit": 1,
+        "max_limit": worker_threads_share(0.75),
+        "target_latency": 1.0,
+    },
+    "search": {
+        "path": r"^/api/stations/journeys/",
+        "limit": worker_threads_share(0.5),
+        "min_limit": 1,
+        "max_limit": worker_threads_share(0.75),
+        "target_latency": 0.5,
+    },
+    "reference": {
+        "path": r"^/api/stations/",
+        "limit": worker_threads_share(0.75),
+        "min_limit": 1,
+        "max_limit": worker_threads_share(0.75),
+        "target_latency": 0.25,
+    },
 }
@@ -0,0 +1,37 @@
+import shutil
+import tempfile
+
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+from django.test.utils import iter_test_cases, override_settings
+
+
+def clear_caches() -> None:
+    for cache in caches.all():
+        cache.clear()
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Empties the caches after every test, as its database changes are
+    rolled back, so that throttle counters and cached responses of one
+    test do not leak into the next. Uploads go to a temporary MEDIA_ROOT
+    removed after the run.
+    """
+
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        self.media_root = tempfile.mkdtemp(prefix="train-station-media-")
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+    def teardown_test_environment(self, **kwargs) -> None:
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        for test in iter_test_cases(suite):
+            test.addCleanup(clear_caches)
+        return suite
@@ -0,0 +1,25 @@
+import os
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from train_station_core.db import record_pool_stats
+from train_station_core.metrics import metrics
+
+
+class MetricsView(APIView):
+    """
+    Counters, gauges and latency timers of the worker serving the request,
+    including the usage of its database connection pools
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request: Request) -> Response:
+        record_pool_stats()
+        return Response({"pid": os.getpid(), **metrics.snapshot()})
@@ -0,0 +1,124 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+CLAIM_FIELDS = ("email", "is_staff", "is_superuser")
+VERSION_CLAIM = "ver"
+
+
+def user_version(
+        password: str,
+        is_active: bool,
+        is_staff: bool,
+        is_superuser: bool,
+        tokens_valid_after: datetime.datetime | None,
+) -> str:
+    """
+    Changes whenever the password, the permission flags change or all
+    sessions of the user are revoked
+    """
+    return salted_hmac(
+        "user.authentication.user_version",
+        f"{password}:{is_active}:{is_staff}:{is_superuser}:"
+        f"{tokens_valid_after}",
+        algorithm="sha256",
+    ).hexdigest()[:16]
+
+
+def version_cache_key(user_id: int) -> str:
+    return f"user-version:{user_id}"
+
+
+def get_user_version(user_id: int) -> str | None:
+    key = version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # From the primary, a lagging replica would get an outdated version
+        # cached right after a password change
+        row = (
+            get_user_model()
+            .objects.using(DEFAULT_DB_ALIAS)
+            .filter(pk=user_id)
+            .values_list(
+                "password",
+                "is_active",
+                "is_staff",
+                "is_superuser",
+                "tokens_valid_after",
+            )
+            .first()
+        )
+        version = user_version(*row) if row else ""
+        cache.set(key, version, settings.USER_VERSION_CACHE_TTL)
+    return version or None
+
+
+def add_user_claims(token: Token, user: AbstractUser) -> Token:
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[VERSION_CLAIM] = user_version(
+        user.password,
+        user.is_active,
+        user.is_staff,
+        user.is_superuser,
+        user.tokens_valid_after,
+    )
+    return token
+
+
+def issued_before_revocation(
+        token: Token, tokens_valid_after: datetime.datetime | None
+) -> bool:
+    return (
+        tokens_valid_after is not None
+        and token.get("iat", 0) < int(tokens_valid_after.timestamp())
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Builds the user from the claims of the access token instead of loading
+    it. Other fields stay deferred and are only fetched if accessed. The
+    token itself stops verifying once the user's password, activity or
+    staff flags change (see user.tokens). Tokens issued without the claims
+    fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token: Token) -> AbstractUser:
+        if VERSION_CLAIM not in validated_token:
+            user = super().get_user(validated_token)
+            if issued_before_revocation(
+                validated_token, user.tokens_valid_after
+            ):
+                raise AuthenticationFailed(
+                    _("Token has been revoked"), code="token_revoked"
+                )
+            return user
+
+        claims = {
+            api_settings.USER_ID_FIELD: validated_token[
+                api_settings.USER_ID_CLAIM
+            ],
+            "is_active": True,
+            **{field: validated_token[field] for field in CLAIM_FIELDS},
+        }
+        # from_db expects the values in the model's field order
+        model = get_user_model()
+        fields = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return model.from_db(
+            DEFAULT_DB_ALIAS, fields, [claims[field] for field in fields]
+        )
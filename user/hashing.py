@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+from train_station_core.metrics import metrics
+
+
+class HashingUnavailable(Exception):
+    """Every hashing thread is busy and the queue is full"""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            "Password hashing pool is saturated, "
+            f"retry in {retry_after} seconds"
+        )
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Runs password hashing on a few dedicated threads. hashlib releases the
+    GIL while hashing, so request threads keep serving other endpoints.
+    At most PASSWORD_HASHING_QUEUE_SIZE jobs wait for a free thread, any
+    further job is rejected straight away.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+
+    def start(self) -> None:
+        with self.lock:
+            if self.executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                self.slots = threading.BoundedSemaphore(
+                    workers + settings.PASSWORD_HASHING_QUEUE_SIZE
+                )
+                self.executor = ThreadPoolExecutor(
+                    workers, thread_name_prefix="password-hashing"
+                )
+
+    def reset(self) -> None:
+        # Threads do not survive a fork, children start their own pool
+        self.lock = threading.Lock()
+        self.executor = self.slots = None
+
+    def run(self, function: Callable, *args) -> Any:
+        if self.executor is None:
+            self.start()
+        if not self.slots.acquire(blocking=False):
+            metrics.increment("password_hashing.rejected")
+            raise HashingUnavailable(settings.PASSWORD_HASHING_RETRY_AFTER)
+
+        queued = time.perf_counter()
+
+        def job() -> Any:
+            started = time.perf_counter()
+            metrics.observe("password_hashing.wait", started - queued)
+            try:
+                return function(*args)
+            finally:
+                metrics.observe(
+                    "password_hashing.duration", time.perf_counter() - started
+                )
+                self.slots.release()
+
+        return self.executor.submit(job).result()
+
+
+pool = HashingPool()
+os.register_at_fork(after_in_child=pool.reset)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 hasher whose hashing, and so verification, runs on the pool"""
+
+    def encode(self, password: str, salt: str, iterations: int = None) -> str:
+        return pool.run(super().encode, password, salt, iterations)
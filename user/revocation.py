@@ -0,0 +1,132 @@
+import datetime
+import hashlib
+import math
+import threading
+import time
+from typing import Iterator
+
+from django.conf import settings
+from django.utils import timezone
+
+from user.models import RevokedToken
+
+
+class BloomFilter:
+    """Set of strings with false positives but no false negatives"""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * step) % self.size
+
+    def add(self, key: str) -> None:
+        if key in self:
+            return
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & 1 << (position & 7)
+            for position in self.positions(key)
+        )
+
+
+class RevocationList:
+    """
+    Per-process mirror of the RevokedToken table. Lookups go through a
+    bloom filter, so only possible positives reach the database. At most
+    every REVOCATION_CHECK_INTERVAL seconds the filter picks up rows created
+    since the last sync, and it is rebuilt without the expired ones every
+    REVOCATION_REBUILD_INTERVAL seconds or once it is over capacity.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.synced_at = None
+        self.checked_at = 0.0
+        self.built_at = 0.0
+
+    def rebuild(self) -> None:
+        now = timezone.now()
+        jtis = list(
+            RevokedToken.objects.filter(expires_at__gt=now).values_list(
+                "jti", flat=True
+            )
+        )
+        bloom = BloomFilter(
+            max(settings.REVOCATION_BLOOM_CAPACITY, 2 * len(jtis)),
+            settings.REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for jti in jtis:
+            bloom.add(jti)
+        self.bloom, self.synced_at = bloom, now
+        self.built_at = time.monotonic()
+
+    def refresh(self) -> None:
+        # Rows committed late by slow transactions or skewed clocks are
+        # still inside the overlap; adding a jti twice is harmless.
+        now = timezone.now()
+        since = self.synced_at - datetime.timedelta(
+            seconds=settings.REVOCATION_REFRESH_OVERLAP
+        )
+        for jti in RevokedToken.objects.filter(
+            created_at__gte=since
+        ).values_list("jti", flat=True):
+            self.bloom.add(jti)
+        self.synced_at = now
+
+    def sync(self) -> None:
+        now = time.monotonic()
+        if now - self.checked_at < settings.REVOCATION_CHECK_INTERVAL:
+            return
+        with self.lock:
+            if now - self.checked_at < settings.REVOCATION_CHECK_INTERVAL:
+                return
+            if (
+                self.bloom is None
+                or self.bloom.count > self.bloom.capacity
+                or now - self.built_at > settings.REVOCATION_REBUILD_INTERVAL
+            ):
+                self.rebuild()
+            else:
+                self.refresh()
+            self.checked_at = time.monotonic()
+
+    def revoke(
+            self, jti: str, user_id: int, expires_at: datetime.datetime
+    ) -> None:
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={"user_id": user_id, "expires_at": expires_at}
+        )
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def clear(self) -> None:
+        # Readers may hold on to the current filter, swap in a new one
+        with self.lock:
+            self.rebuild()
+            self.checked_at = time.monotonic()
+
+    def __contains__(self, jti: str) -> bool:
+        self.sync()
+        if jti not in self.bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+
+revoked = RevocationList()
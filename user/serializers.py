@@ -1,6 +1,16 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from user.authentication import add_user_claims
+from user.tokens import UserRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -27,3 +37,32 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserRefreshToken
+
+    @classmethod
+    def get_token(cls, user: AbstractUser) -> Token:
+        """Embed the claims the stateless authentication builds users from"""
+        return add_user_claims(super().get_token(user), user)
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserRefreshToken
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
+    def validate_refresh(self, value: str) -> UserRefreshToken:
+        try:
+            token = UserRefreshToken(value)
+        except TokenError as error:
+            raise serializers.ValidationError(str(error))
+        user_id = token[api_settings.USER_ID_CLAIM]
+        if user_id != self.context["request"].user.pk:
+            raise serializers.ValidationError(
+                "Token belongs to another user"
+            )
+        return token
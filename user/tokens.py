@@ -0,0 +1,59 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from user.authentication import (
+    VERSION_CLAIM,
+    get_user_version,
+    issued_before_revocation,
+)
+from user.revocation import revoked
+
+
+class RevocableTokenMixin:
+    """
+    Rejects tokens whose jti has been revoked and tokens whose user has
+    changed or revoked all sessions since the token was issued.
+    """
+
+    def verify(self) -> None:
+        super().verify()
+        if self.get(api_settings.JTI_CLAIM) in revoked:
+            raise TokenError(_("Token has been revoked"))
+        if VERSION_CLAIM in self:
+            user_id = self[api_settings.USER_ID_CLAIM]
+            if get_user_version(user_id) != self[VERSION_CLAIM]:
+                raise TokenError(_("Token is no longer valid for this user"))
+
+    def revoke(self) -> None:
+        revoked.revoke(
+            self[api_settings.JTI_CLAIM],
+            self[api_settings.USER_ID_CLAIM],
+            datetime.datetime.fromtimestamp(
+                self["exp"], tz=datetime.timezone.utc
+            ),
+        )
+
+
+class UserAccessToken(RevocableTokenMixin, AccessToken):
+    pass
+
+
+class UserRefreshToken(RevocableTokenMixin, RefreshToken):
+    access_token_class = UserAccessToken
+
+    def verify(self) -> None:
+        super().verify()
+        if VERSION_CLAIM not in self:
+            tokens_valid_after = (
+                get_user_model()
+                .objects.filter(pk=self[api_settings.USER_ID_CLAIM])
+                .values_list("tokens_valid_after", flat=True)
+                .first()
+            )
+            if issued_before_revocation(self, tokens_valid_after):
+                raise TokenError(_("Token has been revoked"))
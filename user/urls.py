@@ -1,18 +1,31 @@
 from django.urls import path
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-    TokenVerifyView,
-)
+from rest_framework_simplejwt.views import TokenVerifyView
 
-from user.views import CreateUserView, ManageUserView
+from user.views import (
+    CreateUserView,
+    LogoutAllView,
+    LogoutView,
+    ManageUserView,
+    UserTokenObtainPairView,
+    UserTokenRefreshView,
+)
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
     path("me/", ManageUserView.as_view(), name="manage_user"),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "token/",
+        UserTokenObtainPairView.as_view(),
+        name="token_obtain_pair"
+    ),
+    path(
+        "token/refresh/",
+        UserTokenRefreshView.as_view(),
+        name="token_refresh"
+    ),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("logout/", LogoutView.as_view(), name="logout"),
+    path("logout/all/", LogoutAllView.as_view(), name="logout_all"),
 ]
 
 app_name = "users"
@@ -1,18 +1,95 @@
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
-from rest_framework import generics
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, status
+from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+)
 
-from user.serializers import UserSerializer
+from user.hashing import HashingUnavailable
+from user.serializers import (
+    LogoutSerializer,
+    UserSerializer,
+    UserTokenObtainPairSerializer,
+    UserTokenRefreshSerializer,
+)
 
 
-class CreateUserView(generics.CreateAPIView):
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many sign-ins at the moment, try again shortly.")
+    default_code = "hashing_unavailable"
+
+    def __init__(self, wait: int) -> None:
+        super().__init__()
+        # Picked up by the DRF exception handler as the Retry-After header
+        self.wait = wait
+
+
+class PasswordHashingMixin:
+    """Answers 503 while the password hashing pool is saturated"""
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if isinstance(exc, HashingUnavailable):
+            exc = HashingBusy(exc.retry_after)
+        return super().handle_exception(exc)
+
+
+class CreateUserView(PasswordHashingMixin, generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = []
+    throttle_scope = "auth"
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(PasswordHashingMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated,]
 
     def get_object(self) -> User:
-        return self.request.user
+        return get_user_model().objects.get(pk=self.request.user.pk)
+
+
+class UserTokenObtainPairView(PasswordHashingMixin, TokenObtainPairView):
+    serializer_class = UserTokenObtainPairSerializer
+    throttle_scope = "auth"
+
+
+class UserTokenRefreshView(TokenRefreshView):
+    serializer_class = UserTokenRefreshSerializer
+
+
+class LogoutView(generics.GenericAPIView):
+    """Revoke the access token of the request and the given refresh token"""
+
+    serializer_class = LogoutSerializer
+    permission_classes = [IsAuthenticated,]
+
+    @extend_schema(responses={status.HTTP_204_NO_CONTENT: None})
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        request.auth.revoke()
+        if "refresh" in serializer.validated_data:
+            serializer.validated_data["refresh"].revoke()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class LogoutAllView(APIView):
+    """Revoke every access and refresh token issued to the user so far"""
+
+    permission_classes = [IsAuthenticated,]
+
+    @extend_schema(request=None, responses={status.HTTP_204_NO_CONTENT: None})
+    def post(self, request: Request) -> Response:
+        user = get_user_model().objects.get(pk=request.user.pk)
+        user.tokens_valid_after = timezone.now()
+        user.save(update_fields=["tokens_valid_after"])
+        return Response(status=status.HTTP_204_NO_CONTENT)